@@ -0,0 +1,62 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: AiLogic.py contains the simple AI player heuristic used by both the GUI (GuiGameLogic) and the
+# headless simulation runner.  None of these functions depend on tkinter.
+
+# Code Outline:
+# 4 non-class functions:
+# should_ai_buy_space: A few simple conditions to determine weather or not the AI should buy a space.
+# ai_should_keep_saving: Simple AI logic to determine if the AI should save up.
+# ai_needs_rent_money: Simple AI logic to keep enough money for the rent the AI could land on.
+# is_space_prime_real_estate: Simple AI logic to determine if a space is worth buying.
+
+import random
+
+
+def should_ai_buy_space(bal, pos, price, rng=random, exposure=0):
+    """ A few simple conditions to determine weather or not the AI should buy a space.
+    rng can be any object with a 'randint' method (the random module is used by default).
+    exposure is the rent of every space owned by someone else (RealEstateGame.get_rent_exposure).  Only the
+    "cautious" strategy passes it, the default of 0 ignores it so every other bot plays the plain heuristic. """
+    if pos > 0:
+        if exposure and ai_needs_rent_money(bal, price, exposure):
+            return False
+        if ai_should_keep_saving(bal, price, rng):
+            return False
+        if rng.randint(1, 10) > 8:
+            # 20% chance AI will try to buy any space they land on.
+            return True
+        if is_space_prime_real_estate(bal, price):
+            return True
+    return False
+
+
+def ai_should_keep_saving(bal, price, rng=random):
+    """ Simple AI logic to determine if the AI should save up. """
+    if price * 1.4 <= bal and 500 < bal < 1500:
+        if rng.randint(1, 10) <= 9:
+            # It's a pretty good idea to save but 10% chance they won't (simulate impulsive decision-making)
+            return True
+    return False
+
+
+def ai_needs_rent_money(bal, price, exposure):
+    """ Simple AI logic to keep enough money for rent.  Every space is equally likely to be landed on and a lap
+    takes about size / 3.5 rolls, so the rent expected over the next lap is about exposure / 3.5. """
+    return bal - price < exposure / 3.5
+
+
+def is_space_prime_real_estate(bal, price):
+    """ Simple AI logic to simulate human player behaviour.
+    If the space is prime real estate or the AI has plenty of money, they will try to buy the space they are on. """
+    if bal >= 2600:
+        # If AI has a very large amount of money, buy any space the AI lands on.
+        return True
+    if bal >= price + 100 and price >= 750:
+        return True
+    if price >= 1000 and 1000 < bal < 1500:
+        return True
+    if price >= 1500 and bal >= 1500:
+        return True
+    return False
@@ -0,0 +1,152 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: BatchAi.py makes the buy decisions of many bots at once with NumPy, for batches that advance
+# thousands of games side by side.  It has array forms of the simple AI heuristic (AiLogic.py) and of TablePolicy,
+# a buy policy read from a table.  The heuristic draws up to two random numbers per decision, so each decision gets
+# its own row of pre-drawn numbers, and the scalar functions give exactly the same answers when they read that row
+# (see DrawStream).
+
+# Code Outline:
+# 2 classes 'DrawStream', 'TablePolicy'
+# DrawStream:  Hands out one decision's row of pre-drawn numbers to a scalar function, in place of its rng.
+# TablePolicy:  Buys with a chance looked up by balance band and price band, one decision or a whole batch at a time.
+# 5 non-class functions:
+# draw_decision_stream: Pre-draws the random numbers for a batch of decisions.
+# should_ai_buy_space_batch: should_ai_buy_space for arrays of balances, positions and prices.
+# ai_should_keep_saving_batch: ai_should_keep_saving for arrays.
+# is_space_prime_real_estate_batch: is_space_prime_real_estate for arrays.
+# check_batch_matches_scalar: Checks that the batch forms give exactly the scalar answers for random decisions.
+
+import random
+import numpy as np
+from AiLogic import should_ai_buy_space, ai_should_keep_saving, is_space_prime_real_estate
+
+DRAWS_PER_DECISION = 2  # The heuristic draws at most twice: to skip saving, then to buy on impulse.
+HEURISTIC_DRAW_HIGH = 10  # The heuristic draws rng.randint(1, 10).
+TABLE_DRAW_HIGH = 100  # TablePolicy draws rng.randint(1, 100), its chances are in percent.
+
+
+class DrawStream:
+    """ Stands in for the rng of a scalar decision: every randint call returns the next pre-drawn number of the
+    decision's row, whatever range it asks for (the row was drawn for that range by draw_decision_stream). """
+
+    def __init__(self, draws):
+        self._draws = draws
+        self._next = 0
+
+    def randint(self, low, high):
+        value = int(self._draws[self._next])
+        self._next += 1
+        return value
+
+    def get_used(self):
+        return self._next
+
+
+class TablePolicy:
+    """ A buy policy read from a table instead of written as rules.  The chance (in percent) of buying on a space
+    is chances[balance band][price band], where the bands are split at balance_edges and price_edges
+    (band 0 is below the first edge, band i starts at edge i - 1).  Like the heuristic it never buys GO. """
+
+    def __init__(self, balance_edges, price_edges, chances):
+        self._balance_edges = np.asarray(balance_edges)
+        self._price_edges = np.asarray(price_edges)
+        self._chances = np.asarray(chances, dtype=np.int64)
+        if self._chances.shape != (len(self._balance_edges) + 1, len(self._price_edges) + 1):
+            raise ValueError(f"chances must have {len(self._balance_edges) + 1} rows of "
+                             f"{len(self._price_edges) + 1} chances, one per balance band and price band.")
+
+    @staticmethod
+    def from_heuristic(balance_edges, price_edges):
+        """ Returns the TablePolicy that buys with the simple heuristic's exact chance at the bottom corner of every
+        cell (the lowest balance and price of the cell, 0 for the first band). """
+        chances = []
+        for balance in [0] + list(balance_edges):
+            row = []
+            for price in [0] + list(price_edges):
+                saving = ai_should_keep_saving(balance, price, DrawStream([1]))  # A draw of 1 always saves.
+                prime = is_space_prime_real_estate(balance, price)
+                chance = 100 if prime else 20  # 20% chance AI will try to buy any space they land on.
+                row.append(chance // 10 if saving else chance)  # 90% of the time they save instead.
+            chances.append(row)
+        return TablePolicy(balance_edges, price_edges, chances)
+
+    def should_buy(self, bal, pos, price, rng=random):
+        """ Returns True if the bot buys, drawing rng.randint(1, 100) once (only if pos isn't GO). """
+        if pos <= 0:
+            return False
+        chance = self._chances[np.searchsorted(self._balance_edges, bal, side="right"),
+                               np.searchsorted(self._price_edges, price, side="right")]
+        return rng.randint(1, TABLE_DRAW_HIGH) <= chance
+
+    def should_buy_batch(self, bal, pos, price, draws):
+        """ should_buy for arrays, where draws is the (n, 2) array from draw_decision_stream(..., TABLE_DRAW_HIGH)
+        (only its first column is used). """
+        chances = self._chances[np.searchsorted(self._balance_edges, bal, side="right"),
+                                np.searchsorted(self._price_edges, price, side="right")]
+        return (pos > 0) & (draws[:, 0] <= chances)
+
+    def get_chances(self):
+        return self._chances
+
+
+def draw_decision_stream(generator, count, high=HEURISTIC_DRAW_HIGH):
+    """ Returns a (count, 2) array of random ints from 1 to high drawn with a NumPy Generator, one row per decision.
+    Decision i reads row i whether it is made by a batch function or by a scalar one through DrawStream(row i). """
+    return generator.integers(1, high + 1, size=(count, DRAWS_PER_DECISION))
+
+
+def should_ai_buy_space_batch(bal, pos, price, draws, exposure=None):
+    """ should_ai_buy_space for arrays of balances, positions and prices, with the (n, 2) draws from
+    draw_decision_stream.  The saving check uses a decision's first draw only when it would have drawn, so the
+    impulse check reads the first draw or the second one, just like the scalar version's rng would.
+    exposure is an optional array of rent exposures (see AiLogic.should_ai_buy_space). """
+    keep_saving_check = (price * 1.4 <= bal) & (500 < bal) & (bal < 1500)
+    saving = keep_saving_check & (draws[:, 0] <= 9)
+    impulse_draw = np.where(keep_saving_check, draws[:, 1], draws[:, 0])
+    buy = (pos > 0) & ~saving & ((impulse_draw > 8) | is_space_prime_real_estate_batch(bal, price))
+    if exposure is not None:
+        buy &= ~((exposure != 0) & (bal - price < exposure / 3.5))
+    return buy
+
+
+def ai_should_keep_saving_batch(bal, price, draws):
+    """ ai_should_keep_saving for arrays, draws holds one randint(1, 10) per decision. """
+    return (price * 1.4 <= bal) & (500 < bal) & (bal < 1500) & (draws <= 9)
+
+
+def is_space_prime_real_estate_batch(bal, price):
+    """ is_space_prime_real_estate for arrays of balances and prices. """
+    return ((bal >= 2600) | ((bal >= price + 100) & (price >= 750)) | ((price >= 1000) & (1000 < bal) & (bal < 1500))
+            | ((price >= 1500) & (bal >= 1500)))
+
+
+def check_batch_matches_scalar(count=200000, seed=0):
+    """ Makes count random decisions with the batch forms and again one at a time with the scalar forms reading the
+    same draws, and raises a ValueError naming the first decision they disagree on.  Returns the decisions checked. """
+    generator = np.random.default_rng(seed)
+    bal = generator.integers(0, 4000, size=count)
+    pos = generator.integers(0, 25, size=count)
+    price = generator.choice([250, 375, 500, 750, 1000, 1250, 1500, 1750], size=count)
+    exposure = generator.choice([0, 0, 300, 1500, 6000], size=count)
+    draws = draw_decision_stream(generator, count)
+    buys = should_ai_buy_space_batch(bal, pos, price, draws)
+    exposed_buys = should_ai_buy_space_batch(bal, pos, price, draws, exposure)
+    table = TablePolicy.from_heuristic([500, 1000, 1500, 2600], [750, 1000, 1500])
+    table_draws = draw_decision_stream(generator, count, TABLE_DRAW_HIGH)
+    table_buys = table.should_buy_batch(bal, pos, price, table_draws)
+    for index in range(0, count):
+        args = (int(bal[index]), int(pos[index]), int(price[index]))
+        if should_ai_buy_space(*args, DrawStream(draws[index])) != buys[index]:
+            raise ValueError(f"The heuristic batch disagrees with should_ai_buy_space on decision {index}: {args}")
+        if should_ai_buy_space(*args, DrawStream(draws[index]), int(exposure[index])) != exposed_buys[index]:
+            raise ValueError(f"The heuristic batch disagrees with should_ai_buy_space on decision {index}: {args} "
+                             f"with exposure {exposure[index]}")
+        if table.should_buy(*args, DrawStream(table_draws[index])) != table_buys[index]:
+            raise ValueError(f"TablePolicy.should_buy_batch disagrees with should_buy on decision {index}: {args}")
+    return count
+
+
+if __name__ == "__main__":
+    print(f"{check_batch_matches_scalar()} decisions matched the scalar forms.")
@@ -0,0 +1,247 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: Benchmarks.py holds small timing benchmarks for the headless (non GUI) parts of the game.
+# Run every benchmark with 'python Benchmarks.py', or only some of them with 'python Benchmarks.py pool ...'.
+
+# Code Outline:
+# Non-class functions:
+# bench_game_pool: Compares building a new game for every seed against reusing pooled games, in time and memory.
+# bench_diff_protocol: Compares the binary diff protocol (DiffProtocol.py) against JSON.
+# bench_fast_rules: Compares turns per second of the RealEstateGame rules against FastRules.
+# bench_expectimax: Plays an ExpectimaxBot against simple AI players and reports its search speed.
+# bench_scaling: Measures the cost of a turn as the number of players and spaces grows, up to 10,000 of each.
+# bench_batch_ai: Compares bot buy decisions made one at a time against NumPy batches (BatchAi.py).
+# bench_rng: Compares the cost of a die roll from random.Random and from GameRng, and headless games with each.
+# time_call: Times a function call and counts the garbage collections it caused.
+# run_benchmarks: Runs the named benchmarks (or all of them) and prints the results.
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+from SimulationRunner import HeadlessRunner, build_stress_runner
+from AiLogic import should_ai_buy_space
+from BatchAi import DrawStream, TablePolicy, draw_decision_stream, should_ai_buy_space_batch, TABLE_DRAW_HIGH
+from GameRng import GameRng
+from GameEvents import GameEventStream, build_turn_diffs
+from DiffProtocol import DiffCodec
+from ExpectimaxBot import ExpectimaxBot
+
+
+def time_call(function, *args):
+    """ Calls the function and returns (seconds taken, garbage collections run, return value). """
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    start = time.perf_counter()
+    value = function(*args)
+    seconds = time.perf_counter() - start
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections
+    return seconds, collections, value
+
+
+def bench_game_pool(games=20000, max_rounds=1):
+    """ Compares building a new game for every seed against resetting pooled games, in games per second and in
+    the memory allocated to set up one game (measured with tracemalloc).
+    The default plays only one round per game so the setup cost isn't hidden by the cost of the turns. """
+    seeds = range(0, games)
+    new_time, new_gc, new_results = time_call(HeadlessRunner(max_rounds=max_rounds, reuse_games=False).run_batch,
+                                              seeds)
+    pool_time, pool_gc, pool_results = time_call(HeadlessRunner(max_rounds=max_rounds).run_batch, seeds)
+    same = [result.get_turns() for result in new_results] == [result.get_turns() for result in pool_results]
+    runner = HeadlessRunner(max_rounds=max_rounds)
+    game, rng = runner.build_game(), random.Random(0)
+    runner.play_game(game, rng, 0)
+
+    def allocated(set_up):
+        tracemalloc.start()
+        ready = set_up()  # Kept until the peak is read, like a game that is about to be played.
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    new_bytes = allocated(lambda: (runner.build_game(), random.Random(1)))
+    pool_bytes = allocated(lambda: (game.reset(), rng.seed(1)))
+    print(f"game pool: {games} games, {max_rounds} round(s) each")
+    print(f"  new game per seed: {games / new_time:10.0f} games/sec, {new_bytes:6} bytes allocated per game set-up")
+    print(f"  pooled games:      {games / pool_time:10.0f} games/sec, {pool_bytes:6} bytes allocated per game set-up")
+    print(f"  speedup: {new_time / pool_time:.2f}x, identical results: {same}")
+
+
+def bench_diff_protocol(games=200, repeat=5):
+    """ Encodes and decodes every turn's diff of some headless games, one message per turn (as the server sends
+    them), with the binary protocol and with JSON, and compares the speed and the bytes sent. """
+    stream = GameEventStream()
+    runner = HeadlessRunner(listeners=[stream])
+    messages = []
+    codec = None
+    for seed in range(0, games):
+        runner.run_game(seed)
+        events = stream.pop_all()
+        codec = DiffCodec(events[0][4])  # Every game has the same player names.
+        messages.extend([diff] for diff in build_turn_diffs(events, events[0][1]))
+
+    def json_round_trip():
+        sent = 0
+        for count in range(0, repeat):
+            for message in messages:
+                data = json.dumps(message).encode()
+                sent += len(data)
+                json.loads(data)
+        return sent
+
+    def binary_round_trip():
+        sent = 0
+        for count in range(0, repeat):
+            for message in messages:
+                data = codec.encode(message)
+                sent += len(data)
+                codec.decode(data)
+        return sent
+
+    turns = len(messages) * repeat
+    json_time, json_gc, json_bytes = time_call(json_round_trip)
+    binary_time, binary_gc, binary_bytes = time_call(binary_round_trip)
+    print(f"diff protocol: {len(messages)} turns from {games} games, encoded and decoded {repeat} times")
+    print(f"  json:   {turns / json_time:10.0f} turns/sec, {json_bytes / turns:6.1f} bytes/turn")
+    print(f"  binary: {turns / binary_time:10.0f} turns/sec, {binary_bytes / turns:6.1f} bytes/turn")
+    print(f"  speedup: {json_time / binary_time:.2f}x, {json_bytes / binary_bytes:.1f}x fewer bytes")
+
+
+def bench_fast_rules(games=2000):
+    """ Plays the same seeds with the RealEstateGame rules and with FastRules and compares turns per second. """
+    seeds = range(0, games)
+    game_time, game_gc, game_results = time_call(HeadlessRunner().run_batch, seeds)
+    fast_time, fast_gc, fast_results = time_call(HeadlessRunner(fast_rules=True).run_batch, seeds)
+    turns = sum(result.get_turns() for result in game_results)
+    same = ([(result.get_winner(), result.get_turns(), result.get_rounds()) for result in game_results] ==
+            [(result.get_winner(), result.get_turns(), result.get_rounds()) for result in fast_results])
+    print(f"fast rules: {games} games, {turns} turns")
+    print(f"  RealEstateGame: {turns / game_time:10.0f} turns/sec")
+    print(f"  FastRules:      {turns / fast_time:10.0f} turns/sec")
+    print(f"  speedup: {game_time / fast_time:.2f}x, identical results: {same}")
+
+
+def bench_expectimax(games=20, time_budget=0.01, max_turns=800):
+    """ Plays games where the first player buys with an ExpectimaxBot and the others use the simple AI, then prints
+    the bot's win rate, nodes per second and transposition table hit rate. """
+    runner = HeadlessRunner()
+    bot = ExpectimaxBot(time_budget)
+    wins = 0
+    start = time.perf_counter()
+    for seed in range(0, games):
+        game = runner.build_game()
+        rng = random.Random(seed)
+        names = runner.get_player_names()
+        winner = ""
+        turns = 0
+        while winner == "" and turns < max_turns:
+            name = names[turns % len(names)]
+            turns += 1
+            if game.get_player_account_balance(name) <= 0:
+                continue
+            if name == names[0]:
+                if bot.should_buy(game, name):
+                    game.buy_space(name)
+                game.move_player(name, rng.randint(1, 6))
+            else:
+                runner.take_turn(game, name, rng)
+            winner = game.check_game_over()
+        if winner == names[0]:
+            wins += 1
+    print(f"expectimax: {games} games in {time.perf_counter() - start:.1f} s, {time_budget * 1000:.0f} ms per decision, "
+          f"won {wins / games:.0%} against {len(runner.get_player_names()) - 1} simple AI players")
+    print("  " + bot.get_report())
+
+
+def bench_scaling(sizes=(10, 100, 1000, 10000), turns=200000):
+    """ Plays about the same number of turns on games with size players and size spaces for every size, and
+    prints the cost per turn (building the games isn't counted), then how much memory the largest game takes.
+    The cost per turn should stay flat as the games grow. """
+    print(f"scaling: ~{turns} turns per size (players = spaces)")
+    for size in sizes:
+        runner = build_stress_runner(size, size, max_rounds=turns)
+        build_time, build_gc, game = time_call(runner.build_game)
+        played = 0
+        play_time = 0.0
+        seed = 0
+        while played < turns:
+            game.reset()
+            seconds, collections, result = time_call(runner.play_game, game, random.Random(seed), seed)
+            played += result.get_turns()
+            play_time += seconds
+            seed += 1
+        print(f"  {size:6} players/spaces: {play_time / played * 1e6:6.2f} us/turn, "
+              f"{played / play_time:9.0f} turns/sec ({seed} games, built in {build_time * 1000:.0f} ms)")
+    tracemalloc.start()
+    runner = build_stress_runner(sizes[-1], sizes[-1], turn_cap=turns, max_rounds=turns)
+    game = runner.build_game()
+    built = tracemalloc.get_traced_memory()[0]
+    runner.play_game(game, random.Random(0), 0)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  memory of the {sizes[-1]} player game: {built / 1e6:.1f} MB built, {current / 1e6:.1f} MB after "
+          f"{turns} turns (peak {peak / 1e6:.1f} MB)")
+
+
+def bench_batch_ai(decisions=200000):
+    """ Makes the same buy decisions one at a time with should_ai_buy_space and in one call with the NumPy forms,
+    with the draws made ahead of time for both, and compares decisions per second. """
+    generator = np.random.default_rng(0)
+    bal = generator.integers(0, 4000, size=decisions)
+    pos = generator.integers(0, 25, size=decisions)
+    price = generator.choice([250, 375, 500, 750, 1000, 1250, 1500, 1750], size=decisions)
+    draws = draw_decision_stream(generator, decisions)
+    table = TablePolicy.from_heuristic([500, 1000, 1500, 2600], [750, 1000, 1500])
+    table_draws = draw_decision_stream(generator, decisions, TABLE_DRAW_HIGH)
+    rows = [(int(bal[index]), int(pos[index]), int(price[index]), DrawStream(draws[index]))
+            for index in range(0, decisions)]
+
+    def scalar_decisions():
+        return [should_ai_buy_space(*row) for row in rows]
+
+    scalar_time, scalar_gc, scalar_buys = time_call(scalar_decisions)
+    batch_time, batch_gc, batch_buys = time_call(should_ai_buy_space_batch, bal, pos, price, draws)
+    table_time, table_gc, table_buys = time_call(table.should_buy_batch, bal, pos, price, table_draws)
+    print(f"batch ai: {decisions} decisions, identical results: {scalar_buys == batch_buys.tolist()}")
+    print(f"  one at a time:   {decisions / scalar_time:12.0f} decisions/sec")
+    print(f"  heuristic batch: {decisions / batch_time:12.0f} decisions/sec ({scalar_time / batch_time:.0f}x)")
+    print(f"  table batch:     {decisions / table_time:12.0f} decisions/sec")
+
+
+def bench_rng(rolls=1000000, games=2000):
+    """ Times die rolls from random.Random and from GameRng (both bit generators), then plays the same seeds with
+    each kind of rng on the RealEstateGame rules and on FastRules (which must agree with each other). """
+    print(f"rng: {rolls} rolls")
+    for label, rng in [("random.Random", random.Random(0)), ("GameRng pcg64", GameRng(0)),
+                       ("GameRng philox", GameRng(0, "philox"))]:
+        def roll_all():
+            for roll in range(0, rolls):
+                rng.randint(1, 6)
+        seconds, collections, nothing = time_call(roll_all)
+        print(f"  {label:15} {seconds / rolls * 1e9:6.1f} ns/roll")
+    seeds = range(0, games)
+    for numpy_rng in (False, True):
+        game_time, game_gc, game_results = time_call(HeadlessRunner(numpy_rng=numpy_rng).run_batch, seeds)
+        fast_results = HeadlessRunner(fast_rules=True, numpy_rng=numpy_rng).run_batch(seeds)
+        turns = sum(result.get_turns() for result in game_results)
+        same = ([(result.get_winner(), result.get_turns(), result.get_rounds()) for result in game_results] ==
+                [(result.get_winner(), result.get_turns(), result.get_rounds()) for result in fast_results])
+        print(f"  {'GameRng' if numpy_rng else 'random.Random'} games: {turns / game_time:10.0f} turns/sec, "
+              f"FastRules agrees: {same}")
+
+
+BENCHMARKS = {"pool": bench_game_pool, "diffs": bench_diff_protocol, "rules": bench_fast_rules,
+              "expectimax": bench_expectimax, "scaling": bench_scaling, "batch_ai": bench_batch_ai, "rng": bench_rng}
+
+
+def run_benchmarks(names):
+    """ Runs the named benchmarks, or all of them if no names are given. """
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    run_benchmarks(sys.argv[1:])
@@ -0,0 +1,152 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: Checkpoint.py saves the progress of long headless batches (see SimulationRunner.py) to disk, so a
+# batch that was stopped or crashed can be started again and pick up where it left off.  Every game is played
+# from its own seed, so the games that were already finished don't have to be played again, and the saved totals
+# are merged with the new ones to get exactly what an uninterrupted batch would have given.
+
+# Code Outline:
+# 1 class 'BatchCheckpoint'
+# BatchCheckpoint:  The finished seeds and partial totals of a batch, saved to a file with an atomic rename.
+# 2 non-class functions:
+# run_with_checkpoints: Plays a batch of seeds, saving a checkpoint every so often and resuming from one if it exists.
+# get_range_start: Returns the first seed of a [start, stop) range (the key the ranges are searched by).
+
+import bisect
+import json
+import os
+import sys
+import time
+from SimulationRunner import HeadlessRunner, BatchStats
+from SpaceAnalytics import SpaceLedger
+
+CHECKPOINT_FORMAT = "dnre-checkpoint"
+CHECKPOINT_VERSION = 1
+
+
+class BatchCheckpoint:
+    """ The finished seeds and partial totals (BatchStats and optionally a SpaceLedger) of a batch.
+    The file is JSON, with the finished seeds stored as ranges so a batch of millions of seeds stays small.
+    The ranges are also how the seeds are kept in memory: a finished seed is merged into them as it is marked, so a
+    save writes them out as they are instead of sorting every seed again.
+    It is written to a temporary file first and then renamed over the old one, so a crash while saving leaves the
+    previous checkpoint in place instead of half a file. """
+
+    def __init__(self, path):
+        self._path = path
+        self._done = []  # Sorted [start, stop) ranges of finished seeds, neighbouring ranges are always merged.
+        self._done_count = 0
+        self._stats = BatchStats()
+        self._ledger = None
+        self._saves = 0
+
+    def load(self):
+        """ Reads the checkpoint file.  Returns False (and changes nothing) if there isn't one yet. """
+        if not os.path.exists(self._path):
+            return False
+        with open(self._path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if checkpoint.get("format") != CHECKPOINT_FORMAT or checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{self._path} is not a version {CHECKPOINT_VERSION} batch checkpoint.")
+        self._done = [[start, stop] for start, stop in checkpoint["done"]]
+        self._done_count = sum(stop - start for start, stop in self._done)
+        self._stats = BatchStats.from_dict(checkpoint["stats"])
+        self._ledger = None if checkpoint["ledger"] is None else SpaceLedger.from_dict(checkpoint["ledger"])
+        return True
+
+    def save(self, stats, ledger=None):
+        """ Saves the finished seeds with the totals so far, replacing the old checkpoint in a single rename. """
+        checkpoint = {"format": CHECKPOINT_FORMAT, "version": CHECKPOINT_VERSION, "done": self._done,
+                      "stats": stats.to_dict(), "ledger": None if ledger is None else ledger.to_dict()}
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file, separators=(",", ":"))
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())  # The data must be on disk before the rename makes it the checkpoint.
+        os.replace(tmp_path, self._path)
+        self._saves += 1
+
+    def mark_done(self, seed):
+        """ Adds an int seed to the finished ranges, growing or joining the ranges next to it if it touches them.
+        Seeds played in order only ever grow the last range. """
+        index = bisect.bisect_right(self._done, seed, key=get_range_start)  # The first range that starts after seed.
+        before = self._done[index - 1] if index else None
+        after = self._done[index] if index < len(self._done) else None
+        if before is not None and before[1] > seed:
+            return  # Already finished.
+        self._done_count += 1
+        if before is not None and before[1] == seed:
+            before[1] = seed + 1
+            if after is not None and after[0] == seed + 1:
+                before[1] = after[1]
+                del self._done[index]
+        elif after is not None and after[0] == seed + 1:
+            after[0] = seed
+        else:
+            self._done.insert(index, [seed, seed + 1])
+
+    def is_done(self, seed):
+        index = bisect.bisect_right(self._done, seed, key=get_range_start)
+        return index > 0 and self._done[index - 1][1] > seed
+
+    def get_done_count(self):
+        return self._done_count
+
+    def get_done_ranges(self):
+        return self._done
+
+    def get_stats(self):
+        return self._stats
+
+    def get_ledger(self):
+        return self._ledger
+
+    def get_saves(self):
+        return self._saves
+
+
+def run_with_checkpoints(runner, seeds, path, ledger=None, every_games=1000, every_seconds=60.0):
+    """ Plays one game per seed with the HeadlessRunner, saving a checkpoint to path after every_games games or
+    every_seconds seconds, whichever comes first, and once more at the end.
+    If the checkpoint already exists, its finished seeds are skipped and its totals are merged into the new ones,
+    so resuming with the same seeds ends with exactly the totals of a batch that was never interrupted.
+    ledger is an optional SpaceLedger that is one of the runner's listeners and hasn't seen a game yet.
+    Returns (BatchStats, ledger) with the totals of every seed, including those played before a restart. """
+    checkpoint = BatchCheckpoint(path)
+    stats = BatchStats()
+    if checkpoint.load():
+        stats.merge(checkpoint.get_stats())
+        if ledger is not None and checkpoint.get_ledger() is not None:
+            ledger.merge(checkpoint.get_ledger())
+    unsaved = 0
+    last_save = time.perf_counter()
+    for seed in seeds:
+        if checkpoint.is_done(seed):
+            continue
+        stats.add_result(runner.run_game(seed))
+        checkpoint.mark_done(seed)
+        unsaved += 1
+        if unsaved >= every_games or time.perf_counter() - last_save >= every_seconds:
+            checkpoint.save(stats, ledger)
+            unsaved = 0
+            last_save = time.perf_counter()
+    checkpoint.save(stats, ledger)
+    return stats, ledger
+
+
+def get_range_start(seed_range):
+    """ Returns the first seed of a [start, stop) range. """
+    return seed_range[0]
+
+
+if __name__ == "__main__":
+    # python Checkpoint.py checkpoint.json [games]   (run it again after stopping it to resume)
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    space_ledger = SpaceLedger()
+    totals, space_ledger = run_with_checkpoints(HeadlessRunner(listeners=[space_ledger]), range(0, games),
+                                                sys.argv[1], space_ledger)
+    print(f"{totals.get_games()} games, {totals.get_unfinished()} unfinished, "
+          f"{totals.get_mean_turns():.1f} turns per game, wins: {totals.get_wins()}")
+    print(f"game length p50/p90/p99: {totals.get_length_percentile(50)}/{totals.get_length_percentile(90)}/"
+          f"{totals.get_length_percentile(99)} turns, ended by: {totals.get_end_reasons()}")
@@ -0,0 +1,114 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: DiffProtocol.py packs the per turn state diffs of a game (see GameEvents.build_turn_diffs) into a
+# compact binary form with the struct module, and unpacks them again.  Players are sent as their index in the turn
+# order instead of their name, so a diff of an ordinary turn takes about a fifth of its JSON size.
+
+# Code Outline:
+# 1 class 'DiffCodec'
+# DiffCodec:  Encodes and decodes lists of state diffs for one game (one list of player names).
+# 1 non-class function:
+# check_round_trip: Plays headless games and checks that every diff decodes to exactly what was encoded.
+
+# Binary layout (little endian):
+# message:  count (uint16), then count diffs
+# diff:     mover (uint16), new position (uint16, NO_VALUE if the mover didn't move),
+#           balance change count (uint16), ownership change count (uint16),
+#           then the balance changes:  player (uint16), change (int32)
+#           then the ownership changes:  position (uint16), owner (uint16, NO_VALUE if the space was released)
+
+import struct
+from GameEvents import GameEventStream, build_turn_diffs
+from SimulationRunner import HeadlessRunner
+
+NO_VALUE = 0xFFFF  # Stands in for None in the uint16 fields.
+
+MESSAGE_HEADER = struct.Struct("<H")
+DIFF_HEADER = struct.Struct("<HHHH")
+BALANCE_CHANGE = struct.Struct("<Hi")
+OWNER_CHANGE = struct.Struct("<HH")
+
+
+class DiffCodec:
+    """ Encodes and decodes lists of state diffs for one game.  Both ends build their codec from the same list of
+    player names (the turn order in the game's "start" event), so the names never have to be sent again. """
+
+    def __init__(self, player_names):
+        if len(player_names) >= NO_VALUE:
+            raise ValueError(f"A game can have at most {NO_VALUE - 1} players.")
+        self._names = list(player_names)
+        self._indexes = {name: index for index, name in enumerate(self._names)}
+
+    def encode(self, diffs):
+        """ Returns the diffs packed into bytes. """
+        indexes = self._indexes
+        try:
+            parts = [MESSAGE_HEADER.pack(len(diffs))]
+            for diff in diffs:
+                balances = diff["balances"]
+                owners = diff["owners"]
+                parts.append(DIFF_HEADER.pack(indexes[diff["mover"]], NO_VALUE if diff["pos"] is None else diff["pos"],
+                                              len(balances), len(owners)))
+                for name in balances:
+                    parts.append(BALANCE_CHANGE.pack(indexes[name], balances[name]))
+                for pos in owners:
+                    owner = owners[pos]
+                    parts.append(OWNER_CHANGE.pack(int(pos), NO_VALUE if owner is None else indexes[owner]))
+        except struct.error as error:
+            raise ValueError(f"The diff doesn't fit the binary protocol: {error}")
+        return b"".join(parts)
+
+    def decode(self, data):
+        """ Returns the list of diffs packed in the bytes.  Positions are ints, as they are in the original diffs. """
+        names = self._names
+        count, = MESSAGE_HEADER.unpack_from(data, 0)
+        offset = MESSAGE_HEADER.size
+        diffs = []
+        for diff_index in range(0, count):
+            mover, pos, balance_count, owner_count = DIFF_HEADER.unpack_from(data, offset)
+            offset += DIFF_HEADER.size
+            balances = {}
+            for change in range(0, balance_count):
+                player, amount = BALANCE_CHANGE.unpack_from(data, offset)
+                offset += BALANCE_CHANGE.size
+                balances[names[player]] = amount
+            owners = {}
+            for change in range(0, owner_count):
+                space, owner = OWNER_CHANGE.unpack_from(data, offset)
+                offset += OWNER_CHANGE.size
+                owners[space] = None if owner == NO_VALUE else names[owner]
+            diffs.append({"mover": names[mover], "pos": None if pos == NO_VALUE else pos, "balances": balances,
+                          "owners": owners})
+        return diffs
+
+
+def check_round_trip(seeds=range(0, 200), **runner_options):
+    """ Plays one headless game per seed and checks that every turn's diff (and the whole game's diffs as one
+    message) decode to exactly what was encoded.  Raises a ValueError naming the first seed that doesn't, otherwise
+    returns the number of diffs checked. """
+    stream = GameEventStream()
+    runner = HeadlessRunner(listeners=[stream], **runner_options)
+    checked = 0
+    for seed in seeds:
+        runner.run_game(seed)
+        events = stream.pop_all()
+        codec = DiffCodec(events[0][4])
+        diffs = build_turn_diffs(events, events[0][1])
+        if codec.decode(codec.encode(diffs)) != diffs:
+            raise ValueError(f"The diffs of seed {seed} did not survive the round trip.")
+        for diff in diffs:
+            if codec.decode(codec.encode([diff])) != [diff]:
+                raise ValueError(f"A diff of seed {seed} did not survive the round trip: {diff}")
+        checked += len(diffs)
+    codec = DiffCodec(["A", "B"])
+    edge_cases = [[], [{"mover": "B", "pos": None, "balances": {"B": -50}, "owners": {24: "B"}}],
+                  [{"mover": "A", "pos": 0, "balances": {"A": -2 ** 31, "B": 2 ** 31 - 1}, "owners": {3: None}}]]
+    for diffs in edge_cases:
+        if codec.decode(codec.encode(diffs)) != diffs:
+            raise ValueError(f"The edge case {diffs} did not survive the round trip.")
+    return checked + sum(len(diffs) for diffs in edge_cases)
+
+
+if __name__ == "__main__":
+    print(f"{check_round_trip()} diffs survived the round trip.")
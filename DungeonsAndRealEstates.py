@@ -6,30 +6,67 @@
 # game called Real Estate Game (or Dungeons and Real Estates if played with GUI active).
 
 # Code Outline:
-# 4 classes 'RealEstateGame', 'GameSpace', 'GoSpace', 'Player'
+# 5 classes 'RealEstateGame', 'GameSpace', 'GoSpace', 'Player', 'StartupTimer'
 # RealEstateGame:  Contains methods and variables to simulate playing a monopoly-esque game.
 # GameSpace:  Contains methods and variables that pertain to each space on the board.
 # GoSpace:  A child class of GameSpace that represents the first space on the board.
 # Player:  Contains methods and variables that pertain to a player game object.
+# StartupTimer:  Records how long each step of starting the GUI takes, up to the first frame being drawn.
+
+# tkinter and GUI_Hub are only imported by start_gui, so the game rules can be imported (and played) without them.
+import sys
+import time
+
+PROGRAM_START = time.perf_counter()
 
-from GUI_Hub import *
 
 class RealEstateGame:
     """ Represents the Real Estate Game, played with the standard rules specified by the assignment readme file. """
 
-    def __init__(self):
+    def __init__(self, rng=None):
         self._spaces = []
         self._players = {}
+        self._rng = rng  # The game's GameRng (or anything with its methods), see get_rng.
+        self._name_suffixes = {}  # name: the lowest copy count that may still be free (see modify_repeat_names).
+        self._owned_rent = 0  # Rent of every owned space, so rent exposure doesn't need a scan of the board.
+        self._turn_order = []  # Every player's name, in turn order.
+        self._turn_index = {}  # name: the player's place in the turn order.
+        self._turn_cap = None  # End conditions, see set_end_conditions.
+        self._stall_rounds = None
+        self._turns = 0  # Moves made so far (bankrupt players don't move).
+        self._quiet_turns = 0  # Moves since the last purchase or rent payment.
+        self._end_reason = ""
         self._gui_game = None  # Holds a GUI class object, only if 'start_gui' is called.
+        self._master = None  # The tkinter root window, only if 'start_gui' is called.
+
+    def start_gui(self, report_startup=False, server=None):
+        """ Starts up the tkinter GUI elements for the Real Estate Game.
+        If report_startup is True, prints how long each startup step took once the secondary panels are built.
+        If server is a (host, port) pair, the game is played at a new table on that GameServer. """
+        timer = StartupTimer()
+        from tkinter import Tk, mainloop
+        from GUI_Hub import GuiHub
+        timer.mark("import tkinter and GUI_Hub")
         self._master = Tk()
-
-    def start_gui(self):
-        """ Starts up the tkinter GUI elements for the Real Estate Game. """
         self._master.title("RealEstateGame - Dungeons and Real Estates")
         self._master.configure(bg="brown")
+        timer.mark("create window")
         self._gui_game = GuiHub(self._master, self)
+        self._master.protocol("WM_DELETE_WINDOW", self.quit_game)
+        timer.mark("build board, dice and buy button")
+        self._master.after_idle(self.first_frame_drawn, timer, report_startup, server)
         mainloop()
 
+    def first_frame_drawn(self, timer, report_startup, server=None):
+        """ Called when tkinter first goes idle (the first frame is up), then builds the secondary GUI panels. """
+        timer.mark("first frame")
+        self._gui_game.build_secondary_panels()
+        timer.mark("build secondary panels")
+        if report_startup:
+            print(timer.report())
+        if server is not None:
+            self._gui_game.connect(*server)
+
     def create_spaces(self, go_amt, rent_amounts):
         """ Creates all spaces for the game board. """
         self.create_go_space(go_amt)
@@ -47,11 +84,51 @@ class RealEstateGame:
             new_space = GameSpace(theme[index], rent_amounts[index])
             self._spaces.append(new_space)
 
+    def set_end_conditions(self, turn_cap=None, stall_rounds=None):
+        """ Sets when check_game_over ends a game that nobody has won by bankrupting the others.
+        turn_cap ends it after that many turns, stall_rounds ends it once that many rounds (a turn for every active
+        player) pass without a purchase or a rent payment.  Either way the player with the highest net worth wins.
+        None turns a condition off.  (The same end conditions as RealEstateGame.py.) """
+        self._turn_cap = turn_cap
+        self._stall_rounds = stall_rounds
+
+    def create_board(self, go_amt, rent_amounts, names=None):
+        """ Replaces the game board with a GO space followed by one real estate space per rent amount, built in
+        one pass.  The board can be any size, if no names are given they are taken from board_theme. """
+        if names is None:
+            names = board_theme(len(rent_amounts))
+        spaces = [GoSpace(go_amt, "GO", None)]
+        spaces.extend([GameSpace(names[index], int(rent_amounts[index])) for index in range(0, len(rent_amounts))])
+        self._spaces = spaces
+
     def create_player(self, name, money):
         """ Creates a new player object and adds it to the players list. """
         name = self.repeated_name_check(name)
         new_player = Player(name, money, 0)
         self._players[name] = new_player
+        self.add_to_turn_order(name)
+
+    def create_players(self, names, money):
+        """ Creates a player for every name in one pass.  money is either one starting balance for everyone or a list
+        with one starting balance per name.  Returns the names the players were actually created with. """
+        if not hasattr(money, "__len__"):
+            money = [money] * len(names)
+        created = []
+        for index in range(0, len(names)):
+            name = self.repeated_name_check(names[index])
+            self._players[name] = Player(name, int(money[index]), 0)
+            self.add_to_turn_order(name)
+            created.append(name)
+        return created
+
+    def add_to_turn_order(self, name):
+        """ Puts a new player at the end of the turn order. """
+        self._turn_index[name] = len(self._turn_order)
+        self._turn_order.append(name)
+
+    def remove_from_turn_order(self, name):
+        """ Bankrupt players keep their place in the turn order and get_next_active_player skips them by their
+        balance, so there is nothing to remove here.  (RealEstateGame keeps a ring of active players instead.) """
 
     def repeated_name_check(self, name):
         """ If the given name exists in the players list, modifies the name.  Otherwise, returns the given name. """
@@ -61,26 +138,52 @@ class RealEstateGame:
             return name
 
     def modify_repeat_names(self, name, count):
-        """ Recursively counts how many copies of the name there are in the players list
-        and returns a modified version of the name concatenated with the number of copies. """
+        """ Counts up from count until it finds a copy of the name that isn't in the players list
+        and returns a modified version of the name concatenated with that number.
+        Players are never removed, so the lowest free count for a name can only go up.  It is remembered per name,
+        which means adding thousands of players with the same name doesn't probe every copy again each time. """
+        start = self._name_suffixes.get(name, 1)
+        remember = count <= start  # Only a search that starts at the lowest free count can be remembered.
+        if remember:
+            count = start
         mod_name = f"{name} ({count})"
-        if mod_name in self._players.keys():
-            return self.modify_repeat_names(name, count + 1)
-        else:
-            return mod_name
+        while mod_name in self._players:
+            count += 1
+            mod_name = f"{name} ({count})"
+        if remember:
+            self._name_suffixes[name] = count
+        return mod_name
+
+    def reset(self):
+        """ Puts the game back the way it was before the first turn, reusing the board and player objects.
+        Every space is unowned again and every player is back on GO with their starting balance. """
+        for space in self._spaces:
+            space.set_owner(None)
+        for player in self._players.values():
+            player.reset()
+        self._owned_rent = 0
+        self._turns = 0
+        self._quiet_turns = 0
+        self._end_reason = ""
 
     def buy_space(self, name):
         """ If the player can buy the space, they buy the space and returns True, otherwise returns False."""
         pos = self.get_player_current_position(name)
         space = self.get_game_space_object(pos)
         player = self.get_player_object(name)
-        return space.try_to_buy(player)
+        bought = space.try_to_buy(player)
+        if bought:
+            self._quiet_turns = 0
+            self._owned_rent += space.get_rent()
+        return bought
 
     def move_player(self, name, num_spaces):
         """ Moves the player, if they are not bankrupt. """
         if self.get_player_account_balance(name) == 0:
             return
 
+        self._turns += 1
+        self._quiet_turns += 1
         new_pos = self.determine_new_pos(name, num_spaces)
         self.set_player_current_position(name, new_pos)
         self.does_player_owe_rent(name, new_pos)
@@ -88,8 +191,9 @@ class RealEstateGame:
     def determine_new_pos(self, name, num_spaces):
         """ Determines the new position the player will move to. """
         new_pos = num_spaces + self.get_player_current_position(name)
-        if new_pos > 24:
-            new_pos = new_pos - 25
+        board_size = len(self._spaces)
+        if new_pos >= board_size:
+            new_pos = new_pos % board_size
             self.pass_go(name)
         return new_pos
 
@@ -115,6 +219,7 @@ class RealEstateGame:
         """ Transfers rent money from the player to the players current space owner. """
         player = self.get_player_object(name)
         player_bal = self.get_player_account_balance(name)
+        self._quiet_turns = 0
 
         if player_bal > rent:
             self.transfer_money(player, owner, rent)
@@ -132,21 +237,68 @@ class RealEstateGame:
         """ For all spaces the bankrupt player owns, sets those spaces to be owned by None.
         If GUI is active, handles the bankrupt player in the GUI. (Managed here to prevent repeat iterations)."""
         self.set_player_bankrupt_color(name)
-        for space in self._spaces:
-            owner = space.get_owner()
-            if owner and owner.get_name() == name:
-                space.set_owner(None)
-                self.set_space_bankrupt_color(space)
+        player = self.get_player_object(name)
+        self._owned_rent -= player.get_rent_income()
+        for space in list(player.get_properties()):
+            space.set_owner(None)
+        self.set_spaces_bankrupt_color(name)
         self.gui_check_for_end_game()
 
     def check_game_over(self):
         """ Checks to see if there is more than 1 active player.
-        If only one remains returns the winners name, otherwise returns an empty string. """
+        If only one remains returns the winners name (an empty string if nobody has money left), otherwise returns
+        an empty string.
+        If an end condition (see set_end_conditions) is reached first, returns the player with the highest net worth.
+        get_end_reason tells which of these ended the game. """
         active_players = self.get_active_players()
-        if len(active_players) > 1:
-            return ""
-        else:
-            return active_players[0]
+        if len(active_players) <= 1:
+            self._end_reason = "bankruptcy"
+            return active_players[0] if active_players else ""
+        if self._turn_cap is not None and self._turns >= self._turn_cap:
+            self._end_reason = "turn_cap"
+            return self.get_net_worth_leader()
+        if self._stall_rounds is not None and self._quiet_turns >= self._stall_rounds * len(active_players):
+            self._end_reason = "stall"
+            return self.get_net_worth_leader()
+        return ""
+
+    def get_net_worth(self, name):
+        """ Returns the player's balance plus the purchase price of every space they own. """
+        return self.get_player_object(name).get_net_worth()
+
+    def get_rent_exposure(self, name):
+        """ Returns the rent of every space owned by someone else, the most the player could owe over a lap. """
+        return self._owned_rent - self.get_player_object(name).get_rent_income()
+
+    def set_space_owner(self, pos, owner):
+        """ Sets the owner (a Player or None) of the space at pos, keeping the owned rent total up to date.
+        Use it instead of GameSpace.set_owner when changing ownership outside the game's own rules. """
+        if pos == 0:
+            return
+        space = self._spaces[pos]
+        if space.get_owner() is not None:
+            self._owned_rent -= space.get_rent()
+        space.set_owner(owner)
+        if owner is not None:
+            self._owned_rent += space.get_rent()
+
+    def get_net_worth_leader(self):
+        """ Returns the active player with the highest net worth (the first in turn order if there is a tie). """
+        return max(self.get_active_players(), key=self.get_net_worth)
+
+    def get_end_reason(self):
+        """ Returns what ended the game ("bankruptcy", "turn_cap" or "stall"), or "" if it hasn't ended. """
+        return self._end_reason
+
+    def get_end_conditions(self):
+        """ Returns (turn_cap, stall_rounds). """
+        return self._turn_cap, self._stall_rounds
+
+    def get_turns(self):
+        return self._turns
+
+    def get_quiet_turns(self):
+        return self._quiet_turns
 
     def get_active_players(self):
         """ Returns a list of the names of all players whose account balance is greater than zero. """
@@ -157,6 +309,20 @@ class RealEstateGame:
                 active_players.append(player_obj.get_name())
         return active_players
 
+    def get_next_active_player(self, name):
+        """ Returns the next player after name in turn order who has money left (name themselves if they are the
+        only one), or None if nobody has any. """
+        start = self._turn_index[name]
+        for step in range(1, len(self._turn_order) + 1):
+            next_name = self._turn_order[(start + step) % len(self._turn_order)]
+            if self._players[next_name].get_balance() > 0:
+                return next_name
+        return None
+
+    def get_turn_index(self, name):
+        """ Returns the player's place in the turn order (0 for the first player). """
+        return self._turn_index[name]
+
     def get_player_account_balance(self, name):
         """ Returns player account balance. """
         player = self.get_player_object(name)
@@ -190,11 +356,11 @@ class RealEstateGame:
             logic = self._gui_game.get_logic()
             logic.player_bankrupt(name)
 
-    def set_space_bankrupt_color(self, space):
-        """ Adjusts the GUI game space color to indicate that it was previously owned by a now bankrupt player. """
+    def set_spaces_bankrupt_color(self, name):
+        """ Adjusts the color of every GUI game space the now bankrupt player owned, all at once. """
         if self.gui_is_active():
             logic = self._gui_game.get_logic()
-            logic.empty_bankrupt_space(space)
+            logic.empty_bankrupt_spaces(name)
 
     def gui_check_for_end_game(self):
         """ Checks if the game is over, if it is sets all GUI spaces to match the winning players color. """
@@ -202,14 +368,25 @@ class RealEstateGame:
             logic = self._gui_game.get_logic()
             logic.check_for_winner()
 
+    def get_rng(self):
+        """ Returns the random number generator for everything random in this game: dice, AI decisions, names,
+        colors and token offsets.  Unless one was passed in, a GameRng with a fresh seed is made the first time it
+        is needed (NumPy is only imported then, so it doesn't slow down starting the GUI). """
+        if self._rng is None:
+            from GameRng import GameRng
+            self._rng = GameRng()
+        return self._rng
+
     def gui_is_active(self):
         """ Returns True if a GUI object exists and False otherwise."""
         return self._gui_game is not None
 
     def quit_game(self):
-        """ Closes the GUI window and exits the program. """
-        import sys
-        self._master.destroy()
+        """ Stops the GUI's bot worker, closes the GUI window and exits the program. """
+        if self._gui_game is not None:
+            self._gui_game.shutdown()
+        if self._master is not None:
+            self._master.destroy()
         sys.exit()
 
 
@@ -228,7 +405,7 @@ class GameSpace:
         purchase_amount = self.get_purchase_amt()
         player_balance = player.get_balance()
         if player_balance > purchase_amount and self._owner is None:
-            self._owner = player
+            self.set_owner(player)
             player.set_balance(-purchase_amount)
             return True
         else:
@@ -247,7 +424,12 @@ class GameSpace:
         return self._owner
 
     def set_owner(self, new_owner):
+        """ Sets the owner, moving the space's price and rent from the old owner's totals to the new owner's. """
+        if self._owner is not None:
+            self._owner.remove_property(self)
         self._owner = new_owner
+        if new_owner is not None:
+            new_owner.add_property(self)
 
     def set_gui_element(self, element):
         self._gui_element = element
@@ -284,13 +466,53 @@ class Player:
         self._name = name
         self._money = money
         self._pos = position
+        self._start_money = money
+        self._start_pos = position
+        self._properties = {}  # GameSpace: None for every space the player owns, kept up to date by set_owner.
+        self._property_value = 0  # Purchase price of every space the player owns.
+        self._rent_income = 0  # Rent of every space the player owns.
         self._gui_element = None
         self._ai = False
+        self._ai_strategy = None  # "simple" or "cautious" (AiLogic) or "expectimax" (ExpectimaxBot) for AI players.
 
     def set_balance(self, amount):
         """ A positive amount increases balance and a negative one decreases it. """
         self._money += amount
 
+    def reset(self):
+        """ Puts the player back on their starting position with their starting balance. """
+        self._money = self._start_money
+        self._pos = self._start_pos
+        self._properties = {}
+        self._property_value = 0
+        self._rent_income = 0
+
+    def add_property(self, space):
+        """ Adds a space to the player's spaces and totals (called by GameSpace.set_owner). """
+        self._properties[space] = None
+        self._property_value += space.get_purchase_amt()
+        self._rent_income += space.get_rent()
+
+    def remove_property(self, space):
+        """ Takes a space off the player's spaces and totals (called by GameSpace.set_owner). """
+        del self._properties[space]
+        self._property_value -= space.get_purchase_amt()
+        self._rent_income -= space.get_rent()
+
+    def get_properties(self):
+        """ Returns the spaces the player owns (the keys of a dictionary, in the order they were bought). """
+        return self._properties.keys()
+
+    def get_net_worth(self):
+        """ Returns the player's balance plus the purchase price of every space they own. """
+        return self._money + self._property_value
+
+    def get_property_value(self):
+        return self._property_value
+
+    def get_rent_income(self):
+        return self._rent_income
+
     def get_name(self):
         return self._name
 
@@ -314,8 +536,41 @@ class Player:
     def get_ai(self):
         return self._ai
 
-    def enable_ai(self):
+    def get_ai_strategy(self):
+        return self._ai_strategy
+
+    def enable_ai(self, strategy="simple"):
         self._ai = True
+        self._ai_strategy = strategy
+
+
+class StartupTimer:
+    """ Records how long each step of starting the GUI takes.  Times are measured from when this module was imported,
+    so the first mark includes the time it took python to get this far. """
+
+    def __init__(self):
+        self._marks = [("start gui", time.perf_counter())]
+
+    def mark(self, label):
+        """ Records that the step with the given label just finished. """
+        self._marks.append((label, time.perf_counter()))
+
+    def get_time_to(self, label):
+        """ Returns the seconds from program start until the step with the given label finished (or None). """
+        for mark_label, mark_time in self._marks:
+            if mark_label == label:
+                return mark_time - PROGRAM_START
+        return None
+
+    def report(self):
+        """ Returns a string with the time each step took and the time since program start. """
+        lines = ["Startup times (step / since start):"]
+        last = PROGRAM_START
+        for label, mark_time in self._marks:
+            lines.append(f"  {label}: {(mark_time - last) * 1000:.1f} ms / {(mark_time - PROGRAM_START) * 1000:.1f} ms")
+            last = mark_time
+        lines.append(f"Time to first frame: {self.get_time_to('first frame') * 1000:.1f} ms")
+        return "\n".join(lines)
 
 
 def fantasy_theme():
@@ -332,9 +587,38 @@ def fantasy_theme():
     return theme
 
 
+def board_theme(count):
+    """ Returns a list of count space names.  Boards larger than the fantasy theme reuse its names,
+    numbering each extra lap around the theme (e.g. "Dragons Lair 2"). """
+    theme = fantasy_theme()
+    names = []
+    for index in range(0, count):
+        lap = index // len(theme)
+        name = theme[index % len(theme)]
+        names.append(name if lap == 0 else f"{name} {lap + 1}")
+    return names
+
+
 if __name__ == "__main__":
     rents = [50, 50, 50, 75, 75, 75, 100, 100, 100, 150, 150, 150, 200, 200, 200, 250, 250, 250, 300, 300, 300, 350,
              350, 350]
-    game = RealEstateGame()
+    rng = None
+    if "--seed" in sys.argv:
+        # python DungeonsAndRealEstates.py --seed 42   Replays the same dice, AI choices, names and colors.
+        from GameRng import GameRng
+        rng = GameRng(int(sys.argv[sys.argv.index("--seed") + 1]))
+    game = RealEstateGame(rng)
     game.create_spaces(200, rents)
-    game.start_gui()
+    # --turn-cap N and --stall-rounds N end the game early, the player with the highest net worth wins.
+    turn_cap = int(sys.argv[sys.argv.index("--turn-cap") + 1]) if "--turn-cap" in sys.argv else None
+    stall_rounds = int(sys.argv[sys.argv.index("--stall-rounds") + 1]) if "--stall-rounds" in sys.argv else None
+    game.set_end_conditions(turn_cap, stall_rounds)
+    server = None
+    if "--connect" in sys.argv:
+        # python DungeonsAndRealEstates.py --connect [host:port], a server is started with 'python GameServer.py'.
+        address = sys.argv[sys.argv.index("--connect") + 1:][:1]
+        if not address or address[0].startswith("--"):
+            address = ["127.0.0.1:8765"]  # The next argument is another option, not an address.
+        host, port = address[0].rsplit(":", 1)
+        server = (host, int(port))
+    game.start_gui("--startup-report" in sys.argv, server)
@@ -0,0 +1,240 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: ExpectimaxBot.py is a search based AI player.  Before every roll it decides whether to buy the space
+# it is on by looking a few turns ahead: dice rolls are chance nodes (every roll is equally likely), its own
+# buy/don't buy choices are max nodes, and the other players are expected to buy like the simple AI does when a
+# space is prime real estate.  It works on a compact copy of the game (tuples of ints), so it never changes the game.
+# It does not import tkinter, so the headless runner and the GUI can both use it.
+
+# Code Outline:
+# 2 classes 'ExpectimaxBot', 'TranspositionTable'
+# ExpectimaxBot:  Searches deeper and deeper until its time budget runs out, then buys if buying scored best.
+# TranspositionTable:  A cache of searched positions with a fixed number of entries, least recently used go first.
+
+import time
+from collections import OrderedDict
+from AiLogic import is_space_prime_real_estate
+
+NO_OWNER = -1
+WIN_SCORE = 1000000  # Score of a won game (and minus a lost one), far above any difference in net worth.
+
+
+class SearchTimeout(Exception):
+    """ Raised inside a search when the time budget runs out. """
+
+
+class TranspositionTable:
+    """ A cache of searched positions with at most max_entries entries.  When it is full the least recently used
+    entry is evicted, so memory stays bounded however many decisions the bot makes. """
+
+    def __init__(self, max_entries=200000):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._lookups = 0
+        self._hits = 0
+
+    def get(self, key):
+        """ Returns the value stored for the key (marking it as recently used), or None. """
+        self._lookups += 1
+        value = self._entries.get(key)
+        if value is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """ Stores the value for the key, evicting the least recently used entry if the table is full. """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_hit_rate(self):
+        return self._hits / self._lookups if self._lookups else 0.0
+
+    def get_size(self):
+        return len(self._entries)
+
+
+class ExpectimaxBot:
+    """ Decides whether to buy with an expectimax search over (buy/don't buy -> roll) for every turn ahead.
+    Depth is counted in turns (of any player).  The search is repeated with one more turn of depth until the time
+    budget runs out or max_depth is reached, and the answer of the deepest finished search is used.
+    Searched positions are kept in a TranspositionTable keyed on the compact state, so later decisions reuse them. """
+
+    def __init__(self, time_budget=0.05, max_depth=8, table_size=200000):
+        self._time_budget = time_budget  # Seconds per decision.
+        self._max_depth = max_depth
+        self._table = TranspositionTable(table_size)
+        self._board = None  # (go_amt, rents, prices) of the board the table was filled for.
+        self._size = 0
+        self._go_amt = 0
+        self._rent = []
+        self._price = []
+        self._me = 0
+        self._deadline = 0.0
+        self._nodes = 0
+        self._search_time = 0.0
+        self._decisions = 0
+        self._depth_total = 0
+
+    def should_buy(self, game, name):
+        """ Returns True if the player should buy the space they are on before rolling.
+        game can be either version of RealEstateGame, it is only read. """
+        return self.decide(*self.build_position(game, name))
+
+    def build_position(self, game, name):
+        """ Returns everything decide needs as plain tuples, so the decision can be made in another thread while
+        the game carries on: (board, balances, positions, owners, player index). """
+        names = list(game.get_all_players().keys())
+        spaces = game.get_all_spaces()
+        board = (spaces[0].get_payout(), tuple(space.get_rent() for space in spaces[1:]),
+                 tuple(space.get_purchase_amt() for space in spaces[1:]))
+        balances, positions, owners = self.build_state(game, names)
+        return board, balances, positions, owners, names.index(name)
+
+    def decide(self, board, balances, positions, owners, me):
+        """ The decision of should_buy, made from the tuples returned by build_position. """
+        self.load_board(board)
+        pos = positions[me]
+        if pos == 0 or owners[pos] != NO_OWNER or balances[me] <= self._price[pos]:
+            return False
+        self._me = me
+        start = time.perf_counter()
+        self._deadline = start + self._time_budget
+        decision = False
+        depth = 0
+        try:
+            while depth < self._max_depth:
+                depth += 1
+                bought_balances, bought_owners = self.buy(balances, owners, me, pos)
+                buy_score = self.chance_score(bought_balances, positions, bought_owners, me, depth)
+                skip_score = self.chance_score(balances, positions, owners, me, depth)
+                decision = buy_score > skip_score
+        except SearchTimeout:
+            depth -= 1
+        self._search_time += time.perf_counter() - start
+        self._decisions += 1
+        self._depth_total += depth
+        return decision
+
+    def load_board(self, board):
+        """ Sets the (go_amt, rents, prices) of the board, clearing the table if it was filled for another board. """
+        if board != self._board:
+            self._board = board
+            self._size = len(board[1]) + 1
+            self._go_amt = board[0]
+            self._rent = (0,) + board[1]
+            self._price = (0,) + board[2]
+            self._table.clear()
+
+    @staticmethod
+    def build_state(game, names):
+        """ Returns the compact state of the game: (balances, positions, owners) tuples, owners by player index. """
+        players = game.get_all_players()
+        indexes = {name: index for index, name in enumerate(names)}
+        owners = []
+        for space in game.get_all_spaces():
+            owner = space.get_owner()
+            owners.append(NO_OWNER if owner is None else indexes[owner.get_name()])
+        return (tuple(players[name].get_balance() for name in names),
+                tuple(players[name].get_position() for name in names), tuple(owners))
+
+    def buy(self, balances, owners, player, pos):
+        """ Returns the (balances, owners) after the player buys pos. """
+        balances = list(balances)
+        balances[player] -= self._price[pos]
+        return tuple(balances), owners[:pos] + (player,) + owners[pos + 1:]
+
+    def turn_score(self, balances, positions, owners, player, depth):
+        """ Score (for the bot) of the start of the player's turn, depth turns from the end of the search. """
+        key = balances + positions + owners + (player, depth, self._me)
+        score = self._table.get(key)
+        if score is not None:
+            return score
+        pos = positions[player]
+        can_buy = pos > 0 and owners[pos] == NO_OWNER and balances[player] > self._price[pos]
+        if can_buy and player == self._me:
+            bought_balances, bought_owners = self.buy(balances, owners, player, pos)
+            score = max(self.chance_score(bought_balances, positions, bought_owners, player, depth),
+                        self.chance_score(balances, positions, owners, player, depth))
+        elif can_buy and is_space_prime_real_estate(balances[player], self._price[pos]):
+            bought_balances, bought_owners = self.buy(balances, owners, player, pos)
+            score = self.chance_score(bought_balances, positions, bought_owners, player, depth)
+        else:
+            score = self.chance_score(balances, positions, owners, player, depth)
+        self._table.put(key, score)
+        return score
+
+    def chance_score(self, balances, positions, owners, player, depth):
+        """ Average score over the six rolls of the player's move. """
+        self._nodes += 1
+        if depth > 1 and self._nodes & 255 == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        total = 0.0
+        for roll in range(1, 7):
+            after = self.move(balances, positions, owners, player, roll)
+            total += self.after_move_score(after[0], after[1], after[2], player, depth)
+        return total / 6
+
+    def after_move_score(self, balances, positions, owners, player, depth):
+        """ Score after the player's move: the end of the game, the end of the search, or the next player's turn. """
+        if balances[self._me] <= 0:
+            return -WIN_SCORE
+        active = sum(1 for balance in balances if balance > 0)
+        if active == 1:
+            return WIN_SCORE
+        if depth == 1:
+            return self.evaluate(balances, owners)
+        next_player = (player + 1) % len(balances)
+        while balances[next_player] <= 0:
+            next_player = (next_player + 1) % len(balances)
+        return self.turn_score(balances, positions, owners, next_player, depth - 1)
+
+    def move(self, balances, positions, owners, player, roll):
+        """ Returns the (balances, positions, owners) after the player's move, with the RealEstateGame rules. """
+        new_pos = positions[player] + roll
+        balances = list(balances)
+        if new_pos >= self._size:
+            new_pos %= self._size
+            balances[player] += self._go_amt
+        positions = positions[:player] + (new_pos,) + positions[player + 1:]
+        owner = owners[new_pos]
+        if owner != NO_OWNER and owner != player and new_pos != 0:
+            rent = self._rent[new_pos]
+            if balances[player] > rent:
+                balances[player] -= rent
+                balances[owner] += rent
+            else:
+                balances[owner] += balances[player]
+                balances[player] = 0
+                owners = tuple(NO_OWNER if space_owner == player else space_owner for space_owner in owners)
+        return tuple(balances), positions, owners
+
+    def evaluate(self, balances, owners):
+        """ The bot's net worth (money plus the price of its spaces) minus the best net worth of the others. """
+        worth = list(balances)
+        for pos in range(1, self._size):
+            if owners[pos] != NO_OWNER:
+                worth[owners[pos]] += self._price[pos]
+        mine = worth[self._me]
+        worth[self._me] = 0
+        return mine - max(worth)
+
+    def get_report(self):
+        """ Returns a line with the nodes searched per second, the table hit rate and the average depth reached. """
+        nodes_per_sec = self._nodes / self._search_time if self._search_time else 0.0
+        depth = self._depth_total / self._decisions if self._decisions else 0.0
+        return (f"expectimax: {self._decisions} decisions, {nodes_per_sec:.0f} nodes/sec, "
+                f"{self._table.get_hit_rate():.1%} table hit rate, average depth {depth:.1f} "
+                f"({self._table.get_size()} table entries)")
+
+    def get_nodes(self):
+        return self._nodes
+
+    def get_hit_rate(self):
+        return self._table.get_hit_rate()
@@ -0,0 +1,160 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: FastRules.py plays the rules of RealEstateGame.py on flat lists instead of Player and GameSpace
+# objects, for headless batches where only the outcome of a game matters.  Where a move ends up and whether it
+# passes GO are looked up in tables made once per board, and rent, price and owner are read straight from lists
+# indexed by space, so a turn costs a few list lookups instead of a chain of method calls.
+# The fast rules don't send game events, use RealEstateGame when listeners (or an archive) are needed.
+
+# Code Outline:
+# 1 class 'FastRules'
+# FastRules:  The game state as flat lists, with the same buy, move, rent, bankruptcy and end rules as RealEstateGame.
+
+NO_OWNER = -1
+
+
+class FastRules:
+    """ The state of a RealEstateGame as flat lists, with the same buy, move, rent, bankruptcy and end rules
+    (including the game's end conditions, see RealEstateGame.set_end_conditions).
+    Players are referred to by their index in the game's turn order.  The tables cover rolls from 0 to max_roll,
+    so next_pos[pos * (max_roll + 1) + roll] is where a player on pos ends up. """
+
+    def __init__(self, game, max_roll=6):
+        spaces = game.get_all_spaces()
+        players = game.get_all_players()
+        size = len(spaces)
+        self._size = size
+        self._stride = max_roll + 1
+        self._go_amt = spaces[0].get_payout()
+        self._rent = [0] + [space.get_rent() for space in spaces[1:]]
+        self._price = [0] + [space.get_purchase_amt() for space in spaces[1:]]
+        self._next_pos = [(pos + roll) % size for pos in range(0, size) for roll in range(0, self._stride)]
+        self._passes_go = [pos + roll >= size for pos in range(0, size) for roll in range(0, self._stride)]
+        self._names = list(players.keys())
+        self._start_balance = [players[name].get_balance() for name in self._names]
+        self._start_position = [players[name].get_position() for name in self._names]
+        self._balance = []
+        self._position = []
+        self._owner = []
+        self._active = 0  # Players with money left, kept up to date instead of counted every turn.
+        self._turn_cap, self._stall_rounds = game.get_end_conditions()
+        self._turns = 0
+        self._quiet_turns = 0
+        self._end_reason = ""
+        self.load(game)
+
+    def load(self, game):
+        """ Copies the balances, positions and owners of a RealEstateGame with the same board and players. """
+        players = game.get_all_players()
+        indexes = {name: index for index, name in enumerate(self._names)}
+        self._balance = [players[name].get_balance() for name in self._names]
+        self._position = [players[name].get_position() for name in self._names]
+        self._owner = [NO_OWNER] * self._size
+        for pos, space in enumerate(game.get_all_spaces()):
+            if pos > 0 and space.get_owner() is not None:
+                self._owner[pos] = indexes[space.get_owner().get_name()]
+        self._active = sum(1 for balance in self._balance if balance > 0)
+        self._turns = game.get_turns()
+        self._quiet_turns = game.get_quiet_turns()
+        self._end_reason = game.get_end_reason()
+
+    def reset(self):
+        """ Puts the game back to the start: starting balances and positions, and no owners. """
+        self._balance = list(self._start_balance)
+        self._position = list(self._start_position)
+        self._owner = [NO_OWNER] * self._size
+        self._active = sum(1 for balance in self._balance if balance > 0)
+        self._turns = 0
+        self._quiet_turns = 0
+        self._end_reason = ""
+
+    def buy_space(self, player):
+        """ The player buys the space they are on if it is free and they can afford it.  Returns True if they did. """
+        pos = self._position[player]
+        if pos > 0 and self._owner[pos] == NO_OWNER and self._balance[player] > self._price[pos]:
+            self._owner[pos] = player
+            self._balance[player] -= self._price[pos]
+            self._quiet_turns = 0
+            return True
+        return False
+
+    def move_player(self, player, roll):
+        """ Moves the player (unless they are bankrupt), pays GO and rent, and handles bankruptcy. """
+        balance = self._balance
+        if balance[player] == 0:
+            return
+        self._turns += 1
+        self._quiet_turns += 1
+        move = self._position[player] * self._stride + roll
+        pos = self._next_pos[move]
+        self._position[player] = pos
+        if self._passes_go[move]:
+            balance[player] += self._go_amt
+        owner = self._owner[pos]
+        if owner == NO_OWNER or owner == player or pos == 0:
+            return
+        rent = self._rent[pos]
+        self._quiet_turns = 0
+        if balance[player] > rent:
+            balance[player] -= rent
+            balance[owner] += rent
+        else:
+            balance[owner] += balance[player]
+            balance[player] = 0
+            self.player_is_bankrupt(player)
+
+    def player_is_bankrupt(self, player):
+        """ Releases every space the bankrupt player owned. """
+        owners = self._owner
+        for pos in range(1, self._size):
+            if owners[pos] == player:
+                owners[pos] = NO_OWNER
+        self._active -= 1
+
+    def check_game_over(self):
+        """ Returns the winner's name once only one player has money left, or the player with the highest net worth
+        once an end condition is reached, otherwise an empty string. """
+        if self._active <= 1:
+            self._end_reason = "bankruptcy"
+            for player in range(0, len(self._names)):
+                if self._balance[player] > 0:
+                    return self._names[player]
+            return ""
+        if self._turn_cap is not None and self._turns >= self._turn_cap:
+            self._end_reason = "turn_cap"
+            return self.get_net_worth_leader()
+        if self._stall_rounds is not None and self._quiet_turns >= self._stall_rounds * self._active:
+            self._end_reason = "stall"
+            return self.get_net_worth_leader()
+        return ""
+
+    def get_net_worth_leader(self):
+        """ Returns the name of the active player with the highest balance plus price of spaces owned. """
+        worth = list(self._balance)
+        for pos in range(1, self._size):
+            if self._owner[pos] != NO_OWNER:
+                worth[self._owner[pos]] += self._price[pos]
+        leader = None
+        for player in range(0, len(self._names)):
+            if self._balance[player] > 0 and (leader is None or worth[player] > worth[leader]):
+                leader = player
+        return self._names[leader]
+
+    def get_end_reason(self):
+        return self._end_reason
+
+    def get_names(self):
+        return self._names
+
+    def get_balance(self, player):
+        return self._balance[player]
+
+    def get_position(self, player):
+        return self._position[player]
+
+    def get_owner(self, pos):
+        return self._owner[pos]
+
+    def get_price(self, pos):
+        return self._price[pos]
@@ -9,7 +9,7 @@
 """
 Code Outline:
 
-10 classes:
+13 classes:
 GuiHub: The GUI Hub class builds and holds a reference to all GUI elements in the game.
 GuiGameBoard: A simple class that creates the GUI representation of the game board.
 GuiSpaces: GuiSpaces creates a GUI representation of the 25 spaces for the real estate game.
@@ -20,30 +20,46 @@ GuiBuyButton: Creates the GUI elements for the buy button, and contains some spa
 GuiPlayerMovement: Contains some logic for manipulating the location of the player GUI elements.
 GuiGameLogic: GuiGameLogic manages the core game logic whenever the game is played using the GUI.
     Including the AI player logic.
+GuiBotWorker: Makes slow bot decisions in a worker thread and hands the results back to the GUI.
+GuiNetworkSync: Plays the GUI against a GameServer, predicting the local player's moves and applying server diffs.
 GuiPlayer: Creates the GUI representation of the player object.
+GuiShapeRegistry: Holds the icon shapes, cached as flattened and scaled coordinates (SHAPES is the shared registry).
 
-4 non-class functions:
+8 non-class functions:
 get_players: Gets the player dictionary as it currently is in the real estate game.
 get_spaces: Gets the spaces list as it currently is in the real estate game.
 get_players_as_list: Returns a list of all player names.
+get_owner_tag: Returns the canvas tag given to every space the player owns.
 draw_a_dragon: Draws a dragon using vertex points.
+draw_a_mage: Draws a wizard using vertex points.
+draw_a_unicorn: Draws a unicorn using vertex points.
+draw_a_knight: Draws a knight using vertex points.
 """
 
 from tkinter import *
-import random
+import sys
+from collections import deque
+import time
+import AiLogic
 
 
 class GuiHub:
     """ The GUI Hub class builds and holds a reference to all GUI elements in the game.
-    Additionally, it contains a few methods that are called by GUI buttons, and the RealEstateGame class.  """
+    Additionally, it contains a few methods that are called by GUI buttons, and the RealEstateGame class.
+    Only the board, dice and buy button are built straight away.  The secondary panels (stat windows, color key and
+    add player form) are built by build_secondary_panels once the first frame is up, or as soon as anything asks
+    for them (get_stats, get_add_button), whichever happens first.  """
 
-    def __init__(self, master, real_estate_game):
-        """ Initializes and creates all GUI elements. """
+    def __init__(self, master, real_estate_game, token_scale=1.0):
+        """ Initializes and creates the GUI elements needed for the first frame. """
         self._canvas = Canvas(master, width=1400, height=1080)
         self._reg = real_estate_game  # reg short for real estate game.
+        self._token_scale = token_scale  # Size of the player tokens, smaller boards need smaller tokens.
         self.create_game_board()
-        self._stats = GuiStatWindow(self._canvas, self._reg)
-        self._add_button = GuiAddPlayerButton(self._canvas, self._reg, self)
+        self._stats = None
+        self._add_button = None
+        self._network = None  # A GuiNetworkSync, only when playing on a GameServer (see connect).
+        self._bot_worker = None
         self._dice_button = GuiDiceButton(self._canvas, self)
         self._buy_button = GuiBuyButton(self._canvas, self._reg, self)
         self._player_movement = GuiPlayerMovement(self._dice_button, self._canvas, self._reg)
@@ -55,15 +71,51 @@ class GuiHub:
         GuiGameBoard(self._canvas)
         GuiSpaces(self._canvas, self._reg)
 
+    def build_secondary_panels(self):
+        """ Builds the stat windows, color key and add player form, if they haven't been built yet. """
+        self.get_stats()
+        self.get_add_button()
+
     def update_stats(self):
         """ Updates player stats in GUI. """
-        self._stats.build_player_color_key()
-        self._stats.set_all_stat()
+        stats = self.get_stats()
+        stats.build_player_color_key()
+        stats.set_all_stat()
+
+    def connect(self, host="127.0.0.1", port=8765, name="Player", bots=3):
+        """ Joins a new table on a GameServer with the given number of server side bots, then plays the game there.
+        The local rules still run so the local player's moves show straight away (see GuiNetworkSync). """
+        from NetworkClient import NetworkClient
+        self._network = GuiNetworkSync(self._canvas, self._reg, self, NetworkClient(host, port))
+        self._network.join_new_table(name, bots)
+
+    def get_network(self):
+        return self._network
+
+    def get_bot_worker(self):
+        """ Returns the bot worker, starting it the first time a bot needs it. """
+        if self._bot_worker is None:
+            self._bot_worker = GuiBotWorker(self._canvas)
+        return self._bot_worker
+
+    def shutdown(self):
+        """ Stops the bot worker thread, if a bot ever started it.  Called when the window is closed. """
+        if self._bot_worker is not None:
+            self._bot_worker.shutdown()
 
     def get_stats(self):
+        """ Returns the stat window, building it the first time it is needed. """
+        if self._stats is None:
+            self._stats = GuiStatWindow(self._canvas, self._reg)
         return self._stats
 
+    def get_token_scale(self):
+        return self._token_scale
+
     def get_add_button(self):
+        """ Returns the add player form, building it the first time it is needed. """
+        if self._add_button is None:
+            self._add_button = GuiAddPlayerButton(self._canvas, self._reg, self)
         return self._add_button
 
     def get_dice_button(self):
@@ -78,6 +130,9 @@ class GuiHub:
     def get_logic(self):
         return self._logic
 
+    def get_rng(self):
+        return self._reg.get_rng()
+
 
 class GuiGameBoard:
     """ A simple class that creates the GUI representation of the game board. """
@@ -86,11 +141,16 @@ class GuiGameBoard:
         self._dusty_blue = "#%02x%02x%02x" % (76, 104, 181)  # Dusty blue color (prevents clashing with blue players).
         canvas.create_rectangle(0, 0, 1400, 1080, fill="brown")
         canvas.create_rectangle(135, 135, 945, 945, fill=self._dusty_blue, outline="black", width=13.5)
+        # The stat panel background is drawn with the board, so the dice and buy button (drawn next) stay on top of
+        # it even though the stat windows themselves are built later (see GuiHub.build_secondary_panels).
+        canvas.create_rectangle(995, 135, 1345, 945, fill=self._dusty_blue, outline="black", width=13.5)
         canvas.create_text(525, 500, text="Dungeons & Real Estates", font=("bold", 30))
 
 
 class GuiSpaces:
-    """ GuiSpaces creates a GUI representation of the 25 spaces for the real estate game. """
+    """ GuiSpaces creates a GUI representation of the 25 spaces for the real estate game.
+    Every space rectangle is tagged "space", and owned spaces are also tagged with their owner's tag
+    (see get_owner_tag), so the board can be recolored with a single tag-wide itemconfig call. """
 
     def __init__(self, canvas, real_estate_game):
         self._canvas = canvas
@@ -119,7 +179,7 @@ class GuiSpaces:
 
     def build_space_obj_tuple(self, index, ulc, lrc):
         """ Returns a tuple with two GUI elements that represent a space on the game board. """
-        space_obj = self._canvas.create_rectangle(ulc, ulc, lrc, lrc, fill="white", outline="black")
+        space_obj = self._canvas.create_rectangle(ulc, ulc, lrc, lrc, fill="white", outline="black", tags="space")
         my_text = self.build_space_text(index)
         text_obj = self._canvas.create_text(ulc + 35, ulc + 32, text=my_text)
         self._spaces[index].set_gui_element(space_obj)
@@ -182,41 +242,51 @@ class GuiSpaces:
 
 
 class GuiStatWindow:
-    """ Creates the GUI display windows that show various player stats during game play.  """
+    """ Creates the GUI display windows that show various player stats during game play.
+    Canvas changes are tracked instead of being sent to tkinter straight away: only lines and items that actually
+    changed are updated, player and space colors are cached on the python side, and everything changed during one
+    turn is sent to the canvas together in a single idle-time redraw (see queue_config and flush_canvas). """
 
     def __init__(self, canvas, real_estate_game):
         self._canvas = canvas
         self._reg = real_estate_game
-        self._dusty_blue = "#%02x%02x%02x" % (76, 104, 181)
         self._cur_player_color = None
         self._color_key = []
+        self._color_key_shift = 0
         self._all_stat_window = None
         self._cur_stat_window = None
         self._cur_stat_outline = None
+        self._player_colors = {}  # name: fill color, saves a tkinter itemcget round trip per color lookup.
+        self._space_fills = {}  # pos: fill color of the space, cached the same way.
+        self._stat_lines = {}  # name: that player's line of the all-stat text.
+        self._stat_balances = {}  # name: the (balance, net worth) shown in that player's line.
+        self._shown_config = {}  # canvas item: the options it was last configured with.
+        self._pending_config = {}  # canvas item: options waiting for the next idle-time redraw.
         self.create_window()
 
     def create_window(self):
         """ Creates the various GUI windows for displaying player stats. """
-        self._canvas.create_rectangle(995, 135, 1345, 945, fill=self._dusty_blue, outline="black", width=13.5)
         self._cur_stat_outline = self._canvas.create_rectangle(1030, 320, 1310, 420)
         self._cur_player_color = self._canvas.create_rectangle(1030, 320, 1310, 347)
         self._canvas.create_text(1160, 300, text="Current Player:", font=("bold", 20))
         self._cur_stat_window = self._canvas.create_text(1160, 370, font=("bold", 15))
-        all_stat = self.set_all_stat()
-        self._all_stat_window = self._canvas.create_text(1160, 675, text=all_stat, font=("bold", 15))
+        self._all_stat_window = self._canvas.create_text(1160, 675, text="", font=("bold", 15))
+        self.set_all_stat()
 
     def build_player_color_key(self):
-        """ Builds GUI elements for the player color key. """
+        """ Builds GUI elements for the player color key, one key per player (any number of players at once).
+        Keys are 25 apart and the whole key shifts up 10 for every player past the second, so it stays
+        lined up with the centered all-stat text. """
         top = 640
         bottom = 660
         players = get_players(self._reg)
-        if len(self._color_key) < len(players):
-            if len(self._color_key) >= 1:
-                last_key = self._color_key[len(self._color_key) - 1]
-                key_coord = self._canvas.coords(last_key)
-                key = self._canvas.create_oval(1020, key_coord[1] + 25, 1040, key_coord[3] + 25, fill="white")
-            else:
-                key = self._canvas.create_oval(1020, top, 1040, bottom, fill="white")
+        shift = -10 * max(0, len(players) - 2)
+        if shift != self._color_key_shift:
+            self._canvas.move("color_key", 0, shift - self._color_key_shift)  # One call moves every key.
+            self._color_key_shift = shift
+        while len(self._color_key) < len(players):
+            offset = 25 * len(self._color_key) + shift
+            key = self._canvas.create_oval(1020, top + offset, 1040, bottom + offset, fill="white", tags="color_key")
             self._color_key.append(key)
         self.set_color_key_colors()
 
@@ -226,19 +296,27 @@ class GuiStatWindow:
         for i in range(0, len(player_list)):
             name = player_list[i]
             color = self.get_player_color(name)
-            self._canvas.itemconfig(self._color_key[i], fill=color)
-            if len(player_list) > 2:
-                self._canvas.move(self._color_key[i], 0, -10)
+            self.queue_config(self._color_key[i], fill=color)
 
     def set_all_stat(self):
-        """ Creates a string containing each player's name and how much money they have.
-        Then, sets the all_stat_window GUI element's text equal to that string. """
+        """ Creates a string containing each player's name, how much money they have and their net worth.
+        Then, sets the all_stat_window GUI element's text equal to that string.
+        Only the lines of players whose balance or net worth changed are rebuilt, and the text is left alone if none
+        did.  Net worth is kept up to date by the players themselves, so this never scans the board. """
         players = get_players(self._reg)
-        all_stat = ""
+        changed = len(self._stat_lines) != len(players)
         for player in players:
             bal = players[player].get_balance()
-            all_stat += f"{player}: {bal}$\n"
-        self._canvas.itemconfig(self._all_stat_window, text=all_stat)
+            worth = players[player].get_net_worth()
+            if self._stat_balances.get(player) != (bal, worth):
+                self._stat_balances[player] = (bal, worth)
+                self._stat_lines[player] = f"{player}: {bal}$ (worth {worth}$)\n"
+                changed = True
+        if not changed:
+            return None
+        all_stat = "".join([self._stat_lines[player] for player in players])
+        if self._all_stat_window is not None:
+            self.queue_config(self._all_stat_window, text=all_stat)
         return all_stat
 
     def show_cur_player_stats(self, cur_player_name):
@@ -248,26 +326,71 @@ class GuiStatWindow:
         color = self.get_player_color(cur_player_name)
         money = self.get_player_money(cur_player_name)
         space = spaces[pos]
-        space_gui = space.get_gui_element()
-        space_color = self._canvas.itemcget(space_gui, "fill")
-        self._canvas.itemconfig(self._cur_stat_outline, fill=space_color)
+        self.queue_config(self._cur_stat_outline, fill=self.get_space_fill(pos))
         space_name = space.get_name()
         space_rent = space.get_rent()
         space_amt = space.get_purchase_amt()
-        my_text = f"{cur_player_name}: {money}$\nLocation: {space_name}\n-- Rent: " \
-                  f"{space_rent}$ --\n-- Buy: {space_amt}$ --"
-        self._canvas.itemconfig(self._cur_stat_window, text=my_text)
-        self._canvas.itemconfig(self._cur_player_color, fill=color)
+        worth = self._reg.get_net_worth(cur_player_name)
+        exposure = self._reg.get_rent_exposure(cur_player_name)
+        my_text = f"{cur_player_name}: {money}$ (worth {worth}$)\nLocation: {space_name}\n-- Rent: " \
+                  f"{space_rent}$ -- Buy: {space_amt}$ --\nRent of others' spaces: {exposure}$"
+        self.queue_config(self._cur_stat_window, text=my_text)
+        self.queue_config(self._cur_player_color, fill=color)
         self.set_all_stat()
 
+    def queue_config(self, item, **options):
+        """ Queues new options for a canvas item.  Options the item already shows are dropped, and the first
+        change queued in a turn schedules a single flush_canvas for when tkinter is next idle. """
+        shown = self._shown_config.setdefault(item, {})
+        pending = self._pending_config.get(item, {})
+        for option in options:
+            if shown.get(option) != options[option] or option in pending:
+                pending[option] = options[option]
+        if pending and item not in self._pending_config:
+            if not self._pending_config:
+                self._canvas.after_idle(self.flush_canvas)
+            self._pending_config[item] = pending
+
+    def flush_canvas(self):
+        """ Sends every queued canvas change to tkinter, one itemconfig per changed item. """
+        pending = self._pending_config
+        self._pending_config = {}
+        for item in pending:
+            self._canvas.itemconfig(item, **pending[item])
+            self._shown_config[item].update(pending[item])
+
     def get_player_color(self, name):
-        """ Returns the players color. """
-        players = get_players(self._reg)
-        player_obj = players[name]
-        player_gui = player_obj.get_gui_element()
-        color = self._canvas.itemcget(player_gui, "fill")
+        """ Returns the players color, only asking the canvas the first time. """
+        color = self._player_colors.get(name)
+        if color is None:
+            players = get_players(self._reg)
+            player_obj = players[name]
+            player_gui = player_obj.get_gui_element()
+            color = self._canvas.itemcget(player_gui, "fill")
+            self._player_colors[name] = color
         return color
 
+    def set_player_color(self, name, color):
+        """ Updates the cached color of a player, call this whenever a player's fill color is changed. """
+        self._player_colors[name] = color
+
+    def get_space_fill(self, pos):
+        """ Returns the fill color of the space at pos, only asking the canvas the first time. """
+        fill = self._space_fills.get(pos)
+        if fill is None:
+            space_gui = get_spaces(self._reg)[pos].get_gui_element()
+            fill = self._canvas.itemcget(space_gui, "fill")
+            self._space_fills[pos] = fill
+        return fill
+
+    def set_space_fill(self, pos, fill):
+        """ Updates the cached fill color of a space, call this whenever a space's fill color is changed. """
+        self._space_fills[pos] = fill
+
+    def forget_space_fills(self):
+        """ Empties the space fill cache, call this after recoloring spaces by tag. """
+        self._space_fills = {}
+
     def get_player_pos(self, name):
         """ Returns the players current position. """
         pos = self._reg.get_player_current_position(name)
@@ -293,9 +416,10 @@ class GuiAddPlayerButton:
         self._icon_button = None
         self._icon_text = StringVar()
         self._cur_icon = 0
-        self._icon_choices = ["Dragon", "Mage", "Unicorn", "Knight"]
         self._ai_button = None
-        self._ai_bool = False
+        self._ai_modes = [("Human", None), (" AI ", "simple"), ("Cautious", "cautious"),
+                          ("Expectimax", "expectimax")]  # (label, strategy)
+        self._cur_ai_mode = 0
         self._ai_text = StringVar()
         self.create_add_player_button()
 
@@ -324,21 +448,23 @@ class GuiAddPlayerButton:
         player_color_entry.place(x=1150, y=810)
 
     def create_ai_button(self):
-        """ Creates the GUI elements for the Human/AI toggle button. """
+        """ Creates the GUI elements for the Human/AI/Expectimax toggle button. """
         self._canvas.create_text(1090, 850, text="new player type:", font=("bold", 10))
-        self._ai_text.set("Human")
+        self._ai_text.set(self._ai_modes[0][0])
         self._ai_button = Button(self._canvas, textvariable=self._ai_text, command=self.set_ai, font=("bold", 10))
         self._ai_button.place(x=1150, y=835)
 
     def create_icon_button(self):
         """ Creates the GUI elements for the icon selection button."""
-        self._icon_text.set("Dragon")
+        self._icon_text.set(SHAPES.get_labels()[0])
         self._icon_button = Button(self._canvas, textvariable=self._icon_text, command=self.icon_switch,
                                    font=("bold", 10))
         self._icon_button.place(x=1150, y=867)
 
     def add_player_button_press(self):
         """ Logic to be called when the add player button is pressed. """
+        if self._hub.get_network() is not None:
+            return  # The players at a server table are set when it starts.
         name = self._name_entry.get()
         if name == "":
             name = self.random_name()
@@ -355,15 +481,37 @@ class GuiAddPlayerButton:
         self.ai_player_check(name)
         self.icon_switch()
 
-
-    @staticmethod
-    def random_name():
+    def add_players(self, specs):
+        """ Adds many players at once.  Each spec is a dictionary that may hold a 'name', 'color', 'icon' (shape key),
+        'money' and 'ai' (False, True or a strategy name: "simple", "cautious" or "expectimax"), anything missing is
+        picked the same way the add player button picks it.
+        The stats, color key and current player are only redrawn once, after every player has been added. """
+        names = []
+        for spec in specs:
+            name = spec.get("name") or self.random_name()
+            name = self._reg.repeated_name_check(name)
+            self._reg.create_player(name, spec.get("money", 1000))
+            color = spec.get("color", "")
+            if color not in self._color_options:
+                color = self.pick_some_color()
+            self.create_player(name, color, spec.get("icon", self.get_icon()))
+            ai = spec.get("ai", False)
+            if ai:
+                get_players(self._reg)[name].enable_ai("simple" if ai is True else ai)
+            names.append(name)
+        if names:
+            self._hub.update_stats()
+            logic = self._hub.get_logic()
+            logic.set_cur_player(names[-1])
+        return names
+
+    def random_name(self):
         """ Returns a random name from the some_names list. """
         some_names = ["Forgle gnome", "Drax vampire", "Spoon goblin",  "Vroll the gnoll", "tkinter",
                       "Callegari lich", "Lenore", "D.M.onster", "Agent Ethel", "P.I. Mildred", "Bonk", "Grunx",
                       "bard Brhudvi", "Grunkle", "Finn", "Jake", "Dax", "Kellanved", "Beans", "Roo", "Alton", "Rue",
                       "Fenna", "Uncle Bob", "Frank Dopple", "Cron"]
-        name = some_names[random.randrange(0, len(some_names) - 1)]
+        name = some_names[self._reg.get_rng().randrange(0, len(some_names) - 1)]
         return name
 
     def pick_some_color(self):
@@ -373,11 +521,11 @@ class GuiAddPlayerButton:
         if count < len(some_colors) - 1:
             return some_colors[count - 1]
         else:
-            return some_colors[random.randrange(0, len(some_colors) - 1)]
+            return some_colors[self._reg.get_rng().randrange(0, len(some_colors) - 1)]
 
     def create_player(self, name, color="red", shape_key="d"):
         """ Creates the GUI elements for a player. """
-        player = GuiPlayer(self._canvas, color, shape_key)
+        player = GuiPlayer(self._canvas, color, shape_key, self._hub.get_token_scale())
         player_gui = player.create_player()
         players = get_players(self._reg)
         p_parent = players[name]
@@ -389,43 +537,36 @@ class GuiAddPlayerButton:
         spaces = get_spaces(self._reg)
         go_space = spaces[0].get_gui_element()
         go_coord = self._canvas.coords(go_space)
-        x_pos = go_coord[1] + random.randint(-20, -15)
-        y_pos = x_pos + random.randint(16, 20)
+        rng = self._reg.get_rng()
+        x_pos = go_coord[1] + rng.randint(-20, -15)
+        y_pos = x_pos + rng.randint(16, 20)
         self._canvas.move(player_gui, x_pos, y_pos)
 
     def set_ai(self):
-        """ Determines weather the player being created will be an AI or a human player. """
-        if self._ai_bool:
-            self._ai_text.set("Human")
-        else:
-            self._ai_text.set(" AI ")
-        self._ai_bool = not self._ai_bool
+        """ Cycles the type of the player being created: human, simple AI, cautious AI or expectimax AI. """
+        self._cur_ai_mode = (self._cur_ai_mode + 1) % len(self._ai_modes)
+        self._ai_text.set(self._ai_modes[self._cur_ai_mode][0])
 
     def ai_player_check(self, name):
-        """ Sets the player objects AI status variable to True. """
-        if self._ai_bool:
+        """ Sets the player objects AI status variable to True, with the chosen AI strategy. """
+        strategy = self._ai_modes[self._cur_ai_mode][1]
+        if strategy is not None:
             players = get_players(self._reg)
             player = players[name]
-            player.enable_ai()
+            player.enable_ai(strategy)
 
     def icon_switch(self):
         """ Cycles through the icon options. """
-        if self._cur_icon < len(self._icon_choices) - 1:
+        icon_choices = SHAPES.get_labels()
+        if self._cur_icon < len(icon_choices) - 1:
             self._cur_icon += 1
         else:
             self._cur_icon = 0
-        self._icon_text.set(self._icon_choices[self._cur_icon])
+        self._icon_text.set(icon_choices[self._cur_icon])
 
     def get_icon(self):
         """ Returns the shape key for the current icon. """
-        if self._cur_icon == 0:
-            return "d"
-        if self._cur_icon == 1:
-            return "m"
-        if self._cur_icon == 2:
-            return "u"
-        if self._cur_icon == 3:
-            return "k"
+        return SHAPES.get_keys()[self._cur_icon]
 
 
 class GuiDiceButton:
@@ -437,6 +578,8 @@ class GuiDiceButton:
         self._dice_text = None
         self._dice_num = 0
         self._dice_button = None
+        self._spin_id = None  # Set while the dice spin, waiting for the server's roll.
+        self._spin_ms = 60
         self.create_dice()
 
     def create_dice(self):
@@ -447,12 +590,36 @@ class GuiDiceButton:
         self._dice_button.place(x=1050, y=173)
 
     def roll_dice(self):
-        """ Logic to be called when the dice button is pressed. """
-        self._dice_num = random.randint(1, 6)
-        self._canvas.itemconfig(self._dice_text, text=self._dice_num)
+        """ Logic to be called when the dice button is pressed.  In a network game the server rolls, the dice spin
+        until its roll arrives (see GuiNetworkSync.handle_turn). """
         logic = self._hub.get_logic()
+        network = self._hub.get_network()
+        if network is not None:
+            if network.send_roll(logic.get_cur_player_name()):
+                self.hide_dice()
+                self.spin_dice()
+            return
+        self._dice_num = self._hub.get_rng().randint(1, 6)
+        self._canvas.itemconfig(self._dice_text, text=self._dice_num)
         logic.move_player(self._dice_num)
 
+    def spin_dice(self):
+        """ Cycles the dice face until stop_spin is called. """
+        self._dice_num = self._dice_num % 6 + 1
+        self._canvas.itemconfig(self._dice_text, text=self._dice_num)
+        self._spin_id = self._canvas.after(self._spin_ms, self.spin_dice)
+
+    def stop_spin(self):
+        if self._spin_id is not None:
+            self._canvas.after_cancel(self._spin_id)
+            self._spin_id = None
+
+    def show_roll(self, roll):
+        """ Stops the dice spinning and shows the roll. """
+        self.stop_spin()
+        self._dice_num = roll
+        self._canvas.itemconfig(self._dice_text, text=roll)
+
     def hide_dice(self):
         self._dice_button.place(x=100000, y=173)
 
@@ -491,7 +658,7 @@ class GuiBuyButton:
         owner = spaces[pos].get_owner()
         if money > cost and owner is None:
             self._button.place(x=1050, y=475)
-            color = get_cur_player_color(self._canvas, self._reg, cur_player)
+            color = self._hub.get_stats().get_player_color(cur_player)
             self._canvas.itemconfig(self._buy_button_outline, fill=color, outline="black")
         else:
             self._button.place(x=4050, y=475)
@@ -511,98 +678,184 @@ class GuiBuyButton:
         player_space = spaces[player_pos]
         space_owner_obj = player_space.get_owner()
         if space_owner_obj is not None and space_owner_obj.get_name() == cur_player:
-            player_gui = player_obj.get_gui_element()
-            color = self._canvas.itemcget(player_gui, "fill")
+            stats = self._hub.get_stats()
+            color = stats.get_player_color(cur_player)
             space_gui = player_space.get_gui_element()
             self._canvas.itemconfig(space_gui, fill=color)
+            stats.set_space_fill(player_pos, color)
+            self._canvas.addtag_withtag(get_owner_tag(player_obj), space_gui)
 
 
 class GuiPlayerMovement:
-    """ Contains some logic for manipulating the location of the player GUI elements. """
+    """ Contains some logic for manipulating the location of the player GUI elements.
+    Tokens are animated with after() callbacks at a target frame rate, so the window never freezes while they move.
+    Moves are queued and played one after another (and can be cancelled), and the trail a token leaves behind
+    reuses a fixed pool of ovals instead of creating and deleting canvas items. """
 
-    def __init__(self, dice, canvas, real_estate_game):
+    def __init__(self, dice, canvas, real_estate_game, fps=60, space_ms=100, trail_size=12):
         self._dice_button = dice
         self._canvas = canvas
         self._reg = real_estate_game
         self._space_size = 101.25
-        self._indicators = []
-
-    def move_player(self, player_name, num_spaces):
-        """ Moves the location of the player's GUI element."""
+        self._frame_ms = max(1, round(1000 / fps))
+        self._frames_per_space = max(1, round(space_ms / self._frame_ms))
+        self._trail_ms = space_ms  # 100 is the ideal animation speed determined by tests.
+        self._trail_size = trail_size
+        self._trail = []  # The pool of trail ovals, created the first time a trail is drawn.
+        self._next_trail = 0
+        self._shown_trail = deque()  # Trail ovals that are currently visible, oldest first.
+        self._moves = deque()  # Queued moves: [player_gui, color, steps, on_done]
+        self._step = 0  # Step of the first queued move that is being animated.
+        self._frame = 0  # Frame within that step.
+        self._frame_id = None
+        self._trail_id = None
+
+    def move_player(self, player_name, num_spaces, on_done=None):
+        """ Queues an animated move of the player's GUI element, from the player's current position.
+        Call this before the player is moved in the RealEstateGame.  on_done is called once the move has played. """
         player_obj = self._reg.get_player_object(player_name)
         player_gui = player_obj.get_gui_element()
         old_location = player_obj.get_position()
         new_location = player_obj.get_position() + num_spaces
 
+        steps = []
         if new_location <= 25:
-            self.move_player_loop(player_gui, new_location, old_location)
+            self.build_path(steps, new_location, old_location)
         else:
             adjusted_location = new_location - 25
-            self.move_player_loop(player_gui, 25, old_location)
-            self.move_player_loop(player_gui, 1, 25)
+            self.build_path(steps, 25, old_location)
+            self.build_path(steps, 1, 25)
             if adjusted_location != 1:
-                self.move_player_loop(player_gui, adjusted_location, 1)
-
-        self.remove_indicators()
-
-    def move_player_loop(self, player, new_location, old_location):
-        """ Moves the location of the player's GUI element by looping
-        through locations until the player reaches the goal location. """
+                self.build_path(steps, adjusted_location, 1)
 
+        color = self._canvas.itemcget(player_gui, "fill")
+        self._moves.append([player_gui, color, steps, on_done])
+        if self._frame_id is None:
+            self.stop_trail_fade()
+            self._frame_id = self._canvas.after(self._frame_ms, self.animate_frame)
+
+    def build_path(self, steps, new_location, old_location):
+        """ Adds one (x, y, trail space index) step to steps for every space between the old and new locations.
+        The trail space index is the space the token leaves (None if no trail should be left). """
         if old_location == 25 and new_location == 1:
-            self.move_obj(player, self._space_size, 0)
+            steps.append((self._space_size, 0, None))
 
         while old_location < new_location:
             if old_location <= 5:
-                self.move_obj(player, self._space_size, 0)
+                steps.append((self._space_size, 0, old_location))
             elif old_location == 6:
-                self.move_obj(player, self._space_size, self._space_size)
+                steps.append((self._space_size, self._space_size, old_location))
             elif 7 <= old_location <= 11:
-                self.move_obj(player, 0, self._space_size)
+                steps.append((0, self._space_size, old_location))
             elif old_location == 12:
-                self.move_obj(player, -self._space_size, self._space_size)
+                steps.append((-self._space_size, self._space_size, old_location))
             elif 13 <= old_location <= 17:
-                self.move_obj(player, -self._space_size, 0)
+                steps.append((-self._space_size, 0, old_location))
             elif old_location == 18:
-                self.move_obj(player, -self._space_size, -self._space_size)
+                steps.append((-self._space_size, -self._space_size, old_location))
             elif 19 <= old_location <= 25:
-                self.move_obj(player, 0, -self._space_size)
+                steps.append((0, -self._space_size, old_location))
             old_location += 1
-            self.indicate_old_pos(player, old_location)
+
+    def animate_frame(self):
+        """ Moves the token of the first queued move by one frame, then schedules the next frame. """
+        self._frame_id = None
+        player_gui, color, steps, on_done = self._moves[0]
+        if self._step < len(steps):
+            x_axis, y_axis, trail_index = steps[self._step]
+            part = self._frames_per_space
+            # Moving by the difference between two fractions means the frames always add up to the whole step.
+            self.move_obj(player_gui, x_axis * (self._frame + 1) / part - x_axis * self._frame / part,
+                          y_axis * (self._frame + 1) / part - y_axis * self._frame / part)
+            self._frame += 1
+            if self._frame == part:
+                self._frame = 0
+                self._step += 1
+                if trail_index is not None:
+                    self.indicate_old_pos(trail_index, color)
+        if self._step >= len(steps):
+            self.finish_move()
+        else:
+            self._frame_id = self._canvas.after(self._frame_ms, self.animate_frame)
+
+    def finish_move(self):
+        """ Removes the finished move from the queue, starts the next one or starts fading the trail. """
+        on_done = self._moves.popleft()[3]
+        self._step = 0
+        self._frame = 0
+        if self._moves:
+            self._frame_id = self._canvas.after(self._frame_ms, self.animate_frame)
+        else:
+            self._trail_id = self._canvas.after(self._trail_ms, self.fade_trail)
+        if on_done is not None:
+            on_done()
+
+    def cancel_moves(self, run_callbacks=True):
+        """ Cancels every queued move.  Tokens jump straight to where their moves would have ended so the board still
+        matches the game, and the trail is cleared.  If run_callbacks is True, the on_done callbacks still run. """
+        if self._frame_id is not None:
+            self._canvas.after_cancel(self._frame_id)
+            self._frame_id = None
+        moves = self._moves
+        self._moves = deque()
+        first = True
+        for player_gui, color, steps, on_done in moves:
+            start = self._step if first else 0
+            x_axis = sum(step[0] for step in steps[start:])
+            y_axis = sum(step[1] for step in steps[start:])
+            if first and start < len(steps):
+                x_axis -= steps[start][0] * self._frame / self._frames_per_space
+                y_axis -= steps[start][1] * self._frame / self._frames_per_space
+            self.move_obj(player_gui, x_axis, y_axis)
+            first = False
+        self._step = 0
+        self._frame = 0
+        self.stop_trail_fade()
+        while self._shown_trail:
+            self._canvas.itemconfig(self._shown_trail.popleft(), state="hidden")
+        if run_callbacks:
+            for move in moves:
+                if move[3] is not None:
+                    move[3]()
+
+    def is_animating(self):
+        """ Returns True while any move is queued or playing. """
+        return len(self._moves) > 0
 
     def move_obj(self, obj, x_axis, y_axis):
         """ Moves a GUI object. """
         self._canvas.move(obj, x_axis, y_axis)
 
-    def indicate_old_pos(self, player, pos):
-        """ Leaves a tail of GUI objects to indicate where player has moved from.  (Creates a pseudo-animation) """
-        pos -= 1
-        color = self._canvas.itemcget(player, "fill")
+    def indicate_old_pos(self, pos, color):
+        """ Leaves a tail of GUI objects to indicate where player has moved from, using the next oval in the pool. """
+        if not self._trail:
+            for count in range(0, self._trail_size):
+                self._trail.append(self._canvas.create_oval(0, 0, 0, 0, state="hidden", tags="trail"))
+        oval = self._trail[self._next_trail]
+        self._next_trail = (self._next_trail + 1) % self._trail_size
+        if oval in self._shown_trail:
+            self._shown_trail.remove(oval)
         spaces = get_spaces(self._reg)
-        space = spaces[pos]
-        space_gui = space.get_gui_element()
+        space_gui = spaces[pos].get_gui_element()
         pos = self._canvas.coords(space_gui)
-        self.create_oval(pos, color)
-
-    def create_oval(self, pos, color):
-        """ Creates an oval GUI object at the given position. """
-        oval = self._canvas.create_oval(pos[0] + 25, pos[1] + 25, pos[2] - 25, pos[3] - 25, fill=color)
-        self._indicators.append(oval)
-
-    def remove_indicators(self):
-        """ Removes the tail GUI objects one at a time. """
-        self._dice_button.hide_dice()
-        self._canvas.update()
-        for oval in self._indicators:
-            #  Sets the animation speed:
-            self._canvas.after(100, self.delete_oval(oval))  # 100 is the ideal animation speed determined by tests.
-            self._canvas.update()
-        self._indicators = []
-        self._dice_button.show_dice()
-
-    def delete_oval(self, oval):
-        """ Deletes the given GUI oval object. """
-        self._canvas.delete(oval)
+        self._canvas.coords(oval, pos[0] + 25, pos[1] + 25, pos[2] - 25, pos[3] - 25)
+        self._canvas.itemconfig(oval, fill=color, state="normal")
+        self._canvas.tag_raise(oval)
+        self._shown_trail.append(oval)
+
+    def fade_trail(self):
+        """ Hides the oldest trail oval, then schedules hiding the next one. """
+        self._trail_id = None
+        if self._shown_trail:
+            self._canvas.itemconfig(self._shown_trail.popleft(), state="hidden")
+        if self._shown_trail:
+            self._trail_id = self._canvas.after(self._trail_ms, self.fade_trail)
+
+    def stop_trail_fade(self):
+        """ Stops the trail from fading (a new move is about to add to it). """
+        if self._trail_id is not None:
+            self._canvas.after_cancel(self._trail_id)
+            self._trail_id = None
 
 
 class GuiGameLogic:
@@ -613,48 +866,37 @@ class GuiGameLogic:
         self._canvas = canvas
         self._reg = real_estate_game
         self._hub = hub
-        self._stats = hub.get_stats()
         self._movement = hub.get_player_movement()
-        self._add_button = hub.get_add_button()
         self._dice_button = hub.get_dice_button()
         self._buy_button = hub.get_buy_button()
         self._cur_player_name = ""
         self._game_over = False
-        self._victory_lap = 0
-        self._lap_max = 20
+        self._ai_only_turns = 20  # Turn cap for a game with only AI players left, if it has no turn cap of its own.
+        self._expectimax = None  # The ExpectimaxBot, made the first time an expectimax player decides.
+        self._expectimax_seconds = 1.0  # Thinking time per decision, it thinks in the bot worker thread.
 
     def next_player_turn(self, cur_player):
-        """ Indexes through the players list and sets the current player = next player."""
-        player_list = get_players_as_list(self._reg)
-        cur_index = player_list.index(cur_player)
-        if cur_index < len(player_list) - 1:
-            next_player = player_list[player_list.index(cur_player) + 1]
-        else:
-            next_player = player_list[0]
-        self._cur_player_name = next_player
-        self.check_if_bankrupt(next_player)
-
-    def check_if_bankrupt(self, name):
-        """ Checks if a player is bankrupt, if they are it skips their turn. """
-        players = get_players(self._reg)
-        next_player = players[name]
-        money = next_player.get_balance()
-        if money <= 0:
-            self.next_player_turn(name)
-        else:
-            self.set_cur_player(name)
+        """ Sets the current player = the next player in turn order who isn't bankrupt."""
+        next_player = self._reg.get_next_active_player(cur_player)
+        self._cur_player_name = next_player if next_player is not None else cur_player
+        self.set_cur_player(self._cur_player_name)
 
     def move_player(self, num_spaces):
         """ If there is a player, moves the player.  Otherwise, it creates a player."""
         if self._cur_player_name != '':
-            self._movement.move_player(self._cur_player_name, num_spaces)
+            self._movement.move_player(self._cur_player_name, num_spaces, self.move_finished)
             self._reg.move_player(self._cur_player_name, num_spaces)
+            self.check_for_winner()
             self.next_player_turn(self._cur_player_name)
-            self.check_for_ai_logic()
+            if get_players(self._reg)[self._cur_player_name].get_ai():
+                self._dice_button.hide_dice()  # Humans can't roll for the AI while the animation plays.
         else:
-            self._add_button.add_player_button_press()
+            self._hub.get_add_button().add_player_button_press()
             self.set_cur_player()
 
+    def get_cur_player_name(self):
+        return self._cur_player_name
+
     def set_cur_player(self, name=None):
         """ Sets the current player, then updates the current player display in the GUI. """
         if name is None:
@@ -663,9 +905,18 @@ class GuiGameLogic:
         else:
             self._cur_player_name = name
         player = self._cur_player_name
-        self._stats.show_cur_player_stats(player)
+        self._hub.get_stats().show_cur_player_stats(player)
         self._buy_button.set_buy_button_color(player)
 
+    def move_finished(self):
+        """ Called when a token finishes moving.  Once every queued move has played, the next turn can start. """
+        if not self._movement.is_animating():
+            network = self._hub.get_network()
+            if network is not None:
+                network.update_dice()
+            else:
+                self.check_for_ai_logic()
+
     def check_for_ai_logic(self):
         """ Checks to see if player needs to use AI logic. """
         players = get_players(self._reg)
@@ -678,30 +929,42 @@ class GuiGameLogic:
             self._dice_button.show_dice()
 
     def do_ai_logic(self):
-        """ A very simple AI. """
+        """ A very simple AI.  Expectimax players think in the bot worker thread so the window keeps drawing,
+        and finish their turn in finish_ai_turn once the decision comes back. """
+        name = self._cur_player_name
+        player = get_players(self._reg)[name]
+        if player.get_ai_strategy() == "expectimax" and player.get_position() > 0:
+            bot = self.get_expectimax()
+            self._hub.get_bot_worker().think(bot.decide, bot.build_position(self._reg, name),
+                                             lambda buy: self.finish_ai_turn(name, buy), name)
+            return
+        self.finish_ai_turn(name, None)
+
+    def finish_ai_turn(self, name, buy):
+        """ Buys (if buy is True, or if buy is None and the simple AI wants to) and rolls for the AI player.
+        buy is None for simple AI players, and for expectimax players whose decision failed. """
+        if name != self._cur_player_name:
+            return  # The turn moved on while the bot was thinking.
         try:
-            if self.should_ai_buy_space():
-                self._canvas.after(100, self.buy_space())
-            if self.ai_victory_lap():
-                self._canvas.after(100, self._dice_button.roll_dice())
+            if buy or (buy is None and self.should_simple_ai_buy_space()):
+                self.buy_space()
+            if self.ai_should_roll():
+                self._canvas.after(100, self._dice_button.roll_dice)
         except:
             # Prevents error when closing a game made up entirely of AI players.
             pass
 
-    def ai_victory_lap(self):
-        """ Some logic to determine what to do when only AI players remain.  (Prevents recursion depth errors)
-        First if the game lasts for 20 rounds, it picks an arbitrary winner (it awards that player 10k).
-        Then after an AI has won the game the AI circles the map a few times then the game closes. """
-        if self._victory_lap == 20:
-            self.pick_arbitrary_winner()
-        if not self.humans_active():
-            self._victory_lap += 1
+    def ai_should_roll(self):
+        """ Returns True if the AI should roll for the next turn, which is only until a winner is declared.
+        Once only AI players are left, a game without a turn cap (see RealEstateGame.set_end_conditions) gets one
+        _ai_only_turns turns away, so the bots can't play on forever. """
         if self._game_over:
-            self._victory_lap += 2
-        if self._victory_lap > self._lap_max:
-            self._reg.quit_game()
             return False
-        return True
+        turn_cap, stall_rounds = self._reg.get_end_conditions()
+        if turn_cap is None and not self.humans_active():
+            self._reg.set_end_conditions(self._reg.get_turns() + self._ai_only_turns, stall_rounds)
+            self.check_for_winner()
+        return not self._game_over
 
     def humans_active(self):
         """ Checks to see if any human players are active. """
@@ -711,125 +974,379 @@ class GuiGameLogic:
                 bal = players[player].get_balance()
                 if bal > 0:
                     return True
-        self._lap_max = 100
         return False
 
-    def pick_arbitrary_winner(self):
-        """ Gives an arbitrary AI player 100,000$ so that the AI only game will end soon. """
-        players = get_players(self._reg)
-        cur_player = players[self._cur_player_name]
-        cur_player.set_balance(100000)
-        for player in players:
-            if player != self._cur_player_name:
-                bal = players[player].get_balance()
-                if bal > 0:
-                    bal = bal - 25
-                    players[player].set_balance(-bal)
-
-    def should_ai_buy_space(self):
-        """ A few simple conditions to determine weather or not the AI should buy a space. """
+    def should_simple_ai_buy_space(self):
+        """ A few simple conditions to determine weather or not the AI should buy a space (whatever the player's
+        strategy, it is also the fallback when a bot's decision fails).  Cautious players also keep enough money for
+        the rent of other players' spaces. """
         bal = self._reg.get_player_account_balance(self._cur_player_name)
         pos = self._reg.get_player_current_position(self._cur_player_name)
         if pos > 0:
             spaces = get_spaces(self._reg)
-            space = spaces[pos]
-            price = space.get_purchase_amt()
-            if self.ai_should_keep_saving(bal, price):
-                return False
-            if random.randint(1, 10) > 8:
-                # 20% chance AI will try to buy any space they land on.
-                return True
-            if self.is_space_prime_real_estate(bal, price):
-                return True
+            price = spaces[pos].get_purchase_amt()
+            exposure = 0
+            if get_players(self._reg)[self._cur_player_name].get_ai_strategy() == "cautious":
+                exposure = self._reg.get_rent_exposure(self._cur_player_name)
+            return AiLogic.should_ai_buy_space(bal, pos, price, self._reg.get_rng(), exposure)
         return False
 
-    def ai_should_keep_saving(self, bal, price):
-        """ Simple AI logic to determine if the AI should save up. """
-        if price * 1.4 <= bal and 500 < bal < 1500:
-            if random.randint(1, 10) <= 9:
-                # It's a pretty good idea to save but 10% chance they won't (simulate impulsive decision-making)
-                return True
-        return False
-
-    def is_space_prime_real_estate(self, bal, price):
-        """ Simple AI logic to simulate human player behaviour.
-        If the space is prime real estate or the AI has plenty of money, they will try to buy the space they are on. """
-        if bal >= 2600:
-            # If AI has a very large amount of money, buy any space the AI lands on.
-            return True
-        if bal >= price + 100 and price >= 750:
-            return True
-        if price >= 1000 and 1000 < bal < 1500:
-            return True
-        if price >= 1500 and bal >= 1500:
-            return True
-        return False
+    def get_expectimax(self):
+        """ Returns the ExpectimaxBot shared by every expectimax player, making it the first time it is needed. """
+        if self._expectimax is None:
+            from ExpectimaxBot import ExpectimaxBot
+            self._expectimax = ExpectimaxBot(self._expectimax_seconds)
+        return self._expectimax
 
     def buy_space(self):
         """ If the current player can buy the space they are on, they buy it, and it changes color. """
         player = self._cur_player_name
+        network = self._hub.get_network()
+        if network is not None and not network.send_buy(player):
+            return
         if self._reg.buy_space(player):
             self._buy_button.modify_space_color(player)
             self._buy_button.set_buy_button_color(player)
-            self._stats.show_cur_player_stats(player)
+            self._hub.get_stats().show_cur_player_stats(player)
 
     def player_bankrupt(self, name):
         """ Removes the fill color from a bankrupt players GUI element. """
         players = get_players(self._reg)
         player = players[name]
         player_gui = player.get_gui_element()
-        player_color = self._canvas.itemcget(player_gui, "fill")
+        stats = self._hub.get_stats()
+        player_color = stats.get_player_color(name)
         if player_color != "":
             self._canvas.itemconfig(player_gui, fill="", outline=player_color)
+            stats.set_player_color(name, "")
 
-    def empty_bankrupt_space(self, space):
-        """ Removes the fill color from a bankrupt players previously owned space. """
-        space = space.get_gui_element()
-        color = self._canvas.itemcget(space, "fill")
-        self._canvas.itemconfig(space, fill="", outline=color)
+    def empty_bankrupt_spaces(self, name):
+        """ Removes the fill color from every space a bankrupt player owned with one tag-wide itemconfig call,
+        then removes the player's owner tag from those spaces. """
+        owner_tag = get_owner_tag(get_players(self._reg)[name])
+        color = self._canvas.itemcget(owner_tag, "fill")  # All of a player's spaces share their color.
+        self._canvas.itemconfig(owner_tag, fill="", outline=color)
+        self._canvas.dtag(owner_tag, owner_tag)
+        self._hub.get_stats().forget_space_fills()
 
     def check_for_winner(self):
-        """ Checks to see if the game is over. """
+        """ Checks to see if the game is over (by bankruptcy or an end condition), only one winner is declared. """
+        if self._game_over:
+            return
         winner = self._reg.check_game_over()
         if winner != "":
             self.game_is_over(winner)
 
     def game_is_over(self, winner):
         """ The game is over, sets all spaces on the board to match the winning players fill color. """
+        stats = self._hub.get_stats()
+        color = stats.get_player_color(winner)
+        self._canvas.itemconfig("space", fill=color)
+        stats.forget_space_fills()
+        self._game_over = True
+
+
+class GuiBotWorker:
+    """ Makes slow bot decisions in a worker thread so the tkinter loop never waits for them.
+    Finished decisions are put in a queue that the GUI polls with after(), and their callbacks run on the GUI thread.
+    While a bot is thinking, a "thinking" indicator is shown under the dice. """
+
+    def __init__(self, canvas, poll_ms=16):
+        from concurrent.futures import ThreadPoolExecutor
+        import queue
+        self._canvas = canvas
+        self._poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot")
+        self._results = queue.Queue()
+        self._pending = 0
+        self._poll_id = None
+        self._indicator = None
+        self._label = ""
+        self._polls = 0
+
+    def think(self, function, args, on_done, label="bot"):
+        """ Calls function(*args) in the worker thread, then on_done(result) on the GUI thread.
+        function must only use its arguments, the game can change while it runs. """
+        self._pending += 1
+        self._label = label
+        self._executor.submit(self.run_job, function, args, on_done)
+        self.show_indicator()
+        if self._poll_id is None:
+            self._poll_id = self._canvas.after(self._poll_ms, self.poll)
+
+    def run_job(self, function, args, on_done):
+        """ Runs in the worker thread. """
+        try:
+            self._results.put((on_done, function(*args), None))
+        except Exception as error:
+            self._results.put((on_done, None, error))
+
+    def poll(self):
+        """ Runs the callbacks of every finished decision, and keeps polling while any are still being made.
+        A decision that raised is logged and its callback gets None, so the turn still finishes. """
+        self._poll_id = None
+        self._polls += 1
+        while not self._results.empty():  # Only this thread takes results out, so get_nowait can't miss.
+            on_done, result, error = self._results.get_nowait()
+            self._pending -= 1
+            if error is not None:
+                print(f"Bot decision failed: {error!r}", file=sys.stderr)
+            on_done(result)
+        if self._pending:
+            self.show_indicator()
+            self._poll_id = self._canvas.after(self._poll_ms, self.poll)
+        else:
+            self.hide_indicator()
+
+    def show_indicator(self):
+        """ Shows (or animates) the thinking indicator. """
+        text = f"{self._label} is thinking" + "." * (self._polls // 15 % 4)
+        if self._indicator is None:
+            self._indicator = self._canvas.create_text(1125, 260, text=text, font=("bold", 14))
+        else:
+            self._canvas.itemconfig(self._indicator, text=text, state="normal")
+
+    def hide_indicator(self):
+        if self._indicator is not None:
+            self._canvas.itemconfig(self._indicator, state="hidden")
+
+    def is_thinking(self):
+        return self._pending > 0
+
+    def shutdown(self):
+        """ Stops the worker thread once the current decision (if any) is made. """
+        self._executor.shutdown(wait=False)
+
+
+class GuiNetworkSync:
+    """ Plays the GUI against a GameServer (see GameServer.py).  The local player's purchases are sent to the server
+    and also made straight away on the local game, without waiting for the network.  Rolls are only sent: the server
+    rolls the dice, which spin until its roll arrives, and the move is animated from the server's diff.
+    The server replies with one state diff per turn.  The diffs are applied to a confirmed copy of the
+    game (the state the server agrees on), diffs of other players are animated on the board, and the local game is
+    then corrected wherever it disagrees with the confirmed copy.  Replies are polled with after(), the socket is read
+    by the NetworkClient thread. """
+
+    def __init__(self, canvas, real_estate_game, hub, client, poll_ms=16):
+        self._canvas = canvas
+        self._reg = real_estate_game
+        self._hub = hub
+        self._client = client
+        self._poll_ms = poll_ms
+        self._confirmed = None  # Copy of the game with only the server's changes applied.
+        self._name = None  # The local player.
+        self._turn = None  # Whose turn the server says it is.
+        self._winner = ""
+        self._waiting = {}  # request id: time sent, for every local action the server hasn't answered yet.
+        self._unowned_fill = {}  # pos: space fill color from before it was bought.
+        self._latencies = []
+        self._corrections = 0
+
+    def join_new_table(self, name, bots=3):
+        """ Creates a table, joins it with the bots and starts the game, then starts polling the server.
+        The start reply is the only full picture of the game, everything after it arrives as diffs. """
+        table = self._client.request(op="create")["table"]
+        self._name = self._client.request(op="join", table=table, name=name)["name"]
+        for count in range(0, bots):
+            self._client.request(op="add_bot", table=table, name="Bot")
+        from GameEvents import build_game_from_start
+        reply = self._client.request(op="start")
+        start = reply["events"][0]
+        self._confirmed = build_game_from_start(type(self._reg)(), start)
+        self._hub.get_add_button().add_players([{"name": name} for name in start[4]])
+        self.handle_turn(reply, False)
+        self._canvas.after(self._poll_ms, self.poll)
+
+    def send_roll(self, name):
+        """ Asks the server to roll for the local player.  Returns True if the request was sent. """
+        if not self.is_my_turn(name):
+            return False
+        self._waiting[self._client.send(op="roll")] = time.perf_counter()
+        return True
+
+    def send_buy(self, name):
+        """ Sends the local player's purchase.  Returns True if it should also be made locally. """
+        if not self.is_my_turn(name):
+            return False
+        pos = self._reg.get_player_current_position(name)
+        self._unowned_fill.setdefault(pos, self._hub.get_stats().get_space_fill(pos))  # In case the server refuses.
+        self._waiting[self._client.send(op="buy")] = time.perf_counter()
+        return True
+
+    def is_my_turn(self, name):
+        """ Returns True if the local player may act: it is their turn and no earlier action is still unanswered. """
+        return name == self._name == self._turn and not self._waiting and self._winner == ""
+
+    def poll(self):
+        """ Handles every message that arrived from the server, then schedules the next poll. """
+        for message in self._client.poll():
+            own = message.get("id") in self._waiting
+            if own:
+                self._latencies.append(time.perf_counter() - self._waiting.pop(message["id"]))
+            if message["op"] == "turn":
+                self.handle_turn(message, own)
+            elif message["op"] == "closed":
+                return
+            elif own:
+                self._hub.get_dice_button().stop_spin()
+                self.reconcile()  # The server refused the action, undo what was predicted.
+                self.update_dice()
+        self._canvas.after(self._poll_ms, self.poll)
+
+    def handle_turn(self, message, own):
+        """ Applies the diffs of a turn message.  The first diff of a reply to a local purchase was already made
+        locally, every other diff (including the local player's moves, rolled by the server) is animated now. """
+        from GameEvents import apply_diff
+        predicted = own and "roll" not in message
+        if own and "roll" in message:
+            self._hub.get_dice_button().show_roll(message["roll"])
+        for index, diff in enumerate(message["diffs"]):
+            apply_diff(self._confirmed, diff)
+            if not (predicted and index == 0 and diff["mover"] == self._name):
+                self.play_remote(diff)
+        self.reconcile()
+        self._turn = message["turn"]
+        self._winner = message["winner"]
+        logic = self._hub.get_logic()
+        if self._turn is not None:
+            logic.set_cur_player(self._turn)
+        if self._winner != "":
+            logic.game_is_over(self._winner)
+        self.update_dice()
+
+    def play_remote(self, diff):
+        """ Animates a diff of another player's turn and applies it to the local game. """
+        from GameEvents import apply_diff
+        mover = diff["mover"]
+        player = self._reg.get_player_object(mover)
+        logic = self._hub.get_logic()
+        if diff["pos"] is not None:
+            num_spaces = (diff["pos"] - player.get_position()) % len(get_spaces(self._reg))
+            if num_spaces:
+                self._hub.get_player_movement().move_player(mover, num_spaces, logic.move_finished)
+        if None in diff["owners"].values():
+            logic.empty_bankrupt_spaces(mover)
+        apply_diff(self._reg, diff)
+        for pos in diff["owners"]:
+            if diff["owners"][pos] is not None:
+                self.paint_space(int(pos))
+        if player.get_balance() <= 0:
+            logic.player_bankrupt(mover)
+
+    def reconcile(self):
+        """ Corrects the local game (and board) wherever it disagrees with the confirmed copy. """
         players = get_players(self._reg)
-        player = players[winner]
-        player_gui = player.get_gui_element()
-        color = self._canvas.itemcget(player_gui, "fill")
+        for name in players:
+            player = players[name]
+            confirmed = self._confirmed.get_player_object(name)
+            if player.get_position() != confirmed.get_position():
+                self._corrections += 1
+                num_spaces = (confirmed.get_position() - player.get_position()) % len(get_spaces(self._reg))
+                self._hub.get_player_movement().move_player(name, num_spaces, self._hub.get_logic().move_finished)
+                player.set_position(confirmed.get_position())
+            if player.get_balance() != confirmed.get_balance():
+                self._corrections += 1
+                player.set_balance(confirmed.get_balance() - player.get_balance())
+                if player.get_balance() <= 0:
+                    self._hub.get_logic().player_bankrupt(name)
         spaces = get_spaces(self._reg)
-        for space in spaces:
-            gui = space.get_gui_element()
-            self._canvas.itemconfig(gui, fill=color)
-        self._game_over = True
+        for pos in range(1, len(spaces)):
+            owner = spaces[pos].get_owner()
+            confirmed = self._confirmed.get_game_space_object(pos).get_owner()
+            if (owner and owner.get_name()) != (confirmed and confirmed.get_name()):
+                self._corrections += 1
+                self._reg.set_space_owner(pos, None if confirmed is None else players[confirmed.get_name()])
+                self.paint_space(pos)
+        self._hub.get_stats().set_all_stat()
+
+    def paint_space(self, pos):
+        """ Colors a space to match its owner in the local game, or back to its unowned color. """
+        space = get_spaces(self._reg)[pos]
+        space_gui = space.get_gui_element()
+        for tag in self._canvas.gettags(space_gui):
+            if tag.startswith("owner_"):
+                self._canvas.dtag(space_gui, tag)
+        owner = space.get_owner()
+        stats = self._hub.get_stats()
+        if owner is None:
+            fill = self._unowned_fill.get(pos, "white")
+        else:
+            self._unowned_fill.setdefault(pos, stats.get_space_fill(pos))
+            fill = stats.get_player_color(owner.get_name())
+            self._canvas.addtag_withtag(get_owner_tag(owner), space_gui)
+        self._canvas.itemconfig(space_gui, fill=fill)
+        stats.set_space_fill(pos, fill)
+
+    def update_dice(self):
+        """ Shows the dice only when the local player can roll and every move on the board has finished. """
+        if self.is_my_turn(self._name) and not self._hub.get_player_movement().is_animating():
+            self._hub.get_dice_button().show_dice()
+        else:
+            self._hub.get_dice_button().hide_dice()
+
+    def get_latencies(self):
+        return self._latencies
+
+    def get_corrections(self):
+        return self._corrections
 
 
 class GuiPlayer:
     """ Creates the GUI representation of the player object. """
 
-    def __init__(self, canvas, color="red", shape_key="d"):
+    def __init__(self, canvas, color="red", shape_key="d", scale=1.0):
         self._canvas = canvas
         self._color = color
         self._shape_key = shape_key
+        self._scale = scale
 
     def create_player(self):
         """ Creates the GUI representation of the player object. """
-        points = [0, 0, 100, 0, 100, 100, 0, 100]
-        if self._shape_key == "d":
-            points = draw_a_dragon()
-        if self._shape_key == "m":
-            points = draw_a_mage()
-        if self._shape_key == "u":
-            points = draw_a_unicorn()
-        if self._shape_key == "k":
-            points = draw_a_knight()
+        points = SHAPES.get_coords(self._shape_key, self._scale)
         new_player = self._canvas.create_polygon(points, outline="black", fill=self._color, width=2)
         return new_player
 
 
+class GuiShapeRegistry:
+    """ Holds the vertex points of every player icon.  The points are flattened and scaled only once per icon and
+    scale, so creating a token is just a dictionary lookup.  New icons can be added with register_icon. """
+
+    def __init__(self):
+        self._icons = {}  # shape key: (label, list of (x, y) points)
+        self._keys = []  # Shape keys in the order they were registered (the order the icon button cycles through).
+        self._coords = {}  # (shape key, scale): flattened and scaled coordinates.
+
+    def register_icon(self, shape_key, label, points):
+        """ Adds an icon (or replaces the icon with the same shape key). """
+        if shape_key not in self._icons:
+            self._keys.append(shape_key)
+        self._icons[shape_key] = (label, points)
+        for key in [key for key in self._coords if key[0] == shape_key]:
+            del self._coords[key]
+
+    def get_coords(self, shape_key, scale=1.0):
+        """ Returns the flattened [x1, y1, x2, y2, ...] coordinates of the icon at the given scale.
+        Unknown shape keys get a plain square. """
+        coords = self._coords.get((shape_key, scale))
+        if coords is None:
+            if shape_key in self._icons:
+                points = self._icons[shape_key][1]
+            else:
+                points = [(0, 0), (100, 0), (100, 100), (0, 100)]
+            coords = []
+            for x_pos, y_pos in points:
+                coords.append(x_pos * scale)
+                coords.append(y_pos * scale)
+            self._coords[(shape_key, scale)] = coords
+        return coords
+
+    def get_keys(self):
+        return self._keys
+
+    def get_labels(self):
+        return [self._icons[key][0] for key in self._keys]
+
+
 def get_players(real_estate_game):
     """ Gets the player dictionary as it currently is in the real estate game. """
     players = real_estate_game.get_all_players()
@@ -849,12 +1366,9 @@ def get_players_as_list(real_estate_game):
     return players_list
 
 
-def get_cur_player_color(canvas, real_estate_game, cur_player):
-    """ Returns the color of the current player. """
-    player = real_estate_game.get_player_object(cur_player)
-    player_gui = player.get_gui_element()
-    player_color = canvas.itemcget(player_gui, "fill")
-    return player_color
+def get_owner_tag(player):
+    """ Returns the canvas tag given to every space the player owns. """
+    return f"owner_{player.get_gui_element()}"
 
 
 def draw_a_dragon():
@@ -893,3 +1407,10 @@ def draw_a_knight():
               (70, 50), (60, 38), (65, 75), (38, 75), (40, 60), (25, 75), (15, 55), (15, 35), (30, 30), (37, 33),
               (40, 30), (45, 30), (40, 25), (40, 15)]
     return points
+
+
+SHAPES = GuiShapeRegistry()  # Every icon a player can pick, see GuiShapeRegistry.
+SHAPES.register_icon("d", "Dragon", draw_a_dragon())
+SHAPES.register_icon("m", "Mage", draw_a_mage())
+SHAPES.register_icon("u", "Unicorn", draw_a_unicorn())
+SHAPES.register_icon("k", "Knight", draw_a_knight())
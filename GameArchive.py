@@ -0,0 +1,211 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: GameArchive.py writes and reads an on-disk columnar archive of simulated games.
+# Each column is a raw, fixed-width NumPy array in its own file and a small JSON header describes them, so a reader
+# can np.memmap billions of turns without parsing anything or loading the whole archive into memory.
+
+# Code Outline:
+# 2 classes 'ArchiveWriter', 'ArchiveReader'
+# ArchiveWriter:  Takes a snapshot of the Player and GameSpace objects after every turn and appends it to disk.
+# ArchiveReader:  Memory maps the columns of an archive and can restore any turn back onto a RealEstateGame.
+
+# Archive layout (one directory):
+# header.json     - format version, turn count, player names, space count and the dtype/shape of every column.
+# game.bin        - int32, one row per turn: the index of the game (in the order begin_game was called).
+# mover.bin       - int16, one row per turn: the index of the player who took the turn.
+# positions.bin   - int16, one row per turn, one column per player.
+# balances.bin    - int64, one row per turn, one column per player.
+# owners.bin      - int16, one row per turn, one column per space: the owner's player index or -1.
+# Player indexes and positions are int16 unless there are too many players or spaces, then int32 (see build_columns).
+
+import json
+import os
+import numpy as np
+
+ARCHIVE_FORMAT = "dnre-columnar"
+ARCHIVE_VERSION = 1
+HEADER_NAME = "header.json"
+NO_OWNER = -1
+
+
+class ArchiveWriter:
+    """ Appends a snapshot of the game state to a columnar archive after every turn. """
+
+    def __init__(self, path, player_names, space_count, chunk_turns=4096):
+        self._path = path
+        self._player_names = list(player_names)
+        self._player_index = {name: index for index, name in enumerate(self._player_names)}
+        self._space_count = space_count
+        self._chunk_turns = chunk_turns
+        self._columns = build_columns(len(self._player_names), space_count)
+        self._buffers = {}
+        self._files = {}
+        self._rows = 0  # Rows currently held in the buffers.
+        self._turns = 0  # Rows already flushed to disk.
+        self._games = []  # The seed (or None) of each game, in order.
+        os.makedirs(path, exist_ok=True)
+        for name in self._columns:
+            dtype, shape = self._columns[name]
+            self._buffers[name] = np.empty((chunk_turns,) + shape, dtype=dtype)
+            self._files[name] = open(os.path.join(path, f"{name}.bin"), "wb")
+        self.write_header()
+
+    def begin_game(self, seed=None):
+        """ Starts a new game, every turn recorded after this belongs to it. """
+        self._games.append(seed)
+
+    def record_turn(self, game, mover_index):
+        """ Takes a snapshot of the positions, balances and owners of the given RealEstateGame. """
+        if not self._games:
+            self.begin_game()
+        row = self._rows
+        self._buffers["game"][row] = len(self._games) - 1
+        self._buffers["mover"][row] = mover_index
+        positions = self._buffers["positions"][row]
+        balances = self._buffers["balances"][row]
+        players = game.get_all_players()
+        for index, name in enumerate(self._player_names):
+            player = players[name]
+            positions[index] = player.get_position()
+            balances[index] = player.get_balance()
+        owners = self._buffers["owners"][row]
+        spaces = game.get_all_spaces()
+        for index in range(0, self._space_count):
+            owner = spaces[index].get_owner()
+            owners[index] = NO_OWNER if owner is None else self._player_index[owner.get_name()]
+        self._rows += 1
+        if self._rows == self._chunk_turns:
+            self.flush()
+
+    def flush(self):
+        """ Appends the buffered rows to the column files and updates the header. """
+        if self._rows == 0:
+            return
+        for name in self._columns:
+            self._buffers[name][:self._rows].tofile(self._files[name])
+            self._files[name].flush()
+        self._turns += self._rows
+        self._rows = 0
+        self.write_header()
+
+    def close(self):
+        """ Flushes any remaining rows and closes the column files. """
+        self.flush()
+        for name in self._files:
+            self._files[name].close()
+        self._files = {}
+
+    def write_header(self):
+        """ Writes the header, replacing the old one in a single rename so readers never see half a header. """
+        header = {"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION, "turns": self._turns,
+                  "players": self._player_names, "spaces": self._space_count, "games": self._games,
+                  "columns": {name: {"dtype": np.dtype(self._columns[name][0]).str,
+                                     "shape": list(self._columns[name][1])} for name in self._columns}}
+        tmp_path = os.path.join(self._path, HEADER_NAME + ".tmp")
+        with open(tmp_path, "w") as header_file:
+            json.dump(header, header_file)
+        os.replace(tmp_path, os.path.join(self._path, HEADER_NAME))
+
+    def get_turn_count(self):
+        return self._turns + self._rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ArchiveReader:
+    """ Memory maps the columns of an archive written by ArchiveWriter. Nothing is parsed or loaded up front. """
+
+    def __init__(self, path):
+        self._path = path
+        with open(os.path.join(path, HEADER_NAME)) as header_file:
+            self._header = json.load(header_file)
+        if self._header.get("format") != ARCHIVE_FORMAT or self._header.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"{path} is not a version {ARCHIVE_VERSION} {ARCHIVE_FORMAT} archive.")
+        self._columns = {}
+
+    def get_column(self, name):
+        """ Returns the named column as a read only array with one row per turn. """
+        if name not in self._columns:
+            info = self._header["columns"][name]
+            shape = (self._header["turns"],) + tuple(info["shape"])
+            if shape[0] == 0:
+                self._columns[name] = np.empty(shape, dtype=info["dtype"])  # np.memmap can't map an empty file.
+            else:
+                file_name = os.path.join(self._path, f"{name}.bin")
+                self._columns[name] = np.memmap(file_name, dtype=info["dtype"], mode="r", shape=shape)
+        return self._columns[name]
+
+    def get_games(self):
+        return self.get_column("game")
+
+    def get_movers(self):
+        return self.get_column("mover")
+
+    def get_positions(self):
+        return self.get_column("positions")
+
+    def get_balances(self):
+        return self.get_column("balances")
+
+    def get_owners(self):
+        return self.get_column("owners")
+
+    def get_turn_count(self):
+        return self._header["turns"]
+
+    def get_player_names(self):
+        return self._header["players"]
+
+    def get_space_count(self):
+        return self._header["spaces"]
+
+    def get_game_seeds(self):
+        return self._header["games"]
+
+    def get_game_turns(self, game_index):
+        """ Returns the (start, stop) turn rows of the given game.  Turns are stored in game order. """
+        games = self.get_games()
+        start = int(np.searchsorted(games, game_index, side="left"))
+        stop = int(np.searchsorted(games, game_index, side="right"))
+        return start, stop
+
+    def restore_turn(self, game, turn):
+        """ Sets the positions, balances and owners of a RealEstateGame to match the given turn row.
+        The game must have the same players and spaces as the archive. """
+        names = self.get_player_names()
+        positions = self.get_positions()[turn]
+        balances = self.get_balances()[turn]
+        owners = self.get_owners()[turn]
+        players = game.get_all_players()
+        for index, name in enumerate(names):
+            player = players[name]
+            player.set_position(int(positions[index]))
+            player.set_balance(int(balances[index]) - player.get_balance())
+        for index in range(0, self.get_space_count()):
+            owner = int(owners[index])
+            game.set_space_owner(index, None if owner == NO_OWNER else players[names[owner]])
+        game.refresh_active_players()
+
+
+def build_columns(player_count, space_count):
+    """ Returns the dtype and per-turn shape of every column in the archive.
+    Player indexes and positions get the smallest dtype their counts fit in, so they can't silently wrap around. """
+    player_dtype = get_index_dtype(player_count)
+    columns = {"game": (np.int32, ()),
+               "mover": (player_dtype, ()),
+               "positions": (get_index_dtype(space_count), (player_count,)),
+               "balances": (np.int64, (player_count,)),
+               "owners": (player_dtype, (space_count,))}
+    return columns
+
+
+def get_index_dtype(count):
+    """ Returns int16, or int32 if it's needed, for a column holding indexes below count (and -1). """
+    if count - 1 <= np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
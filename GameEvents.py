@@ -0,0 +1,170 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: GameEvents.py turns the events of a running game into a stream of plain tuples that can be stored,
+# sent to another thread (or process), and applied to a copy of the game to bring it up to date.
+# It does not import tkinter, so headless simulations can record events without the GUI.
+
+# Code Outline:
+# 1 class 'GameEventStream'
+# GameEventStream:  A GameListener that appends every game event to a thread safe queue of tuples.
+# 6 non-class functions:
+# build_game_from_start: Creates a copy of a game from its "start" event.
+# apply_event: Applies a single event tuple to a copy of the game.
+# build_turn_diffs: Sums up the events of one or more turns into one state diff per turn.
+# apply_diff: Applies a state diff to a copy of the game.
+# save_events: Writes a list of events to a file, one JSON list per line.
+# load_events: Reads the events written by save_events.
+
+# Event tuples (the first item is always the event type):
+# ("start", go_amt, space_names, rent_amounts, player_names, balances)
+# ("move", name, old_pos, new_pos, passed_go)
+# ("buy", name, pos, price)
+# ("rent", name, owner_name, pos, amount)
+# ("bankrupt", name, released_positions)
+# ("end", winner)
+
+# State diffs (one per turn, or per purchase made outside a turn):
+# {"mover": name, "pos": new position (None if the mover didn't move), "balances": {name: change in balance},
+#  "owners": {pos: new owner name (None if the space was released)}}
+
+import json
+import time
+from collections import deque
+from RealEstateGame import GameListener
+
+
+class GameEventStream(GameListener):
+    """ A GameListener that appends every game event to a queue of tuples.  Appending never blocks, so whatever is
+    reading the queue (for example the SpectatorViewer) can never slow the game down.
+    If turn_delay is set, the game sleeps that many seconds after every move, to watch it live at a reduced rate. """
+
+    def __init__(self, turn_delay=0.0, max_events=None):
+        self._events = deque(maxlen=max_events)  # deque appends and pops are thread safe.
+        self._turn_delay = turn_delay
+
+    def on_game_start(self, game):
+        spaces = game.get_all_spaces()
+        players = game.get_all_players()
+        self._events.append(("start", spaces[0].get_payout(), [space.get_name() for space in spaces[1:]],
+                             [space.get_rent() for space in spaces[1:]], list(players.keys()),
+                             [players[name].get_balance() for name in players]))
+
+    def on_game_end(self, game, winner):
+        self._events.append(("end", winner))
+
+    def on_move(self, name, old_pos, new_pos, passed_go):
+        self._events.append(("move", name, old_pos, new_pos, passed_go))
+        if self._turn_delay:
+            time.sleep(self._turn_delay)
+
+    def on_buy(self, name, pos, price):
+        self._events.append(("buy", name, pos, price))
+
+    def on_rent(self, name, owner_name, pos, amount):
+        self._events.append(("rent", name, owner_name, pos, amount))
+
+    def on_bankrupt(self, name, released_positions):
+        self._events.append(("bankrupt", name, list(released_positions)))
+
+    def pop_all(self):
+        """ Removes and returns every event currently in the queue, oldest first. """
+        events = []
+        try:
+            while True:
+                events.append(self._events.popleft())
+        except IndexError:
+            return events
+
+    def get_events(self):
+        return self._events
+
+
+def build_game_from_start(game, event):
+    """ Sets up the board and players of an empty game to match a "start" event, then returns the game.
+    The game can be either version of RealEstateGame. """
+    go_amt, space_names, rent_amounts, player_names, balances = event[1:]
+    game.create_board(go_amt, rent_amounts, space_names)
+    for index in range(0, len(player_names)):
+        game.create_player(player_names[index], balances[index])
+    return game
+
+
+def apply_event(game, event):
+    """ Applies an event to a copy of the game.  The changes are set directly instead of being replayed through the
+    game rules, so the copy always ends up exactly like the game that sent the events. """
+    kind = event[0]
+    if kind == "move":
+        name, old_pos, new_pos, passed_go = event[1:]
+        player = game.get_player_object(name)
+        player.set_position(new_pos)
+        if passed_go:
+            player.set_balance(game.get_game_space_object(0).get_payout())
+    elif kind == "buy":
+        name, pos, price = event[1:]
+        player = game.get_player_object(name)
+        game.set_space_owner(pos, player)
+        player.set_balance(-price)
+    elif kind == "rent":
+        name, owner_name, pos, amount = event[1:]
+        game.transfer_money(game.get_player_object(name), game.get_player_object(owner_name), amount)
+    elif kind == "bankrupt":
+        for pos in event[2]:
+            game.set_space_owner(pos, None)
+        game.remove_from_turn_order(event[1])
+
+
+def build_turn_diffs(events, go_amt):
+    """ Sums up the events of one or more turns into one state diff per turn (see the top of this file).
+    A turn is an optional purchase followed by a move and whatever rent or bankruptcy that move caused. """
+    diffs = []
+    diff = None
+    for event in events:
+        kind = event[0]
+        if kind in ("buy", "move") and (diff is None or diff["pos"] is not None or diff["mover"] != event[1]):
+            diff = {"mover": event[1], "pos": None, "balances": {}, "owners": {}}
+            diffs.append(diff)
+        if diff is None:
+            continue
+        balances = diff["balances"]
+        if kind == "move":
+            diff["pos"] = event[3]
+            if event[4]:
+                balances[event[1]] = balances.get(event[1], 0) + go_amt
+        elif kind == "buy":
+            balances[event[1]] = balances.get(event[1], 0) - event[3]
+            diff["owners"][event[2]] = event[1]
+        elif kind == "rent":
+            balances[event[1]] = balances.get(event[1], 0) - event[4]
+            balances[event[2]] = balances.get(event[2], 0) + event[4]
+        elif kind == "bankrupt":
+            for pos in event[2]:
+                diff["owners"][pos] = None
+    return diffs
+
+
+def apply_diff(game, diff):
+    """ Applies a state diff to a copy of the game. """
+    if diff["pos"] is not None:
+        game.get_player_object(diff["mover"]).set_position(diff["pos"])
+    for name in diff["balances"]:
+        game.get_player_object(name).set_balance(diff["balances"][name])
+    for pos in diff["owners"]:
+        owner = diff["owners"][pos]
+        game.set_space_owner(int(pos), None if owner is None else game.get_player_object(owner))
+    for name in diff["balances"]:
+        if diff["balances"][name] < 0 and game.get_player_account_balance(name) <= 0:
+            game.remove_from_turn_order(name)
+
+
+def save_events(events, path):
+    """ Writes the events to a file, one JSON list per line. """
+    with open(path, "w") as event_file:
+        for event in events:
+            event_file.write(json.dumps(event) + "\n")
+
+
+def load_events(path):
+    """ Reads the events written by save_events, as tuples. """
+    with open(path) as event_file:
+        return [tuple(json.loads(line)) for line in event_file if line.strip()]
@@ -0,0 +1,82 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: GameRng.py is the random number generator a game carries with it, instead of every part of the game
+# drawing from the module-level random.  It is backed by a NumPy counter-based generator (PCG64 or Philox) and draws
+# its numbers in blocks: the first randint(1, 6) draws a block of rolls in one NumPy call and the next rolls are
+# handed out from it.  Every game (or thread) gets its own GameRng, so a seed replays the same game and nothing
+# waits on a shared generator.
+
+# Code Outline:
+# 1 class 'GameRng'
+# GameRng:  A seeded generator with the randint, randrange and random methods of random.Random, drawn in blocks.
+
+import numpy as np
+
+BIT_GENERATORS = {"pcg64": np.random.PCG64, "philox": np.random.Philox}
+
+
+class GameRng:
+    """ A seeded random number generator with the randint, randrange and random methods of random.Random, so it can
+    be passed anywhere an rng is taken (AiLogic, HeadlessRunner, the GUI).
+    Every range asked for gets its own block of block_size numbers drawn ahead of time, so a roll usually costs one
+    next() on a list iterator.  The same seed and the same calls always give the same numbers, but the numbers are
+    not the ones random.Random(seed) would give. """
+
+    def __init__(self, seed=None, bit_generator="pcg64", block_size=1024):
+        if bit_generator not in BIT_GENERATORS:
+            raise ValueError(f"bit_generator must be one of {', '.join(BIT_GENERATORS)}.")
+        self._bit_generator = bit_generator
+        self._block_size = block_size
+        self._seed_sequence = None
+        self._generator = None
+        self._blocks = {}  # (low, high): an iterator over the numbers drawn ahead of time for that range.
+        self._floats = iter(())
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """ Starts the stream again from the seed (an int, a NumPy SeedSequence, or None for a fresh random seed),
+        dropping every number drawn ahead of time. """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self._seed_sequence = seed
+        self._generator = np.random.Generator(BIT_GENERATORS[self._bit_generator](seed))
+        self._blocks = {}
+        self._floats = iter(())
+
+    def randint(self, low, high):
+        """ Returns a random int from low to high, both included. """
+        try:
+            return next(self._blocks[(low, high)])
+        except (KeyError, StopIteration):
+            block = iter(self._generator.integers(low, high + 1, size=self._block_size).tolist())
+            self._blocks[(low, high)] = block
+            return next(block)
+
+    def randrange(self, start, stop):
+        """ Returns a random int from start up to, but not including, stop. """
+        return self.randint(start, stop - 1)
+
+    def random(self):
+        """ Returns a random float from 0.0 up to, but not including, 1.0. """
+        try:
+            return next(self._floats)
+        except StopIteration:
+            self._floats = iter(self._generator.random(self._block_size).tolist())
+            return next(self._floats)
+
+    def roll_die(self):
+        return self.randint(1, 6)
+
+    def draw_rolls(self, count):
+        """ Returns a NumPy array of count die rolls in one call, for code that works on whole arrays.
+        They come straight from the generator, not from the block randint(1, 6) hands out. """
+        return self._generator.integers(1, 7, size=count)
+
+    def spawn(self, count):
+        """ Returns count new GameRngs with streams independent of this one and of each other (for other games or
+        threads), made from this generator's seed so they are reproducible too. """
+        return [GameRng(child, self._bit_generator, self._block_size) for child in self._seed_sequence.spawn(count)]
+
+    def get_bit_generator(self):
+        return self._bit_generator
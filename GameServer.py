@@ -0,0 +1,366 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: GameServer.py hosts many Real Estate Game tables in one process with an asyncio TCP server.
+# Clients talk to it with line delimited JSON (one JSON object per line).  Bots play on the server with the same
+# AI logic as the GUI AI players, and every table has its own game, random number generator and event stream.
+# It also contains a load generator, to measure tables, turns per second and turn latency on one machine.
+
+# Code Outline:
+# 3 classes 'GameTable', 'GameServer', 'LoadClient'
+# GameTable:  One game: the players, the turn order, the bots and the rules (RealEstateGame).
+# GameServer:  Accepts connections and passes each request to the table it is for.
+# LoadClient:  Plays games against the server as fast as it can and measures the round trip of every roll.
+# 2 non-class functions:
+# run_load_test: Starts a server and a number of load clients and prints the results.
+# percentile: Returns a percentile of a list of numbers.
+
+# Protocol, client to server ("id" is optional and is copied into the reply):
+# {"op": "create"}                                     -> {"op": "created", "table": table_id}
+# {"op": "join", "table": table_id, "name": name}      -> {"op": "joined", "table": table_id, "name": unique_name}
+# {"op": "add_bot", "table": table_id, "name": name}   -> {"op": "joined", ..., "bot": true}
+# {"op": "start"}                                      -> {"op": "turn", "events": [...], "turn": name, ...}
+# {"op": "buy"}                                        -> {"op": "turn", "bought": bool, ...}
+# {"op": "roll"}                                       -> {"op": "turn", "roll": n, ...}
+# {"op": "state"}                                      -> {"op": "state", "players": {...}, "owners": [...], ...}
+# Every reply to start, buy and roll carries the events (see GameEvents.py) of everything that happened, including
+# the bot turns that followed, and the same "turn" message is sent to the other players at the table.
+# The reply also carries the same changes as one state diff per turn ("diffs", see GameEvents.build_turn_diffs),
+# which is all a client needs to keep its copy of the game up to date after the start.
+# The server rolls every die on the table's own random number generator, a roll request can't choose the roll.
+# Errors are replied as {"op": "error", "message": text}.
+
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from RealEstateGame import RealEstateGame
+from AiLogic import should_ai_buy_space
+from GameEvents import GameEventStream, build_turn_diffs
+from SimulationRunner import DEFAULT_RENTS
+
+
+class GameTable:
+    """ One game: the players, the turn order, the bots and the rules (RealEstateGame).
+    Tables never share state, each has its own game, random number generator and event stream. """
+
+    def __init__(self, table_id, seed=None, go_amt=200, rent_amounts=None, max_turns=5000):
+        self._table_id = table_id
+        self._rng = random.Random(seed)
+        self._game = RealEstateGame()
+        self._game.create_board(go_amt, rent_amounts if rent_amounts is not None else DEFAULT_RENTS)
+        self._game.set_end_conditions(turn_cap=max_turns)  # Stops games between bots that would go on forever.
+        self._events = GameEventStream()
+        self._game.add_listener(self._events)
+        self._order = []  # Player names in turn order.
+        self._bots = set()
+        self._cur_index = 0
+        self._started = False
+        self._winner = ""
+        self._turns = 0
+
+    def add_player(self, name, money=1000, bot=False):
+        """ Adds a player (or a bot) to the table and returns the name they were given. """
+        if self._started:
+            raise ValueError("The game has already started.")
+        name = self._game.repeated_name_check(name)
+        self._game.create_player(name, money)
+        self._order.append(name)
+        if bot:
+            self._bots.add(name)
+        return name
+
+    def start(self):
+        """ Starts the game, then lets the bots play until it is a human's turn. """
+        if self._started:
+            raise ValueError("The game has already started.")
+        if len(self._order) < 2:
+            raise ValueError("A game needs at least 2 players.")
+        self._started = True
+        self._game.notify("on_game_start", self._game)
+        self.play_bots()
+
+    def buy(self, name):
+        """ The current player tries to buy the space they are on.  Returns True if they bought it. """
+        self.check_turn(name)
+        return self._game.buy_space(name)
+
+    def roll(self, name):
+        """ The current player rolls the dice and moves, then the bots play.  Returns the roll.
+        The dice are always rolled with the table's own random number generator, players can't choose a roll. """
+        self.check_turn(name)
+        roll = self._rng.randint(1, 6)
+        self.move(name, roll)
+        self.play_bots()
+        return roll
+
+    def move(self, name, roll):
+        """ Moves the current player, checks for a winner and passes the turn on to the next active player. """
+        self._game.move_player(name, roll)
+        self._turns += 1
+        self._winner = self._game.check_game_over()
+        if self._winner != "":
+            self._game.notify("on_game_end", self._game, self._winner)
+            return
+        self._cur_index = (self._cur_index + 1) % len(self._order)
+        while self._game.get_player_account_balance(self._order[self._cur_index]) <= 0:
+            self._cur_index = (self._cur_index + 1) % len(self._order)
+
+    def play_bots(self):
+        """ Plays bot turns until it is a human's turn or the game is over. """
+        while self._winner == "" and self.get_cur_player() in self._bots:
+            name = self.get_cur_player()
+            pos = self._game.get_player_current_position(name)
+            if pos > 0:
+                bal = self._game.get_player_account_balance(name)
+                price = self._game.get_game_space_object(pos).get_purchase_amt()
+                if should_ai_buy_space(bal, pos, price, self._rng):
+                    self._game.buy_space(name)
+            self.move(name, self._rng.randint(1, 6))
+
+    def check_turn(self, name):
+        """ Raises a ValueError unless it is the given player's turn in a running game. """
+        if not self._started:
+            raise ValueError("The game hasn't started yet.")
+        if self._winner != "":
+            raise ValueError("The game is over.")
+        if self.get_cur_player() != name:
+            raise ValueError(f"It is {self.get_cur_player()}'s turn.")
+
+    def pop_events(self):
+        """ Returns (as JSON friendly lists) every event since the last call. """
+        return [list(event) for event in self._events.pop_all()]
+
+    def get_state(self):
+        """ Returns a full snapshot of the table. """
+        players = self._game.get_all_players()
+        return {"table": self._table_id,
+                "players": {name: [players[name].get_balance(), players[name].get_position()] for name in self._order},
+                "owners": [None if space.get_owner() is None else space.get_owner().get_name()
+                           for space in self._game.get_all_spaces()],
+                "order": self._order, "bots": sorted(self._bots), "turn": self.get_cur_player(),
+                "started": self._started, "winner": self._winner}
+
+    def get_cur_player(self):
+        return self._order[self._cur_index] if self._order else None
+
+    def get_go_amt(self):
+        return self._game.get_game_space_object(0).get_payout()
+
+    def get_winner(self):
+        return self._winner
+
+    def get_turns(self):
+        return self._turns
+
+    def get_table_id(self):
+        return self._table_id
+
+
+class GameServer:
+    """ Accepts connections and passes each request to the table it is for.
+    Everything runs on one asyncio event loop and a request is handled without awaiting in between, so a table is
+    never changed by two requests at once. """
+
+    def __init__(self, seed=None):
+        self._tables = {}
+        self._table_ids = itertools.count(1)
+        self._members = {}  # table_id: {writer: player name}
+        self._seed = seed  # Table seeds are seed + table_id, so a whole server run can be replayed.
+        self._server = None
+        self._turns_served = 0
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """ Starts listening and returns the port (use port 0 to let the system pick one). """
+        self._server = await asyncio.start_server(self.handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+    async def handle_client(self, reader, writer):
+        """ Reads requests from one client until they disconnect. """
+        seat = {"table": None, "name": None}  # The table and player this connection plays as.
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    reply = self.handle_request(request, seat, writer)
+                except (ValueError, KeyError, TypeError) as error:
+                    reply = {"op": "error", "message": str(error)}
+                if not isinstance(request, dict):
+                    request = {}
+                if "id" in request:
+                    reply["id"] = request["id"]
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if seat["table"] is not None:
+                self._members.get(seat["table"], {}).pop(writer, None)
+            writer.close()
+
+    def handle_request(self, request, seat, writer):
+        """ Carries out a single request and returns the reply. """
+        op = request["op"]
+        if op == "create":
+            table_id = next(self._table_ids)
+            seed = None if self._seed is None else self._seed + table_id
+            self._tables[table_id] = GameTable(table_id, seed, max_turns=request.get("max_turns", 5000))
+            self._members[table_id] = {}
+            return {"op": "created", "table": table_id}
+        if op in ("join", "add_bot"):
+            table_id = request["table"]
+            table = self.get_table(table_id)
+            name = table.add_player(request.get("name") or "Player", request.get("money", 1000), op == "add_bot")
+            if op == "join":
+                seat["table"] = table_id
+                seat["name"] = name
+                self._members[table_id][writer] = name
+            return {"op": "joined", "table": table_id, "name": name, "bot": op == "add_bot"}
+        table = self.get_table(request.get("table", seat["table"]))
+        if op == "state":
+            reply = table.get_state()
+            reply["op"] = "state"
+            return reply
+        if op == "start":
+            table.start()
+            return self.turn_reply(table, writer, {})
+        if op == "buy":
+            return self.turn_reply(table, writer, {"bought": table.buy(seat["name"])})
+        if op == "roll":
+            return self.turn_reply(table, writer, {"roll": table.roll(seat["name"])})  # Any "value" is ignored.
+        raise ValueError(f"Unknown op {op}.")
+
+    def turn_reply(self, table, writer, reply):
+        """ Builds the "turn" message with the events of the last action, and sends it to the rest of the table. """
+        reply["op"] = "turn"
+        reply["table"] = table.get_table_id()
+        reply["events"] = table.pop_events()
+        reply["diffs"] = build_turn_diffs(reply["events"], table.get_go_amt())
+        reply["turn"] = table.get_cur_player()
+        reply["winner"] = table.get_winner()
+        self._turns_served += sum(1 for event in reply["events"] if event[0] == "move")
+        message = (json.dumps(reply) + "\n").encode()
+        for member in self._members[table.get_table_id()]:
+            if member is not writer:
+                member.write(message)
+        return reply
+
+    def get_table(self, table_id):
+        if table_id not in self._tables:
+            raise ValueError(f"There is no table {table_id}.")
+        return self._tables[table_id]
+
+    def get_table_count(self):
+        return len(self._tables)
+
+    def get_turns_served(self):
+        return self._turns_served
+
+
+class LoadClient:
+    """ Plays games against the server as fast as it can: it creates a table, joins it with some bots, and rolls
+    (buying now and then) until the game ends, then starts a new table.  The round trip of every roll is recorded. """
+
+    def __init__(self, host, port, bots=3, seed=None):
+        self._host = host
+        self._port = port
+        self._bots = bots
+        self._rng = random.Random(seed)
+        self._reader = None
+        self._writer = None
+        self._request_ids = itertools.count(1)
+        self._latencies = []
+        self._turns = 0
+        self._tables = 0
+
+    async def request(self, **request):
+        """ Sends a request and returns the reply to it (other messages are skipped). """
+        request["id"] = next(self._request_ids)
+        self._writer.write((json.dumps(request) + "\n").encode())
+        await self._writer.drain()
+        while True:
+            reply = json.loads(await self._reader.readline())
+            if reply.get("id") == request["id"]:
+                if reply["op"] == "error":
+                    raise ValueError(reply["message"])
+                return reply
+
+    async def run(self, duration):
+        """ Plays games for the given number of seconds. """
+        self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            table = (await self.request(op="create"))["table"]
+            me = (await self.request(op="join", table=table, name="Load"))["name"]
+            for count in range(0, self._bots):
+                await self.request(op="add_bot", table=table, name="Bot")
+            reply = await self.request(op="start")
+            self._tables += 1
+            self._turns += sum(1 for event in reply["events"] if event[0] == "move")
+            while not reply["winner"] and time.perf_counter() < end:
+                if reply["turn"] == me and self._rng.random() < 0.3:
+                    await self.request(op="buy")
+                start = time.perf_counter()
+                reply = await self.request(op="roll")
+                self._latencies.append(time.perf_counter() - start)
+                self._turns += sum(1 for event in reply["events"] if event[0] == "move")
+        self._writer.close()
+
+    def get_latencies(self):
+        return self._latencies
+
+    def get_turns(self):
+        return self._turns
+
+    def get_tables(self):
+        return self._tables
+
+
+def percentile(values, percent):
+    """ Returns the given percentile (0 to 100) of a list of numbers. """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+async def run_load_test(clients=50, duration=5.0, bots=3):
+    """ Starts a server on a free local port, runs the load clients against it and prints the results. """
+    server = GameServer(seed=0)
+    port = await server.start(port=0)
+    load_clients = [LoadClient("127.0.0.1", port, bots, seed) for seed in range(0, clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*[client.run(duration) for client in load_clients])
+    seconds = time.perf_counter() - start
+    server.close()
+    latencies = [latency for client in load_clients for latency in client.get_latencies()]
+    print(f"{clients} clients for {seconds:.1f} s: {server.get_table_count()} tables, "
+          f"{server.get_turns_served() / seconds:.0f} turns/sec ({len(latencies) / seconds:.0f} rolls/sec)")
+    print(f"roll latency: p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    # python GameServer.py [port]   or   python GameServer.py --load-test [clients] [seconds]
+    if len(sys.argv) > 1 and sys.argv[1] == "--load-test":
+        asyncio.run(run_load_test(int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+                                  float(sys.argv[3]) if len(sys.argv) > 3 else 5.0))
+    else:
+        async def main(port):
+            server = GameServer()
+            print(f"Real Estate Game server listening on port {await server.start(port=port)}")
+            await server.serve_forever()
+        asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 8765))
@@ -0,0 +1,79 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: NetworkClient.py is a small client for GameServer.py.  It sends line delimited JSON requests over a
+# plain socket and reads the replies in a background thread, so a tkinter GUI can poll for them with after()
+# instead of blocking its event loop.  It does not import tkinter.
+
+# Code Outline:
+# 1 class 'NetworkClient'
+# NetworkClient:  A connection to a GameServer, with a reader thread that queues every message from the server.
+
+import itertools
+import json
+import queue
+import socket
+import threading
+
+
+class NetworkClient:
+    """ A connection to a GameServer.  A reader thread puts every message the server sends into a queue, and
+    poll() hands out whatever has arrived without waiting.  When the connection closes, a {"op": "closed"} message
+    is queued. """
+
+    def __init__(self, host="127.0.0.1", port=8765, timeout=5.0):
+        self._socket = socket.create_connection((host, port), timeout)
+        self._socket.settimeout(None)
+        self._reader = self._socket.makefile("rb")
+        self._incoming = queue.Queue()
+        self._held = []  # Messages that arrived while request was waiting for its reply.
+        self._request_ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.read_loop, daemon=True)
+        self._thread.start()
+
+    def read_loop(self):
+        """ Runs in the reader thread, queueing every message until the connection closes. """
+        try:
+            for line in self._reader:
+                self._incoming.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        self._incoming.put({"op": "closed"})
+
+    def send(self, **request):
+        """ Sends a request without waiting for the reply, and returns the request id the reply will carry. """
+        request["id"] = next(self._request_ids)
+        with self._send_lock:
+            self._socket.sendall((json.dumps(request) + "\n").encode())
+        return request["id"]
+
+    def request(self, timeout=5.0, **request):
+        """ Sends a request and waits for the reply to it, for setting up a game before the GUI starts polling.
+        Other messages that arrive in the meantime are kept for poll.  Error replies raise a ValueError. """
+        request_id = self.send(**request)
+        while True:
+            try:
+                message = self._incoming.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No reply to {request['op']} from the server.")
+            if message.get("id") == request_id:
+                if message["op"] == "error":
+                    raise ValueError(message["message"])
+                return message
+            self._held.append(message)
+            if message["op"] == "closed":
+                raise ConnectionError("The server closed the connection.")
+
+    def poll(self):
+        """ Returns every message that has arrived since the last call, oldest first, without waiting. """
+        messages = self._held
+        self._held = []
+        try:
+            while True:
+                messages.append(self._incoming.get_nowait())
+        except queue.Empty:
+            return messages
+
+    def close(self):
+        self._socket.close()
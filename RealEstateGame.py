@@ -6,11 +6,12 @@
 # game called Real Estate Game (THIS VERSION IS BORING BECAUSE IT DOES NOT ALLOW FOR GUI - SEE FUN VERSION)
 
 # Code Outline:
-# 4 classes 'RealEstateGame', 'GameSpace', 'GoSpace', 'Player'
+# 5 classes 'RealEstateGame', 'GameSpace', 'GoSpace', 'Player', 'GameListener'
 # RealEstateGame:  Contains methods and variables to simulate playing a monopoly-esque game.
 # GameSpace:  Contains methods and variables that pertain to each space on the board.
 # GoSpace:  A child class of GameSpace that represents the first space on the board.
 # Player:  Contains methods and variables that pertain to a player game object.
+# GameListener:  A base class for objects that want to be told about game events (moves, purchases, rent, bankruptcy).
 
 
 class RealEstateGame:
@@ -19,6 +20,40 @@ class RealEstateGame:
     def __init__(self):
         self._spaces = []
         self._players = {}
+        self._name_suffixes = {}  # name: the lowest copy count that may still be free (see modify_repeat_names).
+        self._owned_rent = 0  # Rent of every owned space, so rent exposure doesn't need a scan of the board.
+        self._space_positions = {}  # GameSpace: its position, so a bankrupt player's spaces are found without a scan.
+        self._turn_index = {}  # name: the player's place in the turn order.
+        self._active = {}  # name: None for every player with money left, in turn order.
+        self._next_player = {}  # name: the next active player in turn order, a linked ring over the active players.
+        self._prev_player = {}
+        self._wrapped = []  # Players out of the ring whose link wraps around to the front of the turn order.
+        self._listeners = []  # GameListener objects that are told about game events.
+        self._turn_cap = None  # End conditions, see set_end_conditions.
+        self._stall_rounds = None
+        self._turns = 0
+        self._quiet_turns = 0  # Turns since the last purchase or rent payment.
+        self._end_reason = ""
+
+    def add_listener(self, listener):
+        """ Adds a GameListener that will be told about every move, purchase, rent payment and bankruptcy. """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def notify(self, event, *args):
+        """ Calls the given GameListener method on every listener. """
+        for listener in self._listeners:
+            getattr(listener, event)(*args)
+
+    def set_end_conditions(self, turn_cap=None, stall_rounds=None):
+        """ Sets when check_game_over ends a game that nobody has won by bankrupting the others.
+        turn_cap ends it after that many turns, stall_rounds ends it once that many rounds (a turn for every active
+        player) pass without a purchase or a rent payment.  Either way the player with the highest net worth wins.
+        (GO payouts don't count, every lap pays them so balances never stop changing.)  None turns a condition off. """
+        self._turn_cap = turn_cap
+        self._stall_rounds = stall_rounds
 
     def create_spaces(self, go_amt, rent_amounts):
         """ Creates all spaces for the game board. """
@@ -28,6 +63,7 @@ class RealEstateGame:
     def create_go_space(self, go_amt):
         """ Creates the GO space for the game board. """
         go_space = GoSpace(go_amt, "GO", None)
+        self._space_positions[go_space] = len(self._spaces)
         self._spaces.append(go_space)
 
     def create_real_estate_spaces(self, rent_amounts):
@@ -35,13 +71,83 @@ class RealEstateGame:
         theme = fantasy_theme()  # sets the naming convention for the spaces.
         for index in range(0, 24):
             new_space = GameSpace(theme[index], rent_amounts[index])
+            self._space_positions[new_space] = len(self._spaces)
             self._spaces.append(new_space)
 
+    def create_board(self, go_amt, rent_amounts, names=None):
+        """ Replaces the game board with a GO space followed by one real estate space per rent amount, built in
+        one pass.  The board can be any size, if no names are given they are taken from board_theme. """
+        if names is None:
+            names = board_theme(len(rent_amounts))
+        spaces = [GoSpace(go_amt, "GO", None)]
+        spaces.extend([GameSpace(names[index], int(rent_amounts[index])) for index in range(0, len(rent_amounts))])
+        self._spaces = spaces
+        self._space_positions = {space: pos for pos, space in enumerate(spaces)}
+
     def create_player(self, name, money):
         """ Creates a new player object and adds it to the players list. """
         name = self.repeated_name_check(name)
         new_player = Player(name, money, 0)
         self._players[name] = new_player
+        self.add_to_turn_order(name)
+
+    def create_players(self, names, money):
+        """ Creates a player for every name in one pass.  money is either one starting balance for everyone or a list
+        with one starting balance per name.  Returns the names the players were actually created with. """
+        if not hasattr(money, "__len__"):
+            money = [money] * len(names)
+        created = []
+        for index in range(0, len(names)):
+            name = self.repeated_name_check(names[index])
+            self._players[name] = Player(name, int(money[index]), 0)
+            self.add_to_turn_order(name)
+            created.append(name)
+        return created
+
+    def add_to_turn_order(self, name):
+        """ Puts a new player at the end of the turn order and links them into the ring of active players.
+        A player without money is taken straight back out, so like a bankrupt player they only keep their own link.
+        Players out of the ring whose link wrapped around to the front are now followed by the new player. """
+        self._turn_index[name] = len(self._turn_index)
+        if self._active:
+            first = next(iter(self._active))
+            last = self._prev_player[first]
+            self._next_player[last] = name
+            self._prev_player[first] = name
+            self._next_player[name] = first
+            self._prev_player[name] = last
+        else:
+            self._next_player[name] = name
+            self._prev_player[name] = name
+        self._active[name] = None
+        for other in self._wrapped:
+            self._next_player[other] = name
+        self._wrapped = []
+        if self._players[name].get_balance() <= 0:
+            self.remove_from_turn_order(name)
+
+    def remove_from_turn_order(self, name):
+        """ Takes a player out of the ring of active players.  Their own link is kept, so get_next_active_player
+        still works for them (it follows the links to whoever was next when they left). """
+        if name not in self._active:
+            return
+        del self._active[name]
+        prev_name = self._prev_player[name]
+        next_name = self._next_player[name]
+        self._next_player[prev_name] = next_name
+        self._prev_player[next_name] = prev_name
+        if self._turn_index[next_name] <= self._turn_index[name]:
+            self._wrapped.append(name)  # Nobody with money comes after them, add_to_turn_order relinks them.
+
+    def refresh_active_players(self):
+        """ Rebuilds the ring of active players from the balances.  Call it after changing balances outside the
+        game's rules (for example when restoring an archived turn). """
+        names = list(self._turn_index)
+        self._turn_index = {}
+        self._active = {}
+        self._wrapped = []
+        for name in names:
+            self.add_to_turn_order(name)
 
     def repeated_name_check(self, name):
         """ If the given name exists in the players list, modifies the name.  Otherwise, returns the given name. """
@@ -51,35 +157,68 @@ class RealEstateGame:
             return name
 
     def modify_repeat_names(self, name, count):
-        """ Recursively counts how many copies of the name there are in the players list
-        and returns a modified version of the name concatenated with the number of copies. """
+        """ Counts up from count until it finds a copy of the name that isn't in the players list
+        and returns a modified version of the name concatenated with that number.
+        Players are never removed, so the lowest free count for a name can only go up.  It is remembered per name,
+        which means adding thousands of players with the same name doesn't probe every copy again each time. """
+        start = self._name_suffixes.get(name, 1)
+        remember = count <= start  # Only a search that starts at the lowest free count can be remembered.
+        if remember:
+            count = start
         mod_name = f"{name} ({count})"
-        if mod_name in self._players.keys():
-            return self.modify_repeat_names(name, count + 1)
-        else:
-            return mod_name
+        while mod_name in self._players:
+            count += 1
+            mod_name = f"{name} ({count})"
+        if remember:
+            self._name_suffixes[name] = count
+        return mod_name
+
+    def reset(self):
+        """ Puts the game back the way it was before the first turn, reusing the board and player objects.
+        Every space is unowned again and every player is back on GO with their starting balance. """
+        for space in self._spaces:
+            space.set_owner(None)
+        for player in self._players.values():
+            player.reset()
+        self._owned_rent = 0
+        self.refresh_active_players()
+        self._turns = 0
+        self._quiet_turns = 0
+        self._end_reason = ""
 
     def buy_space(self, name):
         """ If the player can buy the space, they buy the space and returns True, otherwise returns False."""
         pos = self.get_player_current_position(name)
         space = self.get_game_space_object(pos)
         player = self.get_player_object(name)
-        return space.try_to_buy(player)
+        bought = space.try_to_buy(player)
+        if bought:
+            self._quiet_turns = 0
+            self._owned_rent += space.get_rent()
+            if self._listeners:
+                self.notify("on_buy", name, pos, space.get_purchase_amt())
+        return bought
 
     def move_player(self, name, num_spaces):
         """ Moves the player, if they are not bankrupt. """
         if self.get_player_account_balance(name) == 0:
             return
 
+        self._turns += 1
+        self._quiet_turns += 1
+        old_pos = self.get_player_current_position(name)
         new_pos = self.determine_new_pos(name, num_spaces)
         self.set_player_current_position(name, new_pos)
+        if self._listeners:
+            self.notify("on_move", name, old_pos, new_pos, new_pos != old_pos + num_spaces)
         self.does_player_owe_rent(name, new_pos)
 
     def determine_new_pos(self, name, num_spaces):
         """ Determines the new position the player will move to. """
         new_pos = num_spaces + self.get_player_current_position(name)
-        if new_pos > 24:
-            new_pos = new_pos - 25
+        board_size = len(self._spaces)
+        if new_pos >= board_size:
+            new_pos = new_pos % board_size
             self.pass_go(name)
         return new_pos
 
@@ -105,11 +244,16 @@ class RealEstateGame:
         """ Transfers rent money from the player to the players current space owner. """
         player = self.get_player_object(name)
         player_bal = self.get_player_account_balance(name)
+        self._quiet_turns = 0
 
         if player_bal > rent:
             self.transfer_money(player, owner, rent)
+            if self._listeners:
+                self.notify("on_rent", name, owner.get_name(), player.get_position(), rent)
         else:
             self.transfer_money(player, owner, player_bal)
+            if self._listeners:
+                self.notify("on_rent", name, owner.get_name(), player.get_position(), player_bal)
             self.player_is_bankrupt(name)
 
     @staticmethod
@@ -121,28 +265,96 @@ class RealEstateGame:
     def player_is_bankrupt(self, name):
         """ For all spaces the bankrupt player owns, sets those spaces to be owned by None.
         If GUI is active, handles the bankrupt player in the GUI. (Managed here to prevent repeat iterations)."""
-        for space in self._spaces:
-            owner = space.get_owner()
-            if owner and owner.get_name() == name:
-                space.set_owner(None)
+        player = self.get_player_object(name)
+        self._owned_rent -= player.get_rent_income()
+        released = sorted(self._space_positions[space] for space in player.get_properties())
+        for pos in released:
+            self._spaces[pos].set_owner(None)
+        self.remove_from_turn_order(name)
+        if self._listeners:
+            self.notify("on_bankrupt", name, released)
 
     def check_game_over(self):
         """ Checks to see if there is more than 1 active player.
-        If only one remains returns the winners name, otherwise returns an empty string. """
-        active_players = self.get_active_players()
-        if len(active_players) > 1:
-            return ""
-        else:
-            return active_players[0]
+        If only one remains returns the winners name (an empty string if nobody has money left), otherwise returns
+        an empty string.
+        If an end condition (see set_end_conditions) is reached first, returns the player with the highest net worth.
+        get_end_reason tells which of these ended the game. """
+        active_count = len(self._active)
+        if active_count <= 1:
+            self._end_reason = "bankruptcy"
+            return next(iter(self._active), "")
+        if self._turn_cap is not None and self._turns >= self._turn_cap:
+            self._end_reason = "turn_cap"
+            return self.get_net_worth_leader()
+        if self._stall_rounds is not None and self._quiet_turns >= self._stall_rounds * active_count:
+            self._end_reason = "stall"
+            return self.get_net_worth_leader()
+        return ""
+
+    def get_net_worth(self, name):
+        """ Returns the player's balance plus the purchase price of every space they own. """
+        return self.get_player_object(name).get_net_worth()
+
+    def get_rent_exposure(self, name):
+        """ Returns the rent of every space owned by someone else, the most the player could owe over a lap. """
+        return self._owned_rent - self.get_player_object(name).get_rent_income()
+
+    def set_space_owner(self, pos, owner):
+        """ Sets the owner (a Player or None) of the space at pos, keeping the owned rent total up to date.
+        Use it instead of GameSpace.set_owner when changing ownership outside the game's own rules. """
+        if pos == 0:
+            return
+        space = self._spaces[pos]
+        if space.get_owner() is not None:
+            self._owned_rent -= space.get_rent()
+        space.set_owner(owner)
+        if owner is not None:
+            self._owned_rent += space.get_rent()
+
+    def get_net_worth_leader(self):
+        """ Returns the active player with the highest net worth (the first in turn order if there is a tie). """
+        return max(self.get_active_players(), key=self.get_net_worth)
+
+    def get_end_reason(self):
+        """ Returns what ended the game ("bankruptcy", "turn_cap" or "stall"), or "" if it hasn't ended. """
+        return self._end_reason
+
+    def get_end_conditions(self):
+        """ Returns (turn_cap, stall_rounds). """
+        return self._turn_cap, self._stall_rounds
+
+    def get_turns(self):
+        return self._turns
+
+    def get_quiet_turns(self):
+        return self._quiet_turns
 
     def get_active_players(self):
-        """ Returns a list of the names of all players whose account balance is greater than zero. """
-        active_players = []
-        for player in self._players:
-            player_obj = self._players[player]
-            if player_obj.get_balance() > 0:
-                active_players.append(player_obj.get_name())
-        return active_players
+        """ Returns a list of the names of all players whose account balance is greater than zero, in turn order.
+        They are kept up to date as players go bankrupt, so this doesn't look at the players who aren't. """
+        return list(self._active)
+
+    def get_active_count(self):
+        return len(self._active)
+
+    def get_first_active_player(self):
+        """ Returns the first player in turn order with money left, or None if nobody has any. """
+        return next(iter(self._active), None)
+
+    def get_next_active_player(self, name):
+        """ Returns the next player after name in turn order who has money left (name themselves if they are the
+        only one), or None if nobody has any.  Bankrupt players are skipped without being looked at. """
+        if not self._active:
+            return None
+        next_name = self._next_player[name]
+        while next_name not in self._active:
+            next_name = self._next_player[next_name]
+        return next_name
+
+    def get_turn_index(self, name):
+        """ Returns the player's place in the turn order (0 for the first player). """
+        return self._turn_index[name]
 
     def get_player_account_balance(self, name):
         """ Returns player account balance. """
@@ -186,7 +398,7 @@ class GameSpace:
         purchase_amount = self.get_purchase_amt()
         player_balance = player.get_balance()
         if player_balance > purchase_amount and self._owner is None:
-            self._owner = player
+            self.set_owner(player)
             player.set_balance(-purchase_amount)
             return True
         else:
@@ -205,7 +417,12 @@ class GameSpace:
         return self._owner
 
     def set_owner(self, new_owner):
+        """ Sets the owner, moving the space's price and rent from the old owner's totals to the new owner's. """
+        if self._owner is not None:
+            self._owner.remove_property(self)
         self._owner = new_owner
+        if new_owner is not None:
+            new_owner.add_property(self)
 
 
 class GoSpace(GameSpace):
@@ -236,11 +453,50 @@ class Player:
         self._name = name
         self._money = money
         self._pos = position
+        self._start_money = money
+        self._start_pos = position
+        self._properties = {}  # GameSpace: None for every space the player owns, kept up to date by set_owner.
+        self._property_value = 0  # Purchase price of every space the player owns.
+        self._rent_income = 0  # Rent of every space the player owns.
 
     def set_balance(self, amount):
         """ A positive amount increases balance and a negative one decreases it. """
         self._money += amount
 
+    def reset(self):
+        """ Puts the player back on their starting position with their starting balance. """
+        self._money = self._start_money
+        self._pos = self._start_pos
+        self._properties = {}
+        self._property_value = 0
+        self._rent_income = 0
+
+    def add_property(self, space):
+        """ Adds a space to the player's spaces and totals (called by GameSpace.set_owner). """
+        self._properties[space] = None
+        self._property_value += space.get_purchase_amt()
+        self._rent_income += space.get_rent()
+
+    def remove_property(self, space):
+        """ Takes a space off the player's spaces and totals (called by GameSpace.set_owner). """
+        del self._properties[space]
+        self._property_value -= space.get_purchase_amt()
+        self._rent_income -= space.get_rent()
+
+    def get_properties(self):
+        """ Returns the spaces the player owns (the keys of a dictionary, in the order they were bought). """
+        return self._properties.keys()
+
+    def get_net_worth(self):
+        """ Returns the player's balance plus the purchase price of every space they own. """
+        return self._money + self._property_value
+
+    def get_property_value(self):
+        return self._property_value
+
+    def get_rent_income(self):
+        return self._rent_income
+
     def get_name(self):
         return self._name
 
@@ -254,6 +510,29 @@ class Player:
         self._pos = new_position
 
 
+class GameListener:
+    """ A base class for objects that want to be told about game events.  Every method does nothing by default,
+    so a listener only needs to override the events it cares about.  Add one with RealEstateGame.add_listener. """
+
+    def on_game_start(self, game):
+        """ Called by a game runner before the first turn of a game. """
+
+    def on_game_end(self, game, winner):
+        """ Called by a game runner after the last turn of a game.  winner is "" if there was no winner. """
+
+    def on_move(self, name, old_pos, new_pos, passed_go):
+        """ Called after a player moves, before any rent is paid. """
+
+    def on_buy(self, name, pos, price):
+        """ Called after a player buys the space at pos. """
+
+    def on_rent(self, name, owner_name, pos, amount):
+        """ Called after a player pays rent to the owner of the space at pos. """
+
+    def on_bankrupt(self, name, released_positions):
+        """ Called after a player goes bankrupt and the spaces they owned are released. """
+
+
 def fantasy_theme():
     """ Returns a list with fantasy themed names. """
     theme = ["Druids Camp", "Dragons Lair", "Elves Keep", "Fairy Meadow",
@@ -267,3 +546,15 @@ def fantasy_theme():
              ]
     return theme
 
+
+def board_theme(count):
+    """ Returns a list of count space names.  Boards larger than the fantasy theme reuse its names,
+    numbering each extra lap around the theme (e.g. "Dragons Lair 2"). """
+    theme = fantasy_theme()
+    names = []
+    for index in range(0, count):
+        lap = index // len(theme)
+        name = theme[index % len(theme)]
+        names.append(name if lap == 0 else f"{name} {lap + 1}")
+    return names
+
@@ -0,0 +1,327 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: RulesFuzzer.py plays random (but legal) sequences of purchases, moves and resets on RealEstateGame
+# boards of random sizes, in several processes at once, and checks the rules' invariants after every step: money
+# only changes by GO payouts and purchases, bankrupt players own nothing, GO is never owned, positions stay on the
+# board, and the totals kept up to date as the game goes (net worth, rent exposure, active players) match a scan.
+# Every action is also played on FastRules and on the GUI's RealEstateGame (DungeonsAndRealEstates.py), which must
+# give the same results and end up in the same state.
+# A failing seed is shrunk to the fewest actions that still fail, and printed as a replay.
+
+# Code Outline:
+# 2 classes 'FuzzCase', 'RulesFuzzer'
+# FuzzCase:  A board, players and actions made from a seed, replayed on a new RealEstateGame with every step checked.
+# RulesFuzzer:  Fuzzes ranges of seeds in worker processes, reports executions per second and shrinks failures.
+# 4 non-class functions:
+# check_invariants: Returns a description of the first invariant the game breaks, or None.
+# compare_mirrors: Returns a description of the first difference between the game and its FastRules and GUI copies.
+# shrink_actions: Removes actions from a failing case for as long as it keeps failing.
+# fuzz_seeds: Runs the cases of a range of seeds (the job of one worker process).
+
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from RealEstateGame import RealEstateGame
+from FastRules import FastRules, NO_OWNER
+from DungeonsAndRealEstates import RealEstateGame as GuiRealEstateGame
+
+MAX_ROLL = 12
+
+
+class FuzzCase:
+    """ A board, players and actions made from a seed.  setup is (go_amt, rents, names, balances) and every action
+    is ["buy", player], ["move", player, roll] or ["reset"], players by their index in the turn order.
+    Both are plain lists, so a case can be saved as JSON and replayed later. """
+
+    def __init__(self, setup, actions, seed=None):
+        self._setup = setup
+        self._actions = actions
+        self._seed = seed
+
+    @staticmethod
+    def from_seed(seed, max_actions=400):
+        """ Makes a random case: 1 to 40 spaces, 1 to 8 players (some with the same name, some without money) and
+        up to max_actions actions, with rolls of up to MAX_ROLL and now and then a reset. """
+        rng = random.Random(seed)
+        rents = [rng.randint(0, 400) for space in range(0, rng.randint(1, 40))]
+        player_count = rng.randint(1, 8)
+        names = [rng.choice(["Ann", "Bo", "Cy", "Di", "Ed"]) for player in range(0, player_count)]
+        balances = [max(0, rng.randint(-300, 3000)) for player in range(0, player_count)]
+        actions = []
+        for step in range(0, rng.randint(1, max_actions)):
+            kind = rng.random()
+            player = rng.randrange(0, player_count)
+            if kind < 0.3:
+                actions.append(["buy", player])
+            elif kind < 0.995:
+                actions.append(["move", player, rng.randint(1, MAX_ROLL)])
+            else:
+                actions.append(["reset"])
+        return FuzzCase([rng.randint(0, 300), rents, names, balances], actions, seed)
+
+    def build_game(self):
+        """ Returns a new RealEstateGame with the case's board and players, and the names they were given. """
+        go_amt, rents, names, balances = self._setup
+        game = RealEstateGame()
+        game.create_board(go_amt, rents)
+        return game, game.create_players(names, balances)
+
+    def build_mirrors(self, game):
+        """ Returns copies of the new game as FastRules and as the GUI's RealEstateGame, to be played alongside it. """
+        go_amt, rents, names, balances = self._setup
+        gui_game = GuiRealEstateGame()
+        gui_game.create_board(go_amt, rents)
+        gui_game.create_players(names, balances)
+        return FastRules(game, MAX_ROLL), gui_game
+
+    def run(self):
+        """ Replays the case, checking the invariants and the copies (see compare_mirrors) before the first action
+        and after every one.  Returns (steps run, None) if they all held, otherwise (index of the failing action,
+        what broke). """
+        game, names = self.build_game()
+        fast, gui_game = self.build_mirrors(game)
+        start_money = sum(self._setup[3])
+        expected_money = start_money
+        error = check_invariants(game, expected_money) or compare_mirrors(game, names, fast, gui_game)
+        if error is not None:
+            return -1, error
+        for index, action in enumerate(self._actions):
+            try:
+                expected_money, outcome = self.apply(game, names, action, expected_money, start_money)
+                mirror_outcomes = self.apply_to_mirrors(fast, gui_game, names, action)
+                error = check_invariants(game, expected_money) or compare_mirrors(game, names, fast, gui_game)
+                if error is None and mirror_outcomes != (outcome, outcome):
+                    error = f"the game returned {outcome!r}, FastRules and the GUI game {mirror_outcomes!r}"
+            except Exception as exception:
+                error = f"{type(exception).__name__}: {exception}"
+            if error is not None:
+                return index, f"after {action}: {error}"
+        return len(self._actions), None
+
+    @staticmethod
+    def apply(game, names, action, expected_money, start_money):
+        """ Plays one action and returns how much money there should be in the game after it, and what the game
+        returned (whether a buy went through, the winner after a move).  The expected money is worked out from the
+        rules (price paid, one GO payout for passing GO), not from the game's events. """
+        if action[0] == "reset":
+            game.reset()
+            return start_money, None
+        name = names[action[1]]
+        player = game.get_player_object(name)
+        pos = player.get_position()
+        if action[0] == "buy":
+            price = game.get_game_space_object(pos).get_purchase_amt()
+            if game.buy_space(name):
+                return expected_money - price, True
+            return expected_money, False
+        roll = action[2]
+        if player.get_balance() > 0 and pos + roll >= len(game.get_all_spaces()):
+            expected_money += game.get_game_space_object(0).get_payout()
+        game.move_player(name, roll)
+        return expected_money, game.check_game_over()
+
+    @staticmethod
+    def apply_to_mirrors(fast, gui_game, names, action):
+        """ Plays one action on the FastRules and GUI copies, and returns what each of them returned. """
+        if action[0] == "reset":
+            fast.reset()
+            gui_game.reset()
+            return None, None
+        if action[0] == "buy":
+            return fast.buy_space(action[1]), gui_game.buy_space(names[action[1]])
+        fast.move_player(action[1], action[2])
+        gui_game.move_player(names[action[1]], action[2])
+        return fast.check_game_over(), gui_game.check_game_over()
+
+    def get_setup(self):
+        return self._setup
+
+    def get_actions(self):
+        return self._actions
+
+    def get_seed(self):
+        return self._seed
+
+    def to_dict(self):
+        return {"seed": self._seed, "setup": self._setup, "actions": self._actions}
+
+    @staticmethod
+    def from_dict(case):
+        return FuzzCase(case["setup"], case["actions"], case.get("seed"))
+
+
+class RulesFuzzer:
+    """ Runs the cases of many seeds in worker processes (one range of seeds per job) and collects the failures,
+    each shrunk to the fewest actions that still fail. """
+
+    def __init__(self, workers=None, chunk=200, max_actions=400):
+        self._workers = workers  # None uses one process per CPU.
+        self._chunk = chunk
+        self._max_actions = max_actions
+        self._cases = 0
+        self._steps = 0
+        self._seconds = 0.0
+        self._failures = []
+
+    def run(self, seeds):
+        """ Fuzzes one case per seed and returns the list of failures (see shrink), each as a dictionary. """
+        seeds = list(seeds)
+        chunks = [seeds[start:start + self._chunk] for start in range(0, len(seeds), self._chunk)]
+        failed = []
+        start = time.perf_counter()
+        with ProcessPoolExecutor(self._workers) as executor:
+            jobs = [executor.submit(fuzz_seeds, chunk, self._max_actions) for chunk in chunks]
+            for job in jobs:
+                cases, steps, failed_seeds = job.result()
+                self._cases += cases
+                self._steps += steps
+                failed.extend(failed_seeds)
+        self._seconds += time.perf_counter() - start  # Shrinking isn't counted in the executions per second.
+        for seed in failed:
+            self._failures.append(self.shrink(FuzzCase.from_seed(seed, self._max_actions)))
+        return self._failures
+
+    @staticmethod
+    def shrink(case):
+        """ Returns a failing case as a dictionary: its seed, what broke, and the shortest replay found. """
+        shrunk = shrink_actions(case)
+        steps, error = shrunk.run()
+        failure = shrunk.to_dict()
+        failure["error"] = error
+        failure["original_actions"] = len(case.get_actions())
+        return failure
+
+    def get_report(self):
+        """ Returns a line with the cases and steps fuzzed, executions (steps) per second and failures found. """
+        per_second = self._steps / self._seconds if self._seconds else 0.0
+        return (f"{self._cases} cases, {self._steps} steps in {self._seconds:.1f} s ({per_second:.0f} execs/sec), "
+                f"{len(self._failures)} failures")
+
+    def get_failures(self):
+        return self._failures
+
+
+def check_invariants(game, expected_money):
+    """ Returns a description of the first invariant the game breaks, or None if they all hold. """
+    spaces = game.get_all_spaces()
+    players = game.get_all_players()
+    if spaces[0].get_owner() is not None:
+        return "GO is owned"
+    money = sum(player.get_balance() for player in players.values())
+    if money != expected_money:
+        return f"money isn't conserved: {money} in the game, {expected_money} expected"
+    owned = {name: [] for name in players}
+    for pos in range(1, len(spaces)):
+        owner = spaces[pos].get_owner()
+        if owner is not None:
+            owned[owner.get_name()].append(spaces[pos])
+    owned_rent = sum(space.get_rent() for name in owned for space in owned[name])
+    for name, player in players.items():
+        if not 0 <= player.get_position() < len(spaces):
+            return f"{name} is off the board at {player.get_position()}"
+        if player.get_balance() < 0:
+            return f"{name} has a negative balance"
+        if player.get_balance() == 0 and owned[name]:
+            return f"{name} is bankrupt but still owns {len(owned[name])} spaces"
+        if set(player.get_properties()) != set(owned[name]):
+            return f"{name}'s own list of spaces doesn't match the board"
+        worth = player.get_balance() + sum(space.get_purchase_amt() for space in owned[name])
+        if game.get_net_worth(name) != worth:
+            return f"{name}'s net worth is {game.get_net_worth(name)}, the board says {worth}"
+        exposure = owned_rent - sum(space.get_rent() for space in owned[name])
+        if game.get_rent_exposure(name) != exposure:
+            return f"{name}'s rent exposure is {game.get_rent_exposure(name)}, the board says {exposure}"
+    active = [name for name in players if players[name].get_balance() > 0]
+    if game.get_active_players() != active:
+        return f"the active players are {game.get_active_players()}, the balances say {active}"
+    order = list(players)
+    for index, name in enumerate(order):
+        expected_next = next((other for other in order[index + 1:] + order[:index + 1] if other in active), None)
+        if game.get_next_active_player(name) != expected_next:
+            return f"the player after {name} is {game.get_next_active_player(name)}, it should be {expected_next}"
+    return None
+
+
+def compare_mirrors(game, names, fast, gui_game):
+    """ Returns a description of the first balance, position or owner that FastRules or the GUI game has
+    different from the game, or None if both match it. """
+    gui_players = gui_game.get_all_players()
+    for index, name in enumerate(names):
+        player = game.get_player_object(name)
+        state = (player.get_balance(), player.get_position())
+        if (fast.get_balance(index), fast.get_position(index)) != state:
+            return f"FastRules has {name} at {(fast.get_balance(index), fast.get_position(index))}, not {state}"
+        gui_state = (gui_players[name].get_balance(), gui_players[name].get_position())
+        if gui_state != state:
+            return f"the GUI game has {name} at {gui_state}, not {state}"
+    gui_spaces = gui_game.get_all_spaces()
+    for pos, space in enumerate(game.get_all_spaces()):
+        owner = None if space.get_owner() is None else space.get_owner().get_name()
+        fast_owner = None if fast.get_owner(pos) == NO_OWNER else names[fast.get_owner(pos)]
+        if fast_owner != owner:
+            return f"FastRules says space {pos} is owned by {fast_owner}, not {owner}"
+        gui_owner = gui_spaces[pos].get_owner()
+        gui_owner = None if gui_owner is None else gui_owner.get_name()
+        if gui_owner != owner:
+            return f"the GUI game says space {pos} is owned by {gui_owner}, not {owner}"
+    if gui_game.get_active_players() != game.get_active_players():
+        return f"the GUI game's active players are {gui_game.get_active_players()}"
+    return None
+
+
+def shrink_actions(case):
+    """ Returns a case with as few of the failing case's actions as it could find that still fails.
+    It cuts everything after the failing action, then tries removing chunks of actions, halving the chunk size
+    whenever no chunk of the current size can go (the usual delta debugging loop). """
+    steps, error = case.run()
+    if error is None:
+        return case
+    setup = case.get_setup()
+    actions = case.get_actions()[:steps + 1]
+    chunk = max(1, len(actions) // 2)
+    while actions:
+        removed = False
+        start = 0
+        while start < len(actions):
+            candidate = actions[:start] + actions[start + chunk:]
+            if FuzzCase(setup, candidate).run()[1] is not None:
+                actions = candidate
+                removed = True
+            else:
+                start += chunk
+        if not removed:
+            if chunk == 1:
+                break
+            chunk = max(1, chunk // 2)
+    return FuzzCase(setup, actions, case.get_seed())
+
+
+def fuzz_seeds(seeds, max_actions=400):
+    """ Runs the case of every seed and returns (cases run, steps run, seeds that failed).  It is the job of one
+    worker process, so it only sends back the failing seeds, the parent process remakes and shrinks them. """
+    steps = 0
+    failed = []
+    for seed in seeds:
+        ran, error = FuzzCase.from_seed(seed, max_actions).run()
+        steps += max(ran, 0)
+        if error is not None:
+            failed.append(seed)
+    return len(seeds), steps, failed
+
+
+if __name__ == "__main__":
+    # python RulesFuzzer.py [cases] [first seed]    or    python RulesFuzzer.py --replay failure.json
+    if len(sys.argv) > 2 and sys.argv[1] == "--replay":
+        with open(sys.argv[2]) as replay_file:
+            print(FuzzCase.from_dict(json.load(replay_file)).run())
+        sys.exit()
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    first_seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    fuzzer = RulesFuzzer()
+    for failure in fuzzer.run(range(first_seed, first_seed + cases)):
+        print(json.dumps(failure))
+    print(fuzzer.get_report())
+    sys.exit(1 if fuzzer.get_failures() else 0)
@@ -0,0 +1,331 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: SimulationRunner.py plays complete bot-only games of the Real Estate Game without the GUI.
+# It uses the BORING VERSION of the game (RealEstateGame.py) so it never imports tkinter, and it uses the same
+# AI heuristic as the GUI AI players (AiLogic.py).
+
+# Code Outline:
+# 4 classes 'HeadlessRunner', 'GamePool', 'GameResult', 'BatchStats'
+# HeadlessRunner:  Builds, plays and records bot-only games, one seed per game.
+# GamePool:  Keeps ready-to-play games (and their random number generators) so a worker can reuse them.
+# GameResult:  Holds the outcome of a single headless game.
+# BatchStats:  Adds up the results of many games, in a form that can be saved and merged exactly.
+# 1 non-class function:
+# build_stress_runner: Makes a runner for huge games, thousands of bots on a board of thousands of spaces.
+
+import random
+from RealEstateGame import RealEstateGame
+from AiLogic import should_ai_buy_space
+from FastRules import FastRules
+
+DEFAULT_RENTS = [50, 50, 50, 75, 75, 75, 100, 100, 100, 150, 150, 150, 200, 200, 200, 250, 250, 250, 300, 300, 300,
+                 350, 350, 350]
+
+
+class HeadlessRunner:
+    """ Plays bot-only Real Estate Games at full speed, without the GUI.
+    Every game is driven by its own random.Random(seed), so a seed always replays the same game.
+    With fast_rules the games are played on FastRules (same results, no game events) instead of RealEstateGame.
+    turn_cap and stall_rounds are the games' end conditions (see RealEstateGame.set_end_conditions), max_rounds
+    stops a game without a winner and is only a safety net when they are set.
+    With numpy_rng every game draws from a GameRng(seed) (see GameRng.py) instead, which rolls faster but plays
+    different games for the same seeds, so results are only comparable between runners with the same setting. """
+
+    def __init__(self, player_count=4, money=1000, go_amt=200, rent_amounts=None, max_rounds=200, archive=None,
+                 listeners=None, reuse_games=True, fast_rules=False, turn_cap=None, stall_rounds=None,
+                 numpy_rng=False):
+        self._player_count = player_count
+        self._money = money
+        self._go_amt = go_amt
+        self._rent_amounts = rent_amounts if rent_amounts is not None else DEFAULT_RENTS
+        self._max_rounds = max_rounds
+        self._turn_cap = turn_cap
+        self._stall_rounds = stall_rounds
+        self._archive = archive  # Optional ArchiveWriter (see GameArchive.py) that records every turn.
+        self._listeners = listeners if listeners is not None else []  # GameListeners added to every game.
+        self._build_rng = random.Random
+        if numpy_rng:
+            from GameRng import GameRng  # Only imported when asked for, the default runner doesn't need NumPy.
+            self._build_rng = GameRng
+        self._pool = GamePool(self.build_game, build_rng=self._build_rng) if reuse_games else None
+        self._fast_rules = None
+        if fast_rules:
+            if self._archive is not None or self._listeners:
+                raise ValueError("The fast rules don't send game events, so they can't be used with listeners or an "
+                                 "archive.")
+            self._fast_rules = FastRules(self.build_game())
+            self._fast_rng = self._build_rng()
+
+    def run_batch(self, seeds):
+        """ Plays one game per seed and returns a list of GameResult objects. """
+        results = []
+        for seed in seeds:
+            results.append(self.run_game(seed))
+        return results
+
+    def run_game(self, seed):
+        """ Plays a single game with the given seed and returns a GameResult. """
+        if self._fast_rules is not None:
+            self._fast_rules.reset()
+            self._fast_rng.seed(seed)
+            return self.play_fast_game(self._fast_rules, self._fast_rng, seed)
+        if self._pool is not None:
+            game, rng = self._pool.acquire(seed)
+        else:
+            game, rng = self.build_game(), self._build_rng(seed)
+        if self._archive is not None:
+            self._archive.begin_game(seed)
+        game.notify("on_game_start", game)
+        result = self.play_game(game, rng, seed)
+        game.notify("on_game_end", game, result.get_winner())
+        if self._pool is not None:
+            self._pool.release(game, rng)
+        return result
+
+    def build_game(self):
+        """ Creates a new game board and bot roster, with the runner's listeners already added. """
+        game = RealEstateGame()
+        game.create_board(self._go_amt, self._rent_amounts)
+        game.create_players(self.get_player_names(), self._money)
+        game.set_end_conditions(self._turn_cap, self._stall_rounds)
+        for listener in self._listeners:
+            game.add_listener(listener)
+        return game
+
+    def get_player_names(self):
+        """ Returns the names of the bots, in turn order. """
+        return [f"Bot {index + 1}" for index in range(0, self._player_count)]
+
+    def play_game(self, game, rng, seed):
+        """ Plays the game until only one player is left or the round limit is reached.
+        Turns go around the game's ring of active players, so bankrupt players cost nothing however many there are.
+        A round ends whenever the turn order wraps around, which gives the same round count as stepping through
+        every player in turn order. """
+        last_index = len(game.get_all_players()) - 1
+        rounds = 0
+        turns = 0
+        winner = game.check_game_over()
+        name = game.get_first_active_player()
+        while winner == "" and rounds < self._max_rounds:
+            cur_index = game.get_turn_index(name)
+            self.take_turn(game, name, rng)
+            turns += 1
+            if self._archive is not None:
+                self._archive.record_turn(game, cur_index)
+            winner = game.check_game_over()
+            if winner != "":
+                rounds += cur_index == last_index
+                break
+            name = game.get_next_active_player(name)
+            if game.get_turn_index(name) <= cur_index:
+                rounds += 1
+        return GameResult(seed, winner, turns, rounds, game.get_end_reason() if winner != "" else "max_rounds")
+
+    def play_fast_game(self, rules, rng, seed):
+        """ play_game and take_turn for FastRules, drawing the same random numbers in the same order. """
+        player_count = len(rules.get_names())
+        cur_index = 0
+        rounds = 0
+        turns = 0
+        winner = rules.check_game_over()
+        while winner == "" and rounds < self._max_rounds:
+            bal = rules.get_balance(cur_index)
+            if bal > 0:
+                pos = rules.get_position(cur_index)
+                if pos > 0 and should_ai_buy_space(bal, pos, rules.get_price(pos), rng):
+                    rules.buy_space(cur_index)
+                rules.move_player(cur_index, rng.randint(1, 6))
+                turns += 1
+                winner = rules.check_game_over()
+            cur_index += 1
+            if cur_index == player_count:
+                cur_index = 0
+                rounds += 1
+        return GameResult(seed, winner, turns, rounds, rules.get_end_reason() if winner != "" else "max_rounds")
+
+    @staticmethod
+    def take_turn(game, name, rng):
+        """ Plays one bot turn the same way the GUI does: maybe buy the current space, then roll and move. """
+        pos = game.get_player_current_position(name)
+        if pos > 0:
+            bal = game.get_player_account_balance(name)
+            price = game.get_game_space_object(pos).get_purchase_amt()
+            if should_ai_buy_space(bal, pos, price, rng):
+                game.buy_space(name)
+        game.move_player(name, rng.randint(1, 6))
+
+
+class GamePool:
+    """ Keeps ready-to-play games for one worker.  A released game is reset (RealEstateGame.reset) instead of
+    being thrown away, so a long batch doesn't rebuild the board, the players and a random.Random every game.
+    build_rng makes the random number generators (random.Random or GameRng), they are reseeded for every game. """
+
+    def __init__(self, build_game, size=1, build_rng=random.Random):
+        self._build_game = build_game  # Called whenever the pool runs out of free games.
+        self._build_rng = build_rng
+        self._free = []
+        for count in range(0, size):
+            self._free.append((build_game(), build_rng()))
+
+    def acquire(self, seed):
+        """ Returns a (game, rng) pair ready for a new game, with the rng reseeded with the given seed. """
+        if self._free:
+            game, rng = self._free.pop()
+        else:
+            game, rng = self._build_game(), self._build_rng()
+        rng.seed(seed)
+        return game, rng
+
+    def release(self, game, rng):
+        """ Resets the game and puts it back in the pool. """
+        game.reset()
+        self._free.append((game, rng))
+
+    def get_free_count(self):
+        return len(self._free)
+
+
+class GameResult:
+    """ Holds the outcome of a single headless game. """
+
+    def __init__(self, seed, winner, turns, rounds, end_reason=""):
+        self._seed = seed
+        self._winner = winner  # Empty string if the round limit was reached first.
+        self._turns = turns
+        self._rounds = rounds
+        self._end_reason = end_reason  # "bankruptcy", "turn_cap", "stall" or "max_rounds".
+
+    def get_seed(self):
+        return self._seed
+
+    def get_winner(self):
+        return self._winner
+
+    def get_turns(self):
+        return self._turns
+
+    def get_rounds(self):
+        return self._rounds
+
+    def get_end_reason(self):
+        return self._end_reason
+
+
+class BatchStats:
+    """ Adds up the GameResults of many games.  Only whole number totals are kept, so stats from different workers
+    (or from before and after a restart) can be merged exactly, in any order.
+    Game lengths are kept as a histogram (turns: games) along with how many games each end reason ended. """
+
+    def __init__(self):
+        self._games = 0
+        self._wins = {}  # winner name: games won.
+        self._unfinished = 0  # Games that reached the round limit without a winner.
+        self._turns = 0
+        self._rounds = 0
+        self._max_turns = 0
+        self._lengths = {}  # turns: games that lasted that many turns.
+        self._end_reasons = {}  # end reason: games.
+
+    def add_result(self, result):
+        """ Adds one GameResult. """
+        self._games += 1
+        if result.get_winner() == "":
+            self._unfinished += 1
+        else:
+            self._wins[result.get_winner()] = self._wins.get(result.get_winner(), 0) + 1
+        self._turns += result.get_turns()
+        self._rounds += result.get_rounds()
+        self._max_turns = max(self._max_turns, result.get_turns())
+        self._lengths[result.get_turns()] = self._lengths.get(result.get_turns(), 0) + 1
+        reason = result.get_end_reason()
+        self._end_reasons[reason] = self._end_reasons.get(reason, 0) + 1
+
+    def merge(self, other):
+        """ Adds the totals of another BatchStats to this one. """
+        self._games += other.get_games()
+        for name, wins in other.get_wins().items():
+            self._wins[name] = self._wins.get(name, 0) + wins
+        self._unfinished += other.get_unfinished()
+        self._turns += other.get_turns()
+        self._rounds += other.get_rounds()
+        self._max_turns = max(self._max_turns, other.get_max_turns())
+        for turns, games in other.get_lengths().items():
+            self._lengths[turns] = self._lengths.get(turns, 0) + games
+        for reason, games in other.get_end_reasons().items():
+            self._end_reasons[reason] = self._end_reasons.get(reason, 0) + games
+
+    def to_dict(self):
+        """ Returns the totals as a JSON friendly dictionary. """
+        return {"games": self._games, "wins": self._wins, "unfinished": self._unfinished, "turns": self._turns,
+                "rounds": self._rounds, "max_turns": self._max_turns,
+                "lengths": [[turns, self._lengths[turns]] for turns in sorted(self._lengths)],
+                "end_reasons": self._end_reasons}
+
+    @staticmethod
+    def from_dict(totals):
+        """ Creates a BatchStats from a dictionary made by to_dict. """
+        stats = BatchStats()
+        stats._games = totals["games"]
+        stats._wins = dict(totals["wins"])
+        stats._unfinished = totals["unfinished"]
+        stats._turns = totals["turns"]
+        stats._rounds = totals["rounds"]
+        stats._max_turns = totals["max_turns"]
+        stats._lengths = {turns: games for turns, games in totals.get("lengths", [])}
+        stats._end_reasons = dict(totals.get("end_reasons", {}))
+        return stats
+
+    def get_length_percentile(self, percent):
+        """ Returns the game length (in turns) that the given percent (0 to 100) of games were no longer than. """
+        needed = percent / 100 * self._games
+        seen = 0
+        for turns in sorted(self._lengths):
+            seen += self._lengths[turns]
+            if seen >= needed:
+                return turns
+        return 0
+
+    def get_length_histogram(self, bin_turns=50):
+        """ Returns [start turn, games] for every bin of bin_turns turns, from the shortest game to the longest. """
+        bins = {}
+        for turns, games in self._lengths.items():
+            start = turns // bin_turns * bin_turns
+            bins[start] = bins.get(start, 0) + games
+        return [[start, bins.get(start, 0)] for start in range(min(bins, default=0), max(bins, default=-1) + 1,
+                                                                 bin_turns)]
+
+    def get_mean_turns(self):
+        return self._turns / self._games if self._games else 0.0
+
+    def get_games(self):
+        return self._games
+
+    def get_wins(self):
+        return self._wins
+
+    def get_unfinished(self):
+        return self._unfinished
+
+    def get_turns(self):
+        return self._turns
+
+    def get_rounds(self):
+        return self._rounds
+
+    def get_max_turns(self):
+        return self._max_turns
+
+    def get_lengths(self):
+        return self._lengths
+
+    def get_end_reasons(self):
+        return self._end_reasons
+
+
+def build_stress_runner(player_count=10000, space_count=10000, money=1000, **runner_options):
+    """ Returns a HeadlessRunner for a stress game: player_count bots on a board of space_count real estate spaces,
+    with the default rents repeated around the board.  Every turn costs the same however big the game is (the
+    active players are a ring and each player knows their own spaces), so the game runs at a steady pace. """
+    rents = [DEFAULT_RENTS[index % len(DEFAULT_RENTS)] for index in range(0, space_count)]
+    return HeadlessRunner(player_count, money, rent_amounts=rents, **runner_options)
@@ -0,0 +1,130 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: SpaceAnalytics.py keeps per-space return on investment (ROI) and rent flow statistics.
+# The numbers are accumulated as the game events happen (SpaceLedger is a GameListener), so nothing has to be
+# worked out from logs afterwards, and ledgers from different workers can be merged by simply adding them up.
+
+# Code Outline:
+# 1 class 'SpaceLedger'
+# SpaceLedger:  Counts purchases, landings, rent collected and time-to-payback for every space on the board.
+
+from RealEstateGame import GameListener
+
+# Counters that are summed when two ledgers are merged.
+LEDGER_COUNTERS = ("purchases", "landings", "rent_collected", "paybacks", "payback_turns")
+
+
+class SpaceLedger(GameListener):
+    """ Counts purchases, landings, rent collected and time-to-payback for every space on the board.
+    A purchase has paid back once the rent collected on the space since it was bought reaches its price. """
+
+    def __init__(self):
+        self._names = []
+        self._prices = []
+        self._counters = {counter: [] for counter in LEDGER_COUNTERS}
+        self._games = 0
+        self._turn = 0  # Turns played in the current game.
+        self._open = {}  # pos: [turn bought, price, rent collected since bought] for purchases not yet paid back.
+
+    def on_game_start(self, game):
+        """ Learns the board layout on the first game and clears the per-game state. """
+        if not self._names:
+            self.set_board(game.get_all_spaces())
+        self._games += 1
+        self._turn = 0
+        self._open = {}
+
+    def set_board(self, spaces):
+        """ Sets the names and prices of the spaces the ledger keeps track of. """
+        self._names = [space.get_name() for space in spaces]
+        self._prices = [space.get_purchase_amt() for space in spaces]
+        for counter in LEDGER_COUNTERS:
+            self._counters[counter] = [0] * len(spaces)
+
+    def on_move(self, name, old_pos, new_pos, passed_go):
+        self._turn += 1
+        self._counters["landings"][new_pos] += 1
+
+    def on_buy(self, name, pos, price):
+        self._counters["purchases"][pos] += 1
+        self._open[pos] = [self._turn, price, 0]
+
+    def on_rent(self, name, owner_name, pos, amount):
+        self._counters["rent_collected"][pos] += amount
+        purchase = self._open.get(pos)
+        if purchase is not None:
+            purchase[2] += amount
+            if purchase[2] >= purchase[1]:
+                self._counters["paybacks"][pos] += 1
+                self._counters["payback_turns"][pos] += self._turn - purchase[0]
+                del self._open[pos]
+
+    def on_bankrupt(self, name, released_positions):
+        for pos in released_positions:
+            self._open.pop(pos, None)
+
+    def merge(self, other):
+        """ Adds the counts of another SpaceLedger (for example from another worker) to this one. """
+        if not other.get_space_names():
+            return
+        if not self._names:
+            self._names = list(other.get_space_names())
+            self._prices = list(other.get_prices())
+            for counter in LEDGER_COUNTERS:
+                self._counters[counter] = [0] * len(self._names)
+        elif self._names != other.get_space_names():
+            raise ValueError("Can't merge ledgers that were kept for different boards.")
+        for counter in LEDGER_COUNTERS:
+            mine = self._counters[counter]
+            theirs = other.get_counter(counter)
+            for index in range(0, len(mine)):
+                mine[index] += theirs[index]
+        self._games += other.get_games()
+
+    def to_dict(self):
+        """ Returns the counts as a JSON friendly dictionary (the state of a game in progress is not included). """
+        return {"names": self._names, "prices": self._prices, "counters": self._counters, "games": self._games}
+
+    @staticmethod
+    def from_dict(counts):
+        """ Creates a SpaceLedger from a dictionary made by to_dict. """
+        ledger = SpaceLedger()
+        ledger._names = list(counts["names"])
+        ledger._prices = list(counts["prices"])
+        ledger._counters = {counter: list(counts["counters"][counter]) for counter in LEDGER_COUNTERS}
+        ledger._games = counts["games"]
+        return ledger
+
+    def get_report(self):
+        """ Returns a list with one dictionary of statistics per real estate space (the GO space is skipped).
+        roi is rent collected per amount spent buying the space, payback_rate is the fraction of purchases that
+        paid back before the owner went bankrupt or the game ended. """
+        report = []
+        for pos in range(1, len(self._names)):
+            purchases = self._counters["purchases"][pos]
+            paybacks = self._counters["paybacks"][pos]
+            rent = self._counters["rent_collected"][pos]
+            spent = purchases * self._prices[pos]
+            report.append({"pos": pos,
+                           "name": self._names[pos],
+                           "price": self._prices[pos],
+                           "purchases": purchases,
+                           "landings": self._counters["landings"][pos],
+                           "rent_collected": rent,
+                           "roi": rent / spent if spent else 0.0,
+                           "payback_rate": paybacks / purchases if purchases else 0.0,
+                           "mean_payback_turns": self._counters["payback_turns"][pos] / paybacks if paybacks else None})
+        return report
+
+    def get_space_names(self):
+        return self._names
+
+    def get_prices(self):
+        return self._prices
+
+    def get_counter(self, counter):
+        return self._counters[counter]
+
+    def get_games(self):
+        return self._games
@@ -0,0 +1,212 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: SpectatorViewer.py shows a game in the Dungeons and Real Estates GUI from its stream of game events
+# (see GameEvents.py) instead of calling into the RealEstateGame.  Headless games can be watched live while they run
+# at full speed in another thread, or replayed later from a saved event file.
+
+# Code Outline:
+# 2 classes 'SpectatorViewer', 'EventReplay'
+# SpectatorViewer:  Keeps a copy of the game up to date from the events and redraws it at a fixed frame rate.
+# EventReplay:  Hands out the events of a recorded game a few moves at a time.
+# 2 non-class functions:
+# watch_headless_games: Runs headless games in a thread and watches them live.
+# replay_event_file: Watches a game that was recorded with GameEvents.save_events.
+
+import sys
+import threading
+from tkinter import *
+from GUI_Hub import GuiGameBoard, GuiSpaces, GuiStatWindow, GuiPlayer, SHAPES, get_owner_tag
+from GameEvents import GameEventStream, build_game_from_start, apply_event, load_events
+import DungeonsAndRealEstates
+from SimulationRunner import HeadlessRunner
+
+GUI_SPACES = 25  # GuiSpaces always draws a board of this many spaces.
+
+
+class SpectatorViewer:
+    """ Keeps a copy of the game up to date from a stream of events and redraws it at a fixed frame rate.
+    Every frame applies all of the events that arrived since the last frame and then draws only the final state,
+    so if the game is faster than the viewer the in between frames are dropped instead of slowing the game down.
+    events can be anything with a pop_all method (GameEventStream or EventReplay). """
+
+    def __init__(self, master, events, fps=30, token_scale=1.0):
+        self._canvas = Canvas(master, width=1400, height=1080)
+        self._canvas.pack()
+        self._events = events
+        self._frame_ms = max(1, round(1000 / fps))
+        self._token_scale = token_scale
+        self._color_options = ["red", "blue", "purple", "green", "yellow", "pink", "orange", "black",
+                               "white", "cyan", "brown"]
+        self._game = None  # The copy of the game being watched.
+        self._stats = None
+        self._tokens = {}  # name: [x, y the token has been moved to, offset index on its space].
+        self._bankrupt = set()  # Players whose tokens have been drawn as bankrupt.
+        self._dirty_spaces = set()  # Positions whose owner changed since the last frame.
+        self._last_mover = None
+        self._winner = None
+        self._frames = 0
+        self._frames_dropped = 0
+        self._events_applied = 0
+        self._canvas.after(self._frame_ms, self.tick)
+
+    def tick(self):
+        """ Applies every waiting event, draws the result once, then schedules the next frame. """
+        moves = 0
+        for event in self._events.pop_all():
+            self._events_applied += 1
+            if event[0] == "start":
+                self.start_game(event)
+                moves = 0
+            elif self._game is not None:
+                self.track_event(event)
+                if event[0] == "move":
+                    moves += 1
+        if moves > 1:
+            self._frames_dropped += moves - 1  # Every move would have been its own frame.
+        if moves or self._dirty_spaces or self._winner:
+            self.render()
+            self._frames += 1
+        self._canvas.after(self._frame_ms, self.tick)
+
+    def track_event(self, event):
+        """ Applies the event to the copy of the game and remembers what needs to be redrawn. """
+        kind = event[0]
+        if kind == "end":
+            self._winner = event[1] or None
+            return
+        apply_event(self._game, event)
+        if kind == "move":
+            self._last_mover = event[1]
+        elif kind == "buy":
+            self._dirty_spaces.add(event[2])
+        elif kind == "bankrupt":
+            self._dirty_spaces.update(event[2])
+
+    def start_game(self, event):
+        """ Clears the canvas and draws a new board and new tokens for the game in the start event.
+        Raises a ValueError if the game's board doesn't have the GUI's 25 spaces. """
+        game = build_game_from_start(DungeonsAndRealEstates.RealEstateGame(), event)
+        spaces = len(game.get_all_spaces())
+        if spaces != GUI_SPACES:
+            raise ValueError(f"The GUI can only show boards of {GUI_SPACES} spaces, this game has {spaces}.")
+        self._canvas.delete("all")
+        self._game = game
+        self._tokens = {}
+        self._bankrupt = set()
+        self._dirty_spaces = set()
+        self._last_mover = None
+        self._winner = None
+        GuiGameBoard(self._canvas)
+        GuiSpaces(self._canvas, self._game)
+        self._stats = GuiStatWindow(self._canvas, self._game)
+        shape_keys = SHAPES.get_keys()
+        players = self._game.get_all_players()
+        for index, name in enumerate(players):
+            color = self._color_options[index % len(self._color_options)]
+            token = GuiPlayer(self._canvas, color, shape_keys[index % len(shape_keys)], self._token_scale)
+            players[name].set_gui_element(token.create_player())
+            self._tokens[name] = [0, 0, index % 6]
+            self.move_token(name)
+        self._stats.build_player_color_key()
+        self._stats.set_all_stat()
+
+    def render(self):
+        """ Draws the current state of the copy of the game. """
+        players = self._game.get_all_players()
+        for name in players:
+            self.move_token(name)
+            if players[name].get_balance() <= 0 and name not in self._bankrupt:
+                self._bankrupt.add(name)
+                color = self._stats.get_player_color(name)
+                self._canvas.itemconfig(players[name].get_gui_element(), fill="", outline=color)
+                self._canvas.itemconfig(get_owner_tag(players[name]), fill="", outline=color)
+                self._stats.forget_space_fills()
+                self._stats.set_player_color(name, "")
+        spaces = self._game.get_all_spaces()
+        for pos in self._dirty_spaces:
+            owner = spaces[pos].get_owner()
+            if owner is not None:
+                space_gui = spaces[pos].get_gui_element()
+                fill = self._stats.get_player_color(owner.get_name())
+                self._canvas.itemconfig(space_gui, fill=fill)
+                self._stats.set_space_fill(pos, fill)
+                self._canvas.addtag_withtag(get_owner_tag(owner), space_gui)
+        self._dirty_spaces = set()
+        if self._last_mover is not None:
+            self._stats.show_cur_player_stats(self._last_mover)
+        if self._winner is not None:
+            self._canvas.itemconfig("space", fill=self._stats.get_player_color(self._winner))
+            self._stats.forget_space_fills()
+            self._winner = None
+
+    def move_token(self, name):
+        """ Moves the player's token onto the space they are on, slightly offset so tokens don't cover each other. """
+        player = self._game.get_player_object(name)
+        space_gui = self._game.get_game_space_object(player.get_position()).get_gui_element()
+        space_coords = self._canvas.coords(space_gui)
+        token = self._tokens[name]
+        x_pos = space_coords[0] - 18 + token[2] * 4
+        y_pos = space_coords[1] + 2 + token[2] * 4
+        if token[0] != x_pos or token[1] != y_pos:
+            self._canvas.move(player.get_gui_element(), x_pos - token[0], y_pos - token[1])
+            token[0] = x_pos
+            token[1] = y_pos
+
+    def get_frames(self):
+        return self._frames
+
+    def get_frames_dropped(self):
+        return self._frames_dropped
+
+    def get_events_applied(self):
+        return self._events_applied
+
+
+class EventReplay:
+    """ Hands out the events of a recorded game a few moves at a time, for watching it at a reduced rate. """
+
+    def __init__(self, events, moves_per_frame=1):
+        self._events = list(events)
+        self._next = 0
+        self._moves_per_frame = moves_per_frame
+
+    def pop_all(self):
+        """ Returns the events up to and including the next moves_per_frame moves. """
+        start = self._next
+        moves = 0
+        while self._next < len(self._events) and moves < self._moves_per_frame:
+            if self._events[self._next][0] == "move":
+                moves += 1
+            self._next += 1
+        return self._events[start:self._next]
+
+
+def watch_headless_games(seeds, turn_delay=0.0, fps=30, **runner_options):
+    """ Plays one headless game per seed in a background thread and watches them live.
+    turn_delay slows the games down (in seconds per move), the default of 0 runs them at full speed. """
+    stream = GameEventStream(turn_delay)
+    runner = HeadlessRunner(listeners=[stream], **runner_options)
+    master = Tk()
+    master.title("RealEstateGame - Spectator")
+    SpectatorViewer(master, stream, fps)
+    threading.Thread(target=runner.run_batch, args=(seeds,), daemon=True).start()
+    mainloop()
+
+
+def replay_event_file(path, moves_per_frame=1, fps=10):
+    """ Watches a game that was recorded with GameEvents.save_events. """
+    master = Tk()
+    master.title("RealEstateGame - Replay")
+    SpectatorViewer(master, EventReplay(load_events(path), moves_per_frame), fps)
+    mainloop()
+
+
+if __name__ == "__main__":
+    # python SpectatorViewer.py [seed] [turn delay]   or   python SpectatorViewer.py --replay events.jsonl
+    if len(sys.argv) > 2 and sys.argv[1] == "--replay":
+        replay_event_file(sys.argv[2])
+    else:
+        seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+        delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+        watch_headless_games([seed], delay)
@@ -0,0 +1,144 @@
+# Author: JT Mitchell
+# GitHub username: JtMitchellOsuStudent
+# Date: 10/19/26
+# Description: SweepRunner.py plays headless games for several configurations (sweep points), for example different
+# rent tables, and measures a win rate for each.  Instead of a fixed number of games per point, every point keeps
+# a Wilson score interval on its win rate and stops as soon as the interval is narrow enough, so points that are
+# decided early don't use up the games that the close ones need.
+
+# Code Outline:
+# 2 classes 'SweepPoint', 'SweepRunner'
+# SweepPoint:  One configuration: a label, the HeadlessRunner that plays it and the tally of its games.
+# SweepRunner:  Plays batches of games for every point until each one reaches the target precision.
+# 2 non-class functions:
+# wilson_interval: Returns the Wilson score interval of a win rate.
+# rent_table_points: Makes one sweep point per rent table.
+
+import math
+import sys
+from SimulationRunner import HeadlessRunner, DEFAULT_RENTS
+
+
+class SweepPoint:
+    """ One configuration of a sweep: a label, the HeadlessRunner that plays it and the tally of its games.
+    success decides whether a GameResult counts as a win, by default it is a win for the first player. """
+
+    def __init__(self, label, runner, success=None):
+        self._label = label
+        self._runner = runner
+        self._success = success if success is not None else self.first_player_won
+        self._games = 0
+        self._wins = 0
+        self._done = False
+
+    def first_player_won(self, result):
+        return result.get_winner() == self._runner.get_player_names()[0]
+
+    def play(self, seeds):
+        """ Plays one game per seed and adds them to the tally. """
+        for seed in seeds:
+            self._games += 1
+            if self._success(self._runner.run_game(seed)):
+                self._wins += 1
+
+    def get_interval(self, z=1.96):
+        return wilson_interval(self._wins, self._games, z)
+
+    def get_win_rate(self):
+        return self._wins / self._games if self._games else 0.0
+
+    def get_label(self):
+        return self._label
+
+    def get_games(self):
+        return self._games
+
+    def get_wins(self):
+        return self._wins
+
+    def is_done(self):
+        return self._done
+
+    def set_done(self):
+        self._done = True
+
+
+class SweepRunner:
+    """ Plays batches of games for every sweep point until the Wilson interval of its win rate is at most
+    2 * precision wide (or max_games is reached).  Every point plays the same seeds in the same order, so points
+    are compared on the same dice.  The interval is only checked after every batch (and never before min_games),
+    which keeps the number of looks, and so the chance of stopping on a lucky streak, small. """
+
+    def __init__(self, points, precision=0.02, z=1.96, min_games=200, max_games=20000, batch=200, first_seed=0):
+        self._points = points
+        self._precision = precision  # Target half width of the interval.
+        self._z = z  # 1.96 for 95% intervals.
+        self._min_games = min_games
+        self._max_games = max_games
+        self._batch = batch
+        self._first_seed = first_seed
+
+    def run(self):
+        """ Plays every point until it is done, a batch at a time, and returns the report (see get_report). """
+        while not all(point.is_done() for point in self._points):
+            for point in self._points:
+                if point.is_done():
+                    continue
+                start = self._first_seed + point.get_games()
+                point.play(range(start, start + min(self._batch, self._max_games - point.get_games())))
+                if point.get_games() >= self._max_games or self.is_precise(point):
+                    point.set_done()
+        return self.get_report()
+
+    def is_precise(self, point):
+        """ Returns True once the point has played min_games and its interval is narrow enough. """
+        if point.get_games() < self._min_games:
+            return False
+        low, high = point.get_interval(self._z)
+        return (high - low) / 2 <= self._precision
+
+    def get_report(self):
+        """ Returns one dictionary per point: its label, games played, win rate, interval and the games it saved
+        compared to playing max_games. """
+        report = []
+        for point in self._points:
+            low, high = point.get_interval(self._z)
+            report.append({"label": point.get_label(), "games": point.get_games(), "win_rate": point.get_win_rate(),
+                           "low": low, "high": high, "games_saved": self._max_games - point.get_games()})
+        return report
+
+    def get_games_saved(self):
+        """ Returns the games saved over all points, compared to playing max_games for every point. """
+        return sum(self._max_games - point.get_games() for point in self._points)
+
+
+def wilson_interval(wins, games, z=1.96):
+    """ Returns the (low, high) Wilson score interval of a win rate.  Unlike the usual p +- z * sqrt(p(1 - p) / n),
+    it stays inside 0 to 1 and is still sensible for win rates close to 0 or 1 and for few games. """
+    if games == 0:
+        return 0.0, 1.0
+    rate = wins / games
+    z_squared = z * z
+    center = (rate + z_squared / (2 * games)) / (1 + z_squared / games)
+    half_width = z * math.sqrt(rate * (1 - rate) / games + z_squared / (4 * games * games)) / (1 + z_squared / games)
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def rent_table_points(rent_tables, success=None, **runner_options):
+    """ Makes one sweep point per rent table (the rent_amounts passed to create_spaces), played on FastRules. """
+    points = []
+    for rents in rent_tables:
+        runner = HeadlessRunner(rent_amounts=rents, fast_rules=True, **runner_options)
+        points.append(SweepPoint(f"rents {rents[0]}-{rents[-1]}", runner, success))
+    return points
+
+
+if __name__ == "__main__":
+    # python SweepRunner.py [precision]   Sweeps the default rents scaled from 0.5x to 2x.
+    scales = [0.5, 0.75, 1.0, 1.5, 2.0]
+    sweep = SweepRunner(rent_table_points([[round(rent * scale) for rent in DEFAULT_RENTS] for scale in scales]),
+                        float(sys.argv[1]) if len(sys.argv) > 1 else 0.02)
+    for line in sweep.run():
+        print(f"{line['label']:>16}: first player wins {line['win_rate']:.3f} [{line['low']:.3f}, {line['high']:.3f}] "
+              f"after {line['games']} games ({line['games_saved']} saved)")
+    print(f"{sweep.get_games_saved()} games saved in total")